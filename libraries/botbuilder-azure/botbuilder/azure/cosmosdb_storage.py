@@ -9,7 +9,7 @@ Part of the Azure Bot Framework in Python.
 
 from typing import Dict, List
 import json
-from botbuilder.core.storage import Storage, StoreItem
+from botbuilder.core.storage import CREATE_ONLY_E_TAG, Storage, StoreItem
 import azure.cosmos.cosmos_client as cosmos_client
 import azure.cosmos.errors as cosmos_errors
 
@@ -39,6 +39,8 @@ class CosmosDbConfig():
 class CosmosDbStorage(Storage):
     """The class for CosmosDB middleware for the Azure Bot Framework."""
 
+    supports_create_only = True
+
     def __init__(self, config: CosmosDbConfig):
         """Create the storage object.
 
@@ -116,8 +118,20 @@ provide at least one key')
                        'realId': key,
                        'document': self.__create_dict(change)
                        }
+                # a create only e_tag inserts the doc, and fails like an e_tag conflict if it already exists
+                if e_tag == CREATE_ONLY_E_TAG:
+                    try:
+                        self.client.CreateItem(
+                            database_or_Container_link=self.__container_link,
+                            document=doc,
+                            options={'disableAutomaticIdGeneration': True}
+                            )
+                    except cosmos_errors.HTTPFailure as h:
+                        if h.status_code != 409:
+                            raise h
+                        raise KeyError('cosmosdb_storage.write(): Etag conflict, "%s" already exists.' % key)
                 # the e_tag will be * for new docs so do an insert
-                if (e_tag == '*' or not e_tag):
+                elif (e_tag == '*' or not e_tag):
                     self.client.UpsertItem(
                         database_or_Container_link=self.__container_link,
                         document=doc,
@@ -148,15 +162,14 @@ provide at least one key')
             # check if the database and container exists and if not create
             if not self.__container_exists:
                 self.__create_db_and_container()
-            # call the function for each key
+            # call the function for each key, a missing key doesn't stop the others from being deleted
             for k in keys:
-                self.client.DeleteItem(
-                    document_link=self.__item_link(self.__sanitize_key(k)))
-                # print(res)
-        except cosmos_errors.HTTPFailure as h:
-            # print(h.status_code)
-            if h.status_code != 404:
-                raise h
+                try:
+                    self.client.DeleteItem(
+                        document_link=self.__item_link(self.__sanitize_key(k)))
+                except cosmos_errors.HTTPFailure as h:
+                    if h.status_code != 404:
+                        raise h
         except TypeError as e:
             raise e
 
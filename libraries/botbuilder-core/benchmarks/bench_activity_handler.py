@@ -0,0 +1,71 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures ActivityHandler turns per second for message activities, with handlers that each simulate a
+recognizer call, compared with the previous implementation that awaited every handler on every turn.
+
+Usage: python benchmarks/bench_activity_handler.py [--turns 2000] [--handler-latency 0.0005]
+"""
+
+import argparse
+import asyncio
+import time
+
+from botbuilder.schema import Activity, ActivityTypes, ChannelAccount, ConversationAccount
+from botbuilder.core import ActivityHandler, TurnContext
+from botbuilder.core.adapters import TestAdapter
+
+
+class Bot(ActivityHandler):
+    def __init__(self, handler_latency: float):
+        self.handler_latency = handler_latency
+
+    async def on_message_activity(self, turn_context: TurnContext):
+        await asyncio.sleep(self.handler_latency)
+
+    async def on_conversation_update_activity(self, turn_context: TurnContext):
+        await asyncio.sleep(self.handler_latency)
+
+    async def on_event_activity(self, turn_context: TurnContext):
+        await asyncio.sleep(self.handler_latency)
+
+    async def on_unrecognized_activity_type(self, turn_context: TurnContext):
+        await asyncio.sleep(self.handler_latency)
+
+
+class PreviousBot(Bot):
+    async def on_turn(self, turn_context: TurnContext):
+        return {
+            ActivityTypes.message: await self.on_message_activity(turn_context),
+            ActivityTypes.conversation_update: await self.on_conversation_update_activity(turn_context),
+            ActivityTypes.event: await self.on_event_activity(turn_context)
+        }.get(turn_context.activity.type, await self.on_unrecognized_activity_type(turn_context))
+
+
+async def run_turns(bot: ActivityHandler, context: TurnContext, turns: int) -> float:
+    start = time.perf_counter()
+    for _ in range(turns):
+        await bot.on_turn(context)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--turns', type=int, default=2000)
+    parser.add_argument('--handler-latency', type=float, default=0.0005)
+    args = parser.parse_args()
+
+    context = TurnContext(TestAdapter(), Activity(type=ActivityTypes.message, text='hi', channel_id='test',
+                                                  from_property=ChannelAccount(id='user'),
+                                                  recipient=ChannelAccount(id='bot'),
+                                                  conversation=ConversationAccount(id='convo')))
+    loop = asyncio.get_event_loop()
+    for (name, bot_type) in [('previous', PreviousBot), ('dispatch', Bot)]:
+        for latency in [0.0, args.handler_latency]:
+            elapsed = loop.run_until_complete(run_turns(bot_type(latency), context, args.turns))
+            print('%-9s handler latency %.4fs: %.0f turns/s' % (name, latency, args.turns / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures the compression ratio and the time per item of `CompressedStorage` for each available codec, on a
+conversation state holding a dialog stack with embedded activities and a cached API result.
+
+Usage: python benchmarks/bench_compressed_storage.py [--activities 200] [--items 50]
+"""
+
+import argparse
+import asyncio
+
+from botbuilder.schema import Activity, ChannelAccount, ConversationAccount
+from botbuilder.core import CompressedStorage, MemoryStorage
+from botbuilder.core.compressed_storage import zstandard
+
+
+def create_state(activities: int) -> dict:
+    activity = Activity(type='message', id='1234', text='Where would you like to travel to?', channel_id='msteams',
+                        service_url='https://smba.trafficmanager.net/emea/', locale='en-US',
+                        from_property=ChannelAccount(id='28:bot', name='Bot'),
+                        recipient=ChannelAccount(id='29:user', name='User', aad_object_id='aad-id'),
+                        conversation=ConversationAccount(id='a:1x2y3z', conversation_type='personal',
+                                                         name='Conversation')).serialize()
+    return {
+        'dialogState': {'dialogStack': [
+            {'id': 'bookingDialog', 'state': {'options': {'prompt': activity, 'retryPrompt': activity},
+                                              'values': {'destination': 'Paris', 'origin': None}}},
+        ]},
+        'transcript': [dict(activity, id=str(index), text='message %s' % index) for index in range(activities)],
+        'cachedFlights': [{'flight': 'XY%04d' % index, 'from': 'SEA', 'to': 'CDG', 'price': 512.0 + index,
+                           'departure': '2019-05-%02dT10:00:00Z' % (index % 28 + 1)} for index in range(activities)],
+    }
+
+
+async def run(codec: str, state: dict, items: int):
+    storage = CompressedStorage(MemoryStorage(), threshold=0, codec=codec)
+    for index in range(items):
+        await storage.write({'conversation/%s' % index: state})
+    for index in range(items):
+        await storage.read(['conversation/%s' % index])
+    stats = storage.stats
+    print('%-5s %8d -> %7d bytes/item, ratio %.3f, compress %.2f ms/item, decompress %.2f ms/item'
+          % (codec, stats.original_bytes / stats.items_compressed, stats.stored_bytes / stats.items_compressed,
+             stats.ratio, stats.compress_seconds_per_item * 1e3, stats.decompress_seconds_per_item * 1e3))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--activities', type=int, default=200)
+    parser.add_argument('--items', type=int, default=50)
+    args = parser.parse_args()
+
+    state = create_state(args.activities)
+    loop = asyncio.get_event_loop()
+    for codec in ['zlib', 'lzma'] + (['zstd'] if zstandard is not None else []):
+        loop.run_until_complete(run(codec, state, args.items))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures the cold-start time of importing the botbuilder packages, each statement in a fresh interpreter,
+and which heavy dependencies each import pulls in. Run on each release to catch import time regressions.
+
+Usage: python benchmarks/bench_import_time.py [--runs 10] [--max-ms 0]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    ('import botbuilder.schema', 'import botbuilder.schema'),
+    ('import botbuilder.core', 'import botbuilder.core'),
+    ('import TurnContext', 'from botbuilder.core import TurnContext'),
+    ('import Activity', 'from botbuilder.schema import Activity'),
+    ('import BotFrameworkAdapter', 'from botbuilder.core import BotFrameworkAdapter'),
+    ('create BotFrameworkAdapter', 'from botbuilder.core import BotFrameworkAdapter, BotFrameworkAdapterSettings; '
+                                   'BotFrameworkAdapter(BotFrameworkAdapterSettings("", ""))'),
+]
+
+# Reported when loaded by a statement, as they dominate the import time.
+HEAVY_MODULES = ['msrest', 'botframework.connector.auth', 'jwt', 'requests', 'aiohttp']
+
+_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+%s
+elapsed = time.perf_counter() - start
+print(elapsed, ','.join(name for name in %r if name in sys.modules) or '-')
+'''
+
+
+def measure(statement: str) -> (float, str):
+    output = subprocess.check_output([sys.executable, '-c', _SCRIPT % (statement, HEAVY_MODULES)])
+    (elapsed, loaded) = output.decode('utf-8').split()
+    return float(elapsed), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, default=0,
+                        help='exit with an error if "import botbuilder.core" takes longer than this')
+    args = parser.parse_args()
+
+    medians = {}
+    for (name, statement) in STATEMENTS:
+        timings = []
+        for _ in range(args.runs):
+            (elapsed, loaded) = measure(statement)
+            timings.append(elapsed)
+        medians[name] = statistics.median(timings) * 1e3
+        print('%-27s %8.1f ms, loads: %s' % (name, medians[name], loaded))
+
+    if args.max_ms and medians['import botbuilder.core'] > args.max_ms:
+        sys.exit('"import botbuilder.core" took %.1f ms, more than %.1f ms.'
+                 % (medians['import botbuilder.core'], args.max_ms))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures the time and the memory allocated per `TurnContext.send_activity()` call, with a few
+`on_send_activities()` handlers registered, compared with the implementation it replaced.
+
+Usage: python benchmarks/bench_turn_context.py [--handlers 3] [--activities 1] [--sends 20000]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from copy import copy
+
+from botbuilder.schema import Activity, ChannelAccount, ConversationAccount, ResourceResponse
+from botbuilder.core import BotAdapter, TurnContext
+
+
+class NullAdapter(BotAdapter):
+    async def send_activities(self, context, activities):
+        return [ResourceResponse() for _ in activities]
+
+    async def update_activity(self, context, activity):
+        pass
+
+    async def delete_activity(self, context, reference):
+        pass
+
+
+class PreviousTurnContext(TurnContext):
+    """The previous implementation: a reference per send and recursive closures per handler."""
+    async def send_activity(self, *activity_or_text):
+        reference = TurnContext.get_conversation_reference(self.activity)
+
+        output = [TurnContext.apply_conversation_reference(
+            Activity(text=a, type='message') if isinstance(a, str) else a, reference)
+            for a in activity_or_text]
+        for activity in output:
+            activity.input_hint = 'acceptingInput'
+
+        async def callback(context: 'TurnContext', output):
+            responses = await context.adapter.send_activities(context, output)
+            context._responded = True
+            return responses
+
+        await self._emit(self._on_send_activities, output, callback(self, output))
+
+    async def _emit(self, plugins, arg, logic):
+        handlers = copy(plugins)
+
+        async def emit_next(i: int):
+            context = self
+            try:
+                if i < len(handlers):
+                    async def next_handler():
+                        await emit_next(i + 1)
+                    await handlers[i](context, arg, next_handler)
+
+            except Exception as e:
+                raise e
+        await emit_next(0)
+        return await logic
+
+
+async def pass_through(context, activities, next_handler):
+    return await next_handler()
+
+
+def create_context(context_type, handlers: int) -> TurnContext:
+    activity = Activity(id='1234', type='message', text='hi', channel_id='test', service_url='https://example.org',
+                        from_property=ChannelAccount(id='user', name='User'),
+                        recipient=ChannelAccount(id='bot', name='Bot'),
+                        conversation=ConversationAccount(id='convo', name='Convo'))
+    context = context_type(NullAdapter(), activity)
+    for _ in range(handlers):
+        context.on_send_activities(pass_through)
+    return context
+
+
+async def send(context: TurnContext, sends: int, replies: list) -> float:
+    start = time.perf_counter()
+    for _ in range(sends):
+        await context.send_activity(*replies)
+    return time.perf_counter() - start
+
+
+async def peak_allocated(context: TurnContext, replies: list) -> int:
+    tracemalloc.start()
+    try:
+        await context.send_activity(*replies)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--handlers', type=int, default=3)
+    parser.add_argument('--activities', type=int, default=1, help='activities sent per call')
+    parser.add_argument('--sends', type=int, default=20000)
+    args = parser.parse_args()
+
+    replies = ['reply'] * args.activities
+    loop = asyncio.get_event_loop()
+    for (name, context_type) in [('previous', PreviousTurnContext), ('current', TurnContext)]:
+        context = create_context(context_type, args.handlers)
+        loop.run_until_complete(send(context, 100, replies))
+        elapsed = loop.run_until_complete(send(context, args.sends, replies))
+        peak = loop.run_until_complete(peak_allocated(context, replies))
+        print('%-9s %d handlers, %d activities: %.2f us/send, %d bytes peak allocated/send'
+              % (name, args.handlers, args.activities, elapsed / args.sends * 1e6, peak))
+
+
+if __name__ == '__main__':
+    main()
@@ -5,46 +5,104 @@
 # license information.
 # --------------------------------------------------------------------------
 
-from .about import __version__
-from .activity_handler import ActivityHandler
-from .assertions import BotAssert
-from .bot_adapter import BotAdapter
-from .bot_framework_adapter import BotFrameworkAdapter, BotFrameworkAdapterSettings
-from .bot_state import BotState
-from .bot_telemetry_client import BotTelemetryClient
-from .card_factory import CardFactory
-from .conversation_state import ConversationState
-from .memory_storage import MemoryStorage
-from .message_factory import MessageFactory
-from .middleware_set import AnonymousReceiveMiddleware, Middleware, MiddlewareSet
-from .null_telemetry_client import NullTelemetryClient
-from .state_property_accessor import StatePropertyAccessor
-from .state_property_info import StatePropertyInfo
-from .storage import Storage, StoreItem, StorageKeyFactory, calculate_change_hash
-from .turn_context import TurnContext
-from .user_state import UserState
+from botbuilder.schema.lazy_module import make_lazy_module
 
-__all__ = ['ActivityHandler',
+# The public names are imported from their modules on first use (PEP 562), so that importing the package
+# doesn't import msrest, the connector and the auth libraries before they're needed.
+_EXPORTS = {
+    '__version__': '.about',
+    'ActivityDeduplicator': '.activity_deduplicator',
+    'ActivityHandler': '.activity_handler',
+    'AdmissionController': '.admission_controller',
+    'AdmissionRejectedError': '.admission_controller',
+    'AutoSaveStateMiddleware': '.auto_save_state_middleware',
+    'BotAssert': '.assertions',
+    'BotAdapter': '.bot_adapter',
+    'BotFrameworkAdapter': '.bot_framework_adapter',
+    'BotFrameworkAdapterSettings': '.bot_framework_adapter',
+    'ContinueConversationResult': '.bot_framework_adapter',
+    'BotState': '.bot_state',
+    'BotStateSet': '.bot_state_set',
+    'BotTelemetryClient': '.bot_telemetry_client',
+    'CardFactory': '.card_factory',
+    'CompressedStorage': '.compressed_storage',
+    'CompressionRecord': '.compressed_storage',
+    'CompressionStats': '.compressed_storage',
+    'ConnectorClientPool': '.connector_client_pool',
+    'ConversationState': '.conversation_state',
+    'KeyedLock': '.keyed_lock',
+    'MemoryStorage': '.memory_storage',
+    'MessageFactory': '.message_factory',
+    'AnonymousReceiveMiddleware': '.middleware_set',
+    'Middleware': '.middleware_set',
+    'MiddlewareSet': '.middleware_set',
+    'NullTelemetryClient': '.null_telemetry_client',
+    'ParallelMiddlewareError': '.parallel_middleware_group',
+    'ParallelMiddlewareGroup': '.parallel_middleware_group',
+    'RateLimiter': '.rate_limiter',
+    'TokenBucket': '.rate_limiter',
+    'StatePropertyAccessor': '.state_property_accessor',
+    'StatePropertyInfo': '.state_property_info',
+    'Storage': '.storage',
+    'StoreItem': '.storage',
+    'StorageKeyFactory': '.storage',
+    'calculate_change_hash': '.storage',
+    'CREATE_ONLY_E_TAG': '.storage',
+    'TurnContext': '.turn_context',
+    'TelemetryTurnTimingHandler': '.turn_timing',
+    'TurnPhases': '.turn_timing',
+    'TurnTimingHistogram': '.turn_timing',
+    'TurnTimingRecord': '.turn_timing',
+    'UserState': '.user_state',
+    'WriteBehindFlushError': '.write_behind_storage',
+    'WriteBehindStorage': '.write_behind_storage',
+}
+
+make_lazy_module(globals(), _EXPORTS)
+
+__all__ = ['ActivityDeduplicator',
+           'ActivityHandler',
+           'AdmissionController',
+           'AdmissionRejectedError',
            'AnonymousReceiveMiddleware',
+           'AutoSaveStateMiddleware',
            'BotAdapter',
            'BotAssert',
            'BotFrameworkAdapter',
            'BotFrameworkAdapterSettings',
            'BotState',
+           'BotStateSet',
            'BotTelemetryClient',
            'calculate_change_hash',
            'CardFactory',
+           'CompressedStorage',
+           'CompressionRecord',
+           'CompressionStats',
+           'ConnectorClientPool',
+           'ContinueConversationResult',
            'ConversationState',
+           'CREATE_ONLY_E_TAG',
+           'KeyedLock',
            'MemoryStorage',
            'MessageFactory',
            'Middleware',
            'MiddlewareSet',
            'NullTelemetryClient',
+           'ParallelMiddlewareError',
+           'ParallelMiddlewareGroup',
+           'RateLimiter',
            'StatePropertyAccessor',
            'StatePropertyInfo',
            'Storage',
            'StorageKeyFactory',
            'StoreItem',
-           'TurnContext',           
+           'TelemetryTurnTimingHandler',
+           'TokenBucket',
+           'TurnContext',
+           'TurnPhases',
+           'TurnTimingHistogram',
+           'TurnTimingRecord',
            'UserState',
+           'WriteBehindFlushError',
+           'WriteBehindStorage',
            '__version__']
@@ -0,0 +1,136 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import logging
+import time
+from collections import OrderedDict
+
+from botbuilder.schema import Activity
+
+from .storage import CREATE_ONLY_E_TAG, Storage, StoreItem
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ActivityDeduplicator(object):
+    """
+    Remembers the activities the bot has started processing so that channel retries of the same activity
+    are acknowledged without running the turn again. Activities are identified by channel id, conversation
+    id and activity id and remembered for `ttl` seconds in a bounded in-memory cache. When several bot
+    instances share the load, pass a `Storage` so that a retry landing on another instance is caught too.
+
+    Markers are created in the storage with `CREATE_ONLY_E_TAG`, so that only one instance begins an activity
+    retried on several instances at once. With a storage that doesn't support it, markers are written after
+    reading that none exists, so two instances may both begin such an activity.
+    """
+    def __init__(self, ttl: float = 300.0, max_size: int = 10000, storage: Storage = None,
+                 key_prefix: str = 'deduplication/'):
+        """
+        Creates a new ActivityDeduplicator instance.
+        :param ttl: number of seconds an activity id is remembered.
+        :param max_size: maximum number of activity ids kept in memory.
+        :param storage: Optional. Storage shared between bot instances.
+        :param key_prefix: prefix of the keys written to `storage`.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.duplicates = 0
+        self._storage = storage
+        self._key_prefix = key_prefix
+        self._seen = OrderedDict()
+        # Other storages would take the create-only eTag for a literal eTag.
+        self._create_only = getattr(storage, 'supports_create_only', False)
+        if storage is not None and not self._create_only:
+            _LOGGER.warning('ActivityDeduplicator: %s does not support create-only writes, so an activity retried on '
+                            'two instances at once may be processed by both.', type(storage).__name__)
+
+    @staticmethod
+    def get_key(activity: Activity) -> str:
+        """
+        Returns the key identifying an activity, or None if the activity can't be identified.
+        :param activity:
+        :return:
+        """
+        conversation_id = activity.conversation.id if activity.conversation else None
+        if not activity.id or not activity.channel_id or not conversation_id:
+            return None
+        return '%s/%s/%s' % (activity.channel_id, conversation_id, activity.id)
+
+    async def begin(self, activity: Activity) -> bool:
+        """
+        Records that processing of an activity has started. Returns False if the activity is a duplicate of
+        one that has already been processed or is still being processed.
+        :param activity:
+        :return:
+        """
+        key = ActivityDeduplicator.get_key(activity)
+        if key is None:
+            return True
+
+        now = time.time()
+        self._evict_expired(now)
+        if key in self._seen:
+            self.duplicates += 1
+            return False
+        self._remember(key, now + self.ttl)
+
+        if self._storage is not None:
+            storage_key = self._key_prefix + key
+            try:
+                items = await self._storage.read([storage_key])
+                item = items.get(storage_key)
+                if item is None or _get_expires(item) <= now:
+                    # The marker is created only if no other instance created it since the read, or replaces
+                    # the expired marker read only if no other instance replaced it since.
+                    if item is None:
+                        e_tag = CREATE_ONLY_E_TAG if self._create_only else '*'
+                    else:
+                        e_tag = item.e_tag if isinstance(item, StoreItem) else '*'
+                    try:
+                        await self._storage.write({storage_key: StoreItem(expires=now + self.ttl, e_tag=e_tag)})
+                        return True
+                    except KeyError:
+                        # An eTag conflict: another instance began the activity concurrently.
+                        pass
+                # Another instance owns the activity, so only remember the activities begun here.
+                self._seen.pop(key, None)
+                self.duplicates += 1
+                return False
+            except Exception:
+                # The turn won't run, so a retry of this activity must not be treated as a duplicate.
+                self._seen.pop(key, None)
+                raise
+        return True
+
+    async def abandon(self, activity: Activity) -> None:
+        """
+        Forgets an activity whose turn failed, so that a retry of it is processed again.
+        :param activity:
+        :return:
+        """
+        key = ActivityDeduplicator.get_key(activity)
+        if key is None:
+            return
+        self._seen.pop(key, None)
+        if self._storage is not None:
+            await self._storage.delete([self._key_prefix + key])
+
+    def _remember(self, key: str, expires: float) -> None:
+        self._seen[key] = expires
+        while len(self._seen) > self.max_size:
+            self._seen.popitem(last=False)
+
+    def _evict_expired(self, now: float) -> None:
+        # Every entry lives for the same ttl, so insertion order is also expiry order.
+        while self._seen:
+            key, expires = next(iter(self._seen.items()))
+            if expires > now:
+                break
+            del self._seen[key]
+
+
+def _get_expires(item) -> float:
+    # Markers were written as dicts before they were written as `StoreItem`s.
+    if isinstance(item, dict):
+        return item.get('expires', 0)
+    return getattr(item, 'expires', 0)
@@ -1,12 +1,36 @@
 import asyncio
-from botbuilder.schema import ( 
-                            ActivityTypes, 
-                            ChannelAccount 
+from typing import Dict
+from botbuilder.schema import (
+                            ActivityTypes,
+                            ChannelAccount
                             )
 from .turn_context import TurnContext
 
 
 class ActivityHandler:
+    """
+    Routes each incoming activity to the handler for its type. `activity_type_handlers` maps activity types to
+    the names of the methods handling them; a derived class can route more types by declaring its own
+    `activity_type_handlers`, which is merged with those of its base classes. The routing table is built once
+    when the class is created, so a turn only awaits the matching handler. It holds method names, which are
+    looked up on the instance at dispatch so that overrides made later still apply.
+    """
+    activity_type_handlers: Dict[str, str] = {
+        ActivityTypes.message: 'on_message_activity',
+        ActivityTypes.conversation_update: 'on_conversation_update_activity',
+        ActivityTypes.event: 'on_event_activity'
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._build_dispatch_table()
+
+    @classmethod
+    def _build_dispatch_table(cls):
+        handler_names = {}
+        for klass in reversed(cls.__mro__):
+            handler_names.update(klass.__dict__.get('activity_type_handlers', {}))
+        cls._dispatch_table = handler_names
 
     async def on_turn(self, turn_context: TurnContext):
         if turn_context is None:
@@ -18,11 +42,10 @@ class ActivityHandler:
         if hasattr(turn_context.activity, 'type') and turn_context.activity.type is None:
             raise TypeError('ActivityHandler.on_turn(): turn_context activity must have a non-None type.')
 
-        return {
-            ActivityTypes.message: await self.on_message_activity(turn_context),
-            ActivityTypes.conversation_update: await self.on_conversation_update_activity(turn_context),
-            ActivityTypes.event: await self.on_event_activity(turn_context)
-        }.get(turn_context.activity.type, await self.on_unrecognized_activity_type(turn_context))
+        handler_name = self._dispatch_table.get(turn_context.activity.type)
+        if handler_name is None:
+            return await self.on_unrecognized_activity_type(turn_context)
+        return await getattr(self, handler_name)(turn_context)
 
     async def on_message_activity(self, turn_context: TurnContext):
         return
@@ -54,3 +77,6 @@ class ActivityHandler:
 
     async def on_unrecognized_activity_type(self, turn_context: TurnContext):
         return
+
+
+ActivityHandler._build_dispatch_table()
@@ -0,0 +1,101 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+from collections import deque
+
+
+class AdmissionRejectedError(Exception):
+    """
+    Raised when a turn is shed because the bot is overloaded. The request is safe to retry, so the web
+    server should answer with `status` (503 Service Unavailable) and a `Retry-After` of `retry_after` seconds.
+    """
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super(AdmissionRejectedError, self).__init__(message)
+        self.status = 503
+        self.retry_after = retry_after
+
+
+class AdmissionController(object):
+    """
+    Limits the number of turns processed at once. Turns over `max_in_flight` wait in a bounded FIFO queue
+    for up to `queue_timeout` seconds; when the queue is full or the wait times out the turn is rejected
+    with an `AdmissionRejectedError` instead of piling up more pending work.
+    """
+    def __init__(self, max_in_flight: int = 100, max_queued: int = 100, queue_timeout: float = 5.0,
+                 retry_after: float = 1.0):
+        """
+        Creates a new AdmissionController instance.
+        :param max_in_flight: maximum number of turns processed at once.
+        :param max_queued: maximum number of turns waiting for a slot. 0 rejects as soon as all slots are busy.
+        :param queue_timeout: number of seconds a turn may wait for a slot before it is rejected.
+        :param retry_after: number of seconds rejected callers are asked to wait before retrying.
+        """
+        if max_in_flight < 1:
+            raise ValueError('AdmissionController(): max_in_flight must be greater than 0.')
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.rejected = 0
+        self._in_flight = 0
+        self._waiters = deque()
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Number of turns currently being processed.
+        :return:
+        """
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """
+        Number of turns currently waiting for a slot.
+        :return:
+        """
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        """
+        Waits for a free slot, raising `AdmissionRejectedError` if the turn has to be shed.
+        :return:
+        """
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            return
+
+        if self.queued >= self.max_queued:
+            self.rejected += 1
+            raise AdmissionRejectedError('AdmissionController.acquire(): too many turns queued.', self.retry_after)
+
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # release() hands its slot directly to the waiter, so in_flight is not incremented here.
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise AdmissionRejectedError('AdmissionController.acquire(): timed out waiting for a free slot.',
+                                         self.retry_after)
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the caller was cancelled.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        """
+        Frees the slot of a finished turn, handing it to the oldest waiting turn if there is one.
+        :return:
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
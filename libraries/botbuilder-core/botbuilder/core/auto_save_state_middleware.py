@@ -0,0 +1,47 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from typing import Union
+
+from .bot_state import BotState
+from .bot_state_set import BotStateSet
+from .middleware_set import Middleware
+from .turn_context import TurnContext
+
+
+class AutoSaveStateMiddleware(Middleware):
+    """
+    Loads the state of each registered `BotState` scope before the turn and saves the scopes that changed after
+    it, through a `BotStateSet`, so that a turn costs one storage read and at most one write per storage.
+
+    Usage Example:
+    adapter.use(AutoSaveStateMiddleware(conversation_state, user_state))
+    """
+    def __init__(self, *bot_states: Union[BotState, BotStateSet], load: bool = True):
+        """
+        Creates a new AutoSaveStateMiddleware instance.
+        :param bot_states: the scopes to load and save, or a `BotStateSet`.
+        :param load: Optional. False to only save after the turn, and let each scope load when it is first used.
+        """
+        self.bot_state_set = BotStateSet()
+        for bot_state in bot_states:
+            if isinstance(bot_state, BotStateSet):
+                self.bot_state_set.add(*bot_state.bot_states)
+            else:
+                self.bot_state_set.add(bot_state)
+        self.load = load
+
+    def add(self, bot_state: BotState) -> 'AutoSaveStateMiddleware':
+        """
+        Adds a scope to load and save.
+        :param bot_state:
+        :return:
+        """
+        self.bot_state_set.add(bot_state)
+        return self
+
+    async def on_process_request(self, context: TurnContext, logic):
+        if self.load:
+            await self.bot_state_set.load_all(context)
+        await logic()
+        await self.bot_state_set.save_all_changes(context)
@@ -1,17 +1,31 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
+import logging
+import time
 from abc import ABC, abstractmethod
 from typing import List, Callable
 from botbuilder.schema import Activity, ConversationReference
 
 from .turn_context import TurnContext
 from .middleware_set import MiddlewareSet
+from .turn_timing import TurnPhases, TurnTimingRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+# Phases that run inside either `middleware` or `bot_logic`.
+_NESTED_PHASES = (TurnPhases.state_load, TurnPhases.state_save, TurnPhases.send_activities)
+
+
+def _nested_time(record: TurnTimingRecord) -> float:
+    return sum(record.phases.get(phase, 0.0) for phase in _NESTED_PHASES)
 
 
 class BotAdapter(ABC):
     def __init__(self):
         self._middleware = MiddlewareSet()
+        self._turn_timing_handlers: List[Callable[[TurnTimingRecord], None]] = []
+        self.buffer_activities: bool = False
 
     @abstractmethod
     async def send_activities(self, context: TurnContext, activities: List[Activity]):
@@ -48,6 +62,17 @@ class BotAdapter(ABC):
         """
         self._middleware.use(middleware)
 
+    def on_turn_timing(self, handler: Callable[[TurnTimingRecord], None]) -> 'BotAdapter':
+        """
+        Registers a handler that receives a `TurnTimingRecord` with the time spent in each phase of every turn.
+        Timings are only recorded while at least one handler is registered. An error raised by a handler is
+        logged, and neither stops the other handlers nor affects the turn.
+        :param handler:
+        :return:
+        """
+        self._turn_timing_handlers.append(handler)
+        return self
+
     async def run_middleware(self, context: TurnContext, callback: Callable=None):
         """
         Called by the parent class to run the adapters middleware set and calls the passed in `callback()` handler at
@@ -56,4 +81,48 @@ class BotAdapter(ABC):
         :param callback:
         :return:
         """
-        return await self._middleware.receive_activity_with_status(context, callback)
+        if self.buffer_activities:
+            context.buffer_activities = True
+        if not self._turn_timing_handlers:
+            return await self._receive_activity(context, callback)
+
+        record = context.turn_timing
+        if record is None:
+            record = context.turn_timing = TurnTimingRecord(context.activity.channel_id, context.activity.type)
+
+        # The state I/O and sends of the middleware are only counted in their own phases, those of the bot logic
+        # in both their own phases and `bot_logic`.
+        bot_logic = nested_in_bot_logic = 0.0
+
+        async def timed_callback(turn_context: TurnContext):
+            nonlocal bot_logic, nested_in_bot_logic
+            nested = _nested_time(record)
+            callback_start = time.monotonic()
+            try:
+                with record.phase(TurnPhases.bot_logic):
+                    return await callback(turn_context)
+            finally:
+                bot_logic += time.monotonic() - callback_start
+                nested_in_bot_logic += _nested_time(record) - nested
+
+        start = time.monotonic()
+        nested_at_start = _nested_time(record)
+        try:
+            return await self._receive_activity(context, timed_callback if callback else None)
+        finally:
+            nested_in_middleware = _nested_time(record) - nested_at_start - nested_in_bot_logic
+            record.add(TurnPhases.middleware, time.monotonic() - start - bot_logic - nested_in_middleware)
+            record.finish()
+            for handler in self._turn_timing_handlers:
+                try:
+                    handler(record)
+                except Exception:
+                    # Reporting must not replace the outcome of the turn.
+                    _LOGGER.exception('BotAdapter: turn timing handler %r failed.', handler)
+
+    async def _receive_activity(self, context: TurnContext, callback: Callable):
+        result = await self._middleware.receive_activity_with_status(context, callback)
+        if context.buffer_activities:
+            # Activities queued by a turn that raised are dropped along with the rest of the turn.
+            await context.flush()
+        return result
@@ -2,18 +2,30 @@
 # Licensed under the MIT License.
 
 import asyncio
-from typing import List, Callable
+from collections import OrderedDict
+from typing import TYPE_CHECKING, AsyncIterable, Callable, Dict, Iterable, List, Union
 from botbuilder.schema import (Activity, ChannelAccount,
                                ConversationAccount,
                                ConversationParameters, ConversationReference,
-                               ConversationsResult, ConversationResourceResponse)
-from botframework.connector import ConnectorClient
-from botframework.connector.auth import (MicrosoftAppCredentials,
-                                         JwtTokenValidation, SimpleCredentialProvider)
+                               ConversationsResult, ConversationResourceResponse,
+                               ResourceResponse)
+from botbuilder.schema.json_codec import DEFAULT_CODEC
+from botbuilder.schema.lazy_activity import LazyActivity
+from botbuilder.schema.serialization import from_dict
 
 from . import __version__
+from .activity_deduplicator import ActivityDeduplicator
+from .admission_controller import AdmissionController
 from .bot_adapter import BotAdapter
+from .connector_client_pool import ConnectorClientPool
+from .keyed_lock import KeyedLock
+from .rate_limiter import RateLimiter, TokenBucket
 from .turn_context import TurnContext
+from .turn_timing import TurnPhases, TurnTimingRecord
+
+if TYPE_CHECKING:
+    # The connector and auth libraries are imported when the adapter first needs them, to keep imports cheap.
+    from botframework.connector.aio import AioHttpTransport, ConnectorClient
 
 USER_AGENT = f"Microsoft-BotFramework/3.1 (BotBuilder Python/{__version__})"
 
@@ -24,13 +36,64 @@ class BotFrameworkAdapterSettings(object):
         self.app_password = app_password
 
 
+class ContinueConversationResult(object):
+    """
+    The outcome of one proactive turn run by `BotFrameworkAdapter.continue_conversations()`.
+    """
+    def __init__(self, reference: ConversationReference, result: object = None, error: Exception = None):
+        self.reference = reference
+        self.result = result
+        self.error = error
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
 class BotFrameworkAdapter(BotAdapter):
 
-    def __init__(self, settings: BotFrameworkAdapterSettings):
+    def __init__(self, settings: BotFrameworkAdapterSettings, connector_client_pool: ConnectorClientPool = None,
+                 connector_transport: 'AioHttpTransport' = None, concurrent_send: bool = False,
+                 rate_limiter: RateLimiter = None, admission_controller: AdmissionController = None,
+                 serialize_conversation_turns: bool = False, activity_deduplicator: ActivityDeduplicator = None,
+                 buffer_activities: bool = False, lazy_activities: bool = False):
+        """
+        Creates a new BotFrameworkAdapter instance.
+        :param settings:
+        :param connector_client_pool: Optional. Pool used to reuse connector clients across turns.
+        :param connector_transport: Optional. Shared HTTP transport used by every connector client, e.g. an
+        `AioHttpTransport` to send activities with native asyncio I/O instead of a thread pool.
+        :param concurrent_send: Optional. If `True`, `send_activities()` sends to different conversations
+        concurrently while keeping the order of activities within each conversation.
+        :param rate_limiter: Optional. Throttles sends per service url and conversation, queueing sends over the
+        limit and retrying sends rejected by the channel with a 429.
+        :param admission_controller: Optional. Limits the number of turns `process_activity()` runs at once.
+        :param serialize_conversation_turns: Optional. If `True`, `process_activity()` runs the turns of a single
+        conversation one at a time, so concurrent activities don't race when loading and saving state.
+        :param activity_deduplicator: Optional. Acknowledges channel retries of an activity that is already
+        being processed, or has been processed, without running the turn again.
+        :param buffer_activities: Optional. If `True`, activities sent during a turn are queued and sent as a
+        single batch at the end of the turn, or when `TurnContext.flush()` is called. `TurnContext.responded`
+        is True as soon as an activity is queued.
+        :param lazy_activities: Optional. If `True`, `process_activity()` parses request bodies into a
+        `LazyActivity`, which only deserializes the attributes the turn reads.
+        """
+        from botframework.connector.auth import MicrosoftAppCredentials, SimpleCredentialProvider
+
         super(BotFrameworkAdapter, self).__init__()
         self.settings = settings or BotFrameworkAdapterSettings('', '')
         self._credentials = MicrosoftAppCredentials(self.settings.app_id, self.settings.app_password)
         self._credential_provider = SimpleCredentialProvider(self.settings.app_id, self.settings.app_password)
+        self._connector_client_pool = connector_client_pool if connector_client_pool is not None \
+            else ConnectorClientPool()
+        self._connector_transport = connector_transport
+        self.concurrent_send = concurrent_send
+        self._rate_limiter = rate_limiter
+        self._admission_controller = admission_controller
+        self._conversation_locks = KeyedLock() if serialize_conversation_turns else None
+        self._activity_deduplicator = activity_deduplicator
+        self.buffer_activities = buffer_activities
+        self.lazy_activities = lazy_activities
 
     async def continue_conversation(self, reference: ConversationReference, logic):
         """
@@ -46,6 +109,83 @@ class BotFrameworkAdapter(BotAdapter):
         context = self.create_context(request)
         return await self.run_middleware(context, logic)
 
+    async def continue_conversations(self, references: Union[Iterable[ConversationReference],
+                                                             AsyncIterable[ConversationReference]],
+                                     logic, max_concurrency: int = 10,
+                                     channel_rate_limits: Dict[str, float] = None):
+        """
+        Continues many conversations at once, for example to broadcast a notification to a large audience.
+        References are pulled lazily from an iterable or async iterable and at most `max_concurrency` turns
+        run at a time, so memory use does not grow with the size of the audience. This is an async
+        generator that yields a `ContinueConversationResult` for each reference as its turn completes.
+
+        Usage Example:
+        async for outcome in adapter.continue_conversations(references, logic, max_concurrency=50):
+            if not outcome.succeeded:
+                log_failure(outcome.reference, outcome.error)
+        :param references:
+        :param logic:
+        :param max_concurrency: maximum number of turns running at once.
+        :param channel_rate_limits: Optional. Maximum number of turns started per second, keyed by channel id.
+        :return:
+        """
+        if max_concurrency < 1:
+            raise ValueError('BotFrameworkAdapter.continue_conversations(): max_concurrency must be greater than 0.')
+
+        rate_limits = {channel_id: TokenBucket(rate) for (channel_id, rate) in (channel_rate_limits or {}).items()}
+        source = BotFrameworkAdapter._iterate_references(references)
+        source_lock = asyncio.Lock()
+        source_errors: List[Exception] = []
+        outcomes = asyncio.Queue(maxsize=max_concurrency)
+        done = object()
+
+        async def run_turns():
+            while True:
+                async with source_lock:
+                    try:
+                        reference = await source.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    except Exception as e:
+                        source_errors.append(e)
+                        break
+
+                rate_limit = rate_limits.get(reference.channel_id)
+                if rate_limit is not None:
+                    await rate_limit.acquire()
+                try:
+                    outcome = ContinueConversationResult(reference,
+                                                         result=await self.continue_conversation(reference, logic))
+                except Exception as e:
+                    outcome = ContinueConversationResult(reference, error=e)
+                await outcomes.put(outcome)
+            await outcomes.put(done)
+
+        workers = [asyncio.ensure_future(run_turns()) for _ in range(max_concurrency)]
+        try:
+            running = len(workers)
+            while running:
+                outcome = await outcomes.get()
+                if outcome is done:
+                    running -= 1
+                else:
+                    yield outcome
+            if source_errors:
+                raise source_errors[0]
+        finally:
+            # Stop the remaining turns if the caller stops consuming results early.
+            for worker in workers:
+                worker.cancel()
+
+    @staticmethod
+    async def _iterate_references(references):
+        if hasattr(references, '__aiter__'):
+            async for reference in references:
+                yield reference
+        else:
+            for reference in references:
+                yield reference
+
     async def create_conversation(self, reference: ConversationReference, logic):
         """
         Starts a new conversation with a user. This is typically used to Direct Message (DM) a member
@@ -78,19 +218,60 @@ class BotFrameworkAdapter(BotAdapter):
         """
         Processes an activity received by the bots web server. This includes any messages sent from a
         user and is the method that drives what's often referred to as the bots "Reactive Messaging"
-        flow.
+        flow. When the adapter has an `AdmissionController` and too many turns are already running, an
+        `AdmissionRejectedError` is raised so the web server can answer with a retryable 503.
         :param req:
         :param auth_header:
         :param logic:
         :return:
         """
-        activity = await self.parse_request(req)
+        if self._admission_controller is None:
+            return await self._process_activity(req, auth_header, logic)
+
+        await self._admission_controller.acquire()
+        try:
+            return await self._process_activity(req, auth_header, logic)
+        finally:
+            self._admission_controller.release()
+
+    async def _process_activity(self, req, auth_header: str, logic: Callable):
+        turn_timing = None
+        if self._turn_timing_handlers:
+            turn_timing = TurnTimingRecord()
+            with turn_timing.phase(TurnPhases.parse_request):
+                activity = await self.parse_request(req, self.lazy_activities)
+            turn_timing.channel_id = activity.channel_id
+            turn_timing.activity_type = activity.type
+        else:
+            activity = await self.parse_request(req, self.lazy_activities)
         auth_header = auth_header or ''
 
-        await self.authenticate_request(activity, auth_header)
+        if turn_timing is None:
+            await self.authenticate_request(activity, auth_header)
+        else:
+            with turn_timing.phase(TurnPhases.authenticate_request):
+                await self.authenticate_request(activity, auth_header)
+
+        if self._activity_deduplicator is not None and not await self._activity_deduplicator.begin(activity):
+            # The channel retried an activity that has already been received, so don't run the turn again.
+            return None
+
         context = self.create_context(activity)
+        context.turn_timing = turn_timing
+        try:
+            return await self._run_conversation_turn(context, logic)
+        except Exception:
+            if self._activity_deduplicator is not None:
+                await self._activity_deduplicator.abandon(activity)
+            raise
 
-        return await self.run_middleware(context, logic)
+    async def _run_conversation_turn(self, context: TurnContext, logic: Callable):
+        conversation = context.activity.conversation
+        if self._conversation_locks is None or not conversation or not conversation.id:
+            return await self.run_middleware(context, logic)
+
+        async with self._conversation_locks.lock('%s/%s' % (context.activity.channel_id, conversation.id)):
+            return await self.run_middleware(context, logic)
 
     async def authenticate_request(self, request: Activity, auth_header: str):
         """
@@ -99,6 +280,8 @@ class BotFrameworkAdapter(BotAdapter):
         :param auth_header:
         :return:
         """
+        from botframework.connector.auth import JwtTokenValidation
+
         await JwtTokenValidation.authenticate_request(request, auth_header, self._credential_provider)
 
     def create_context(self, activity):
@@ -110,10 +293,12 @@ class BotFrameworkAdapter(BotAdapter):
         return TurnContext(self, activity)
 
     @staticmethod
-    async def parse_request(req):
+    async def parse_request(req, lazy: bool = False):
         """
-        Parses and validates request
+        Parses and validates request. The request body can be the raw JSON bytes received by the web server,
+        which are turned into an Activity in one step by the default `JsonCodec`.
         :param req:
+        :param lazy: if True, a request body is parsed into a `LazyActivity`.
         :return:
         """
 
@@ -122,11 +307,22 @@ class BotFrameworkAdapter(BotAdapter):
                 raise TypeError('BotFrameworkAdapter.parse_request(): invalid or missing activity type.')
             return True
 
-        if not isinstance(req, Activity):
+        def deserialize_body(body) -> Activity:
+            if isinstance(body, (bytes, bytearray, str)):
+                return DEFAULT_CODEC.decode_activity(body, lazy=lazy)
+            if lazy and isinstance(body, dict):
+                return LazyActivity.from_dict(body)
+            return from_dict(Activity, body)
+
+        if isinstance(req, (bytes, bytearray)):
+            activity = deserialize_body(req)
+            if await validate_activity(activity):
+                return activity
+        elif not isinstance(req, Activity):
             # If the req is a raw HTTP Request, try to deserialize it into an Activity and return the Activity.
             if hasattr(req, 'body'):
                 try:
-                    activity = Activity().deserialize(req.body)
+                    activity = deserialize_body(req.body)
                     is_valid_activity = await validate_activity(activity)
                     if is_valid_activity:
                         return activity
@@ -134,7 +330,7 @@ class BotFrameworkAdapter(BotAdapter):
                     raise e
             elif 'body' in req:
                 try:
-                    activity = Activity().deserialize(req['body'])
+                    activity = deserialize_body(req['body'])
                     is_valid_activity = await validate_activity(activity)
                     if is_valid_activity:
                         return activity
@@ -180,23 +376,56 @@ class BotFrameworkAdapter(BotAdapter):
         except Exception as e:
             raise e
 
-    async def send_activities(self, context: TurnContext, activities: List[Activity]):
-        try:
-            for activity in activities:
-                if activity.type == 'delay':
-                    try:
-                        delay_in_ms = float(activity.value) / 1000
-                    except TypeError:
-                        raise TypeError('Unexpected delay value passed. Expected number or str type.')
-                    except AttributeError:
-                        raise Exception('activity.value was not found.')
-                    else:
-                        await asyncio.sleep(delay_in_ms)
-                else:
-                    client = self.create_connector_client(activity.service_url)
-                    await client.conversations.send_to_conversation(activity.conversation.id, activity)
-        except Exception as e:
-            raise e
+    async def send_activities(self, context: TurnContext, activities: List[Activity]) -> List[ResourceResponse]:
+        """
+        Sends a set of activities to the user. When `concurrent_send` is enabled, activities for different
+        conversations are pipelined concurrently. Activities for the same conversation are always sent in
+        order, and a `delay` activity only holds back the activities that follow it in its own conversation.
+        If a send fails, the rest of its conversation isn't sent, the other conversations are sent to the end,
+        and then the error of the first conversation that failed is raised.
+        :param context:
+        :param activities:
+        :return:
+        """
+        if not self.concurrent_send:
+            return [await self._send_activity(activity) for activity in activities]
+
+        responses: List[ResourceResponse] = [None] * len(activities)
+        conversations = OrderedDict()
+        for (idx, activity) in enumerate(activities):
+            conversation_id = activity.conversation.id if activity.conversation else None
+            conversations.setdefault((activity.service_url, conversation_id), []).append(idx)
+
+        async def send_conversation(indices: List[int]):
+            for idx in indices:
+                responses[idx] = await self._send_activity(activities[idx])
+
+        # Waits for every conversation, so that no send is left running unobserved when one of them fails.
+        results = await asyncio.gather(*[send_conversation(indices) for indices in conversations.values()],
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return responses
+
+    async def _send_activity(self, activity: Activity) -> ResourceResponse:
+        if activity.type == 'delay':
+            try:
+                delay_in_ms = float(activity.value) / 1000
+            except TypeError:
+                raise TypeError('Unexpected delay value passed. Expected number or str type.')
+            except AttributeError:
+                raise Exception('activity.value was not found.')
+            else:
+                await asyncio.sleep(delay_in_ms)
+                return ResourceResponse()
+
+        client = self.create_connector_client(activity.service_url)
+        if self._rate_limiter is None:
+            return await client.conversations.send_to_conversation(activity.conversation.id, activity)
+        return await self._rate_limiter.send(
+            activity.service_url, activity.conversation.id,
+            lambda: client.conversations.send_to_conversation(activity.conversation.id, activity))
 
     async def delete_conversation_member(self, context: TurnContext, member_id: str) -> None:
         """
@@ -275,12 +504,18 @@ class BotFrameworkAdapter(BotAdapter):
         client = self.create_connector_client(service_url)
         return await client.conversations.get_conversations(continuation_token)
 
-    def create_connector_client(self, service_url: str) -> ConnectorClient:
+    def create_connector_client(self, service_url: str) -> 'ConnectorClient':
         """
-        Allows for mocking of the connector client in unit tests.
+        Allows for mocking of the connector client in unit tests. Clients are reused from the adapters
+        `ConnectorClientPool` so that each turn talks to the channel over an already warm connection.
         :param service_url:
         :return:
         """
-        client = ConnectorClient(self._credentials, base_url=service_url)
-        client.config.add_user_agent(USER_AGENT)
-        return client
+        def create_client():
+            from botframework.connector.aio import ConnectorClient
+
+            client = ConnectorClient(self._credentials, base_url=service_url, transport=self._connector_transport)
+            client.config.add_user_agent(USER_AGENT)
+            return client
+
+        return self._connector_client_pool.get(service_url, self._credentials, create_client)
@@ -4,53 +4,235 @@
 from .turn_context import TurnContext
 from .middleware_set import Middleware
 from .storage import calculate_change_hash, StoreItem, StorageKeyFactory, Storage
+from .turn_timing import TurnPhases
 from .property_manager import PropertyManager
 from botbuilder.core.state_property_accessor import StatePropertyAccessor
 from botbuilder.core import turn_context
-from _ast import Try
+import hashlib
+import pickle
+import warnings
 from abc import abstractmethod
-from typing import Callable, Dict
+from typing import Callable, Dict, List, Set, Tuple
 
 
 
 
+# Values of these types cannot be changed in place, so a property holding one only changes through its accessor.
+_IMMUTABLE_TYPES = frozenset([str, int, float, bool, bytes, complex, type(None)])
+
+
 class CachedBotState:
     """
     Internal cached bot state.
+
+    Tracks whether the state changed during the turn, so that unchanged state is not written back. Setting or
+    deleting a property marks it changed. Mutable values, such as dicts or objects handed out by a property
+    accessor, can also be changed in place; unless `track_in_place` is False, a digest of their content is kept
+    and compared on save.
     """
-    def __init__(self, state: Dict[str, object] = None) : 
-        self._state = state if state != None else {}
-        self._hash = self.compute_hash(state)
+    def __init__(self, state: Dict[str, object] = None, loaded_properties: Set[str] = None,
+                 track_in_place: bool = True):
+        self._state = state if state is not None else {}
+        # When each property is stored as its own item, the names of the properties read from storage so far.
+        # None when the whole state was read, or cleared.
+        self.loaded_properties = loaded_properties
+        self.track_in_place = track_in_place
+        # True when the whole state was replaced or cleared, otherwise the names of the properties set or deleted.
+        self._all_changed = False
+        self._changed: Set[str] = set()
+        # The digests of the mutable values handed out, by property name. None until computed on save.
+        self._digests: Dict[str, bytes] = {}
+        self._state_digest: bytes = None
+        # The outcome of the last comparison: the current digests and the changed properties, reused by the
+        # save that follows it so that values are only digested once per save.
+        self._checked: Tuple[bytes, Dict[str, bytes], Set[str]] = None
 
     @property
     def state(self) -> Dict[str, object]:
         return self._state
+
     @state.setter
     def state(self, state: Dict[str, object]):
-        self._state = self._state
-        
+        self._state = state
+        self._all_changed = True
+        self._checked = None
+
     @property
-    def hash(self) -> str:
-        return self._hash
-    
+    def hash(self) -> bytes:
+        """
+        Deprecated: changes are no longer tracked with a hash of the whole state. Returns the digest of the current
+        state. Setting it to `compute_hash(state)` records the state as saved, as `mark_saved()` does, and setting
+        any other value marks the state changed.
+        :return:
+        """
+        warnings.warn('CachedBotState.hash is deprecated, use is_changed and mark_saved() instead.',
+                      DeprecationWarning, stacklevel=2)
+        return self.compute_hash(self._state)
+
     @hash.setter
-    def hash(self, hash: str):
-        self._hash = hash
+    def hash(self, value: bytes):
+        warnings.warn('CachedBotState.hash is deprecated, use is_changed and mark_saved() instead.',
+                      DeprecationWarning, stacklevel=2)
+        if value == self.compute_hash(self._state):
+            self.mark_saved()
+        else:
+            self.mark_dirty()
 
     @property
     def is_changed(self) -> bool:
-        return self.hash != self.compute_hash(self._state)
+        if self._all_changed or self._changed:
+            self._checked = None
+            return True
+        return self._check() != set()
+
+    def changed_properties(self) -> Set[str]:
+        """
+        Returns the names of the properties set, deleted or changed in place, or None if any property may have
+        changed, e.g. after the whole state dict was replaced or handed out and changed.
+        :return:
+        """
+        if self._all_changed:
+            return None
+        if self._checked is not None:
+            return self._checked[2]
+        return self._check()
+
+    def get_property(self, name: str) -> object:
+        """
+        Returns the value of a property, tracking it for in place changes if it is mutable.
+        :param name:
+        :return:
+        """
+        value = self._state[name]
+        if self.track_in_place and type(value) not in _IMMUTABLE_TYPES and name not in self._digests:
+            self._digests[name] = self.compute_hash(value)
+            self._checked = None
+        return value
+
+    def set_property(self, name: str, value: object) -> None:
+        self._state[name] = value
+        self._changed.add(name)
+        if self.track_in_place and type(value) not in _IMMUTABLE_TYPES:
+            self._digests[name] = None
+        else:
+            self._digests.pop(name, None)
+        self._checked = None
+
+    def delete_property(self, name: str) -> None:
+        del self._state[name]
+        self._changed.add(name)
+        self._digests.pop(name, None)
+        self._checked = None
+
+    def add_loaded_properties(self, names: List[str], values: Dict[str, object]) -> None:
+        """
+        Adds properties read from storage after the rest of the state, without marking them changed.
+        :param names: the names of the properties read.
+        :param values: the values of those found in storage.
+        """
+        # The state dict handed out is still compared as a whole, unless it was changed already.
+        unchanged = self._state_digest is not None and self._state_digest == self.compute_hash(self._state)
+        self._state.update(values)
+        self.loaded_properties.update(names)
+        if unchanged:
+            self._state_digest = self.compute_hash(self._state)
+        self._checked = None
+
+    def track_state(self) -> None:
+        """
+        Tracks the whole state dict for in place changes, once it has been handed out.
+        """
+        if self.track_in_place and self._state_digest is None:
+            self._state_digest = self.compute_hash(self._state)
+            self._checked = None
+
+    def mark_dirty(self) -> None:
+        self._all_changed = True
+        self._checked = None
+
+    def mark_saved(self) -> None:
+        """
+        Records the current state as the saved one. Values handed out earlier may still be changed later in
+        the turn, so their digests are refreshed, reusing those computed when the changes were checked.
+        """
+        if self._checked is None:
+            self._check()
+        (self._state_digest, self._digests, _) = self._checked
+        self._checked = None
+        self._all_changed = False
+        self._changed = set()
+
+    def _check(self) -> Set[str]:
+        # Digests the tracked values, and returns the names of the properties changed since they were handed out,
+        # or None if the state dict changed as a whole.
+        state_digest = self.compute_hash(self._state) if self._state_digest is not None else None
+        digests = {name: self.compute_hash(self._state[name]) for name in self._digests if name in self._state}
+        if state_digest != self._state_digest:
+            changed = None
+        else:
+            changed = set(self._changed)
+            changed.update(name for (name, digest) in self._digests.items() if digests.get(name) != digest)
+        self._checked = (state_digest, digests, changed)
+        return changed
+
+    def compute_hash(self, obj: object) -> bytes:
+        """
+        Computes a digest of the content of a value. Values that cannot be pickled fall back to their `str()`.
+        :param obj:
+        :return:
+        """
+        try:
+            data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            data = str(obj).encode('utf-8', 'surrogatepass')
+        return hashlib.blake2b(data, digest_size=16).digest()
 
-    def compute_hash(self, obj: object) -> str:
-        # TODO: Should this be compatible with C# JsonConvert.SerializeObject ?
-        return str(obj)
+
+class _NoPhaseTimer(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NO_PHASE_TIMER = _NoPhaseTimer()
+
+
+def _phase_timer(turn_context: TurnContext, phase: str):
+    """
+    Returns a context manager recording the duration of its body as a phase of the turn when the turn is being
+    timed, and one doing nothing otherwise, so that storage is called directly either way.
+    :param turn_context:
+    :param phase: one of `TurnPhases`.
+    :return:
+    """
+    turn_timing = getattr(turn_context, 'turn_timing', None)
+    if turn_timing is None:
+        return _NO_PHASE_TIMER
+    return turn_timing.phase(phase)
 
 
 class BotState(PropertyManager):
-    def __init__(self, storage: Storage, context_service_key: str):
+    def __init__(self, storage: Storage, context_service_key: str, per_property: bool = False,
+                 track_in_place_changes: bool = True):
+        """
+        Creates a new BotState instance.
+        :param storage:
+        :param context_service_key:
+        :param per_property: Optional. True to store each property created by `create_property()` as its own
+        storage item, so that saving only writes the properties that changed instead of the whole state. A
+        property created after the state was loaded is read when it is first accessed.
+        :param track_in_place_changes: Optional. False to treat a property as changed only when it is set or
+        deleted, which saves computing a digest of every mutable value read. A value changed in place, e.g. a
+        dict returned by an accessor, must then be set again to be saved.
+        """
         self.state_key = 'state'
         self._storage = storage
         self._context_service_key = context_service_key
+        self.per_property = per_property
+        self.track_in_place_changes = track_in_place_changes
+        self._property_names: List[str] = []
 
     def create_property(self, name:str) -> StatePropertyAccessor:
         """
@@ -61,12 +243,26 @@ class BotState(PropertyManager):
         """
         if not name:
             raise TypeError('BotState.create_property(): BotState cannot be None or empty.')
+        if name not in self._property_names:
+            self._property_names.append(name)
         return BotStatePropertyAccessor(self, name)
 
+    def get_property_storage_key(self, turn_context: TurnContext, property_name: str) -> str:
+        """
+        Returns the storage key of a property when each property is stored as its own item.
+        :param turn_context:
+        :param property_name:
+        :return:
+        """
+        return '%s/properties/%s' % (self.get_storage_key(turn_context), property_name)
+
     def get(self, turn_context: TurnContext) -> Dict[str, object]:
         cached = turn_context.turn_state.get(self._context_service_key)
-
-        return getattr(cached, 'state', None)
+        if cached is None:
+            return None
+        # The dict can be changed in place by the caller.
+        cached.track_state()
+        return cached.state
 
 
     async def load(self, turn_context: TurnContext, force: bool = False) -> None:
@@ -77,14 +273,12 @@ class BotState(PropertyManager):
         """
         if turn_context == None:
             raise TypeError('BotState.load(): turn_context cannot be None.')
-        
-        cached_state = turn_context.turn_state.get(self._context_service_key)
-        storage_key = self.get_storage_key(turn_context)
-        
-        if (force or not cached_state or not cached_state.state) :
-            items = await self._storage.read([storage_key])
-            val = items.get(storage_key)
-            turn_context.turn_state[self._context_service_key] = CachedBotState(val)
+
+        if self._load_required(turn_context, force):
+            storage_keys = self._get_load_keys(turn_context, force)
+            with _phase_timer(turn_context, TurnPhases.state_load):
+                items = await self._storage.read(storage_keys)
+            self._set_loaded_items(turn_context, storage_keys, items, force)
 
     async def save_changes(self, turn_context: TurnContext, force: bool = False) -> None:
         """
@@ -94,15 +288,84 @@ class BotState(PropertyManager):
         """
         if turn_context == None:
             raise TypeError('BotState.save_changes(): turn_context cannot be None.')
-        
+
+        cached_state = self._get_changed_state(turn_context, force)
+        if cached_state is not None:
+            (changes, deleted_keys) = self._get_changes(turn_context, cached_state, force)
+            with _phase_timer(turn_context, TurnPhases.state_save):
+                if changes:
+                    await self._storage.write(changes)
+                if deleted_keys:
+                    await self._storage.delete(deleted_keys)
+            cached_state.mark_saved()
+
+    def _load_required(self, turn_context: TurnContext, force: bool) -> bool:
+        # State that was cleared during the turn is cached too, and must not be read back from storage.
         cached_state = turn_context.turn_state.get(self._context_service_key)
-        
-        if force or (cached_state != None and cached_state.is_changed == True):
-            storage_key = self.get_storage_key(turn_context)
-            changes : Dict[str, object] = { storage_key: cached_state.state }
-            await self._storage.write(changes)
-            cached_state.hash = cached_state.compute_hash(cached_state.state)
-            
+        if force or cached_state is None:
+            return True
+        return cached_state.loaded_properties is not None and \
+            any(name not in cached_state.loaded_properties for name in self._property_names)
+
+    def _get_storage_keys(self, turn_context: TurnContext) -> List[str]:
+        # The keys holding the state of this scope.
+        if self.per_property:
+            return [self.get_property_storage_key(turn_context, name) for name in self._property_names]
+        return [self.get_storage_key(turn_context)]
+
+    def _get_load_keys(self, turn_context: TurnContext, force: bool) -> List[str]:
+        # The keys to read: all of them, or those of the properties created since the state was loaded.
+        cached_state = turn_context.turn_state.get(self._context_service_key)
+        if not self.per_property or force or cached_state is None:
+            return self._get_storage_keys(turn_context)
+        return [self.get_property_storage_key(turn_context, name) for name in self._property_names
+                if name not in cached_state.loaded_properties]
+
+    def _set_loaded_items(self, turn_context: TurnContext, storage_keys: List[str], items: Dict[str, object],
+                          force: bool) -> None:
+        # Caches the items read from the keys returned by `_get_load_keys()`.
+        if not self.per_property:
+            state = items.get(self.get_storage_key(turn_context))
+            turn_context.turn_state[self._context_service_key] = CachedBotState(
+                state, track_in_place=self.track_in_place_changes)
+            return
+        prefix = self.get_property_storage_key(turn_context, '')
+        names = [key[len(prefix):] for key in storage_keys]
+        values = {name: items[key]['value'] for (name, key) in zip(names, storage_keys) if items.get(key) is not None}
+        cached_state = turn_context.turn_state.get(self._context_service_key)
+        if force or cached_state is None:
+            turn_context.turn_state[self._context_service_key] = CachedBotState(
+                values, set(names), self.track_in_place_changes)
+        else:
+            cached_state.add_loaded_properties(names, values)
+
+    def _get_changes(self, turn_context: TurnContext, cached_state: CachedBotState,
+                     force: bool) -> Tuple[Dict[str, object], List[str]]:
+        # Returns the items to write and the keys to delete to save the cached state.
+        if not self.per_property:
+            return {self.get_storage_key(turn_context): cached_state.state}, []
+        state = cached_state.state
+        unregistered = [name for name in state if name not in self._property_names]
+        if unregistered:
+            # They would be written, but never read back.
+            raise ValueError('BotState.save_changes(): properties %s were not created with create_property(), '
+                             'which per_property state requires.' % unregistered)
+        names = None if force else cached_state.changed_properties()
+        if names is None:
+            names = set(self._property_names)
+        changes = {self.get_property_storage_key(turn_context, name): {'value': state[name]}
+                   for name in sorted(names) if name in state}
+        deleted_keys = [self.get_property_storage_key(turn_context, name) for name in sorted(names)
+                        if name not in state]
+        return changes, deleted_keys
+
+    def _get_changed_state(self, turn_context: TurnContext, force: bool) -> CachedBotState:
+        # Returns the cached state if it needs to be written to storage, otherwise None.
+        cached_state = turn_context.turn_state.get(self._context_service_key)
+        if cached_state is not None and (force or cached_state.is_changed):
+            return cached_state
+        return None
+
     async def clear_state(self, turn_context: TurnContext):
         """
         Clears any state currently stored in this state scope.
@@ -114,9 +377,9 @@ class BotState(PropertyManager):
         if turn_context == None:
             raise TypeError('BotState.clear_state(): turn_context cannot be None.')
         
-        #  Explicitly setting the hash will mean IsChanged is always true. And that will force a Save.
-        cache_value = CachedBotState()
-        cache_value.hash = ''
+        #  Marking the empty state dirty means is_changed is always true. And that will force a Save.
+        cache_value = CachedBotState(track_in_place=self.track_in_place_changes)
+        cache_value.mark_dirty()
         turn_context.turn_state[self._context_service_key] = cache_value
 
     async def delete(self, turn_context: TurnContext) -> None:
@@ -130,9 +393,8 @@ class BotState(PropertyManager):
             raise TypeError('BotState.delete(): turn_context cannot be None.')
         
         turn_context.turn_state.pop(self._context_service_key)
-            
-        storage_key = self.get_storage_key(turn_context)
-        await self._storage.delete({ storage_key })
+
+        await self._storage.delete(self._get_storage_keys(turn_context))
         
     @abstractmethod
     async def get_storage_key(self, turn_context: TurnContext) -> str:
@@ -147,7 +409,7 @@ class BotState(PropertyManager):
         
         # if there is no value, this will throw, to signal to IPropertyAccesor that a default value should be computed
         # This allows this to work with value types
-        return cached_state.state[property_name]
+        return cached_state.get_property(property_name)
 
     async def delete_property_value(self, turn_context: TurnContext, property_name: str) -> None:
         """
@@ -163,7 +425,7 @@ class BotState(PropertyManager):
         if not property_name:
             raise TypeError('BotState.delete_property(): property_name cannot be None.')
         cached_state = turn_context.turn_state.get(self._context_service_key)
-        del cached_state.state[property_name]
+        cached_state.delete_property(property_name)
 
     async def set_property_value(self, turn_context: TurnContext, property_name: str, value: object) -> None:
         """
@@ -179,7 +441,7 @@ class BotState(PropertyManager):
         if not property_name:
             raise TypeError('BotState.delete_property(): property_name cannot be None.')
         cached_state = turn_context.turn_state.get(self._context_service_key)
-        cached_state.state[property_name] = value
+        cached_state.set_property(property_name, value)
         
 ##
 class BotStatePropertyAccessor(StatePropertyAccessor):
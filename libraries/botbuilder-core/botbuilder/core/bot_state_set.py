@@ -0,0 +1,116 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import itertools
+from collections import OrderedDict
+from typing import Dict, List
+
+from .bot_state import BotState, _phase_timer
+from .storage import Storage
+from .turn_context import TurnContext
+from .turn_timing import TurnPhases
+
+
+class BotStateSet(object):
+    """
+    Loads and saves several `BotState` scopes together, e.g. conversation and user state. The keys of every
+    scope kept in the same `Storage` are read with a single `Storage.read()` and their changes written with a
+    single `Storage.write()`, instead of one round-trip per scope. Scopes kept in different storages are read
+    and written concurrently.
+
+    Usage Example:
+    bot_state_set = BotStateSet(conversation_state, user_state)
+    await bot_state_set.load_all(turn_context)
+    ...
+    await bot_state_set.save_all_changes(turn_context)
+    """
+    def __init__(self, *bot_states: BotState):
+        """
+        Creates a new BotStateSet instance.
+        :param bot_states:
+        """
+        self._bot_states: List[BotState] = []
+        self.add(*bot_states)
+
+    @property
+    def bot_states(self) -> List[BotState]:
+        return self._bot_states
+
+    def add(self, *bot_states: BotState) -> 'BotStateSet':
+        """
+        Adds state scopes to the set.
+        :param bot_states:
+        :return:
+        """
+        for (idx, bot_state) in enumerate(bot_states):
+            if not isinstance(bot_state, BotState):
+                raise TypeError('BotStateSet.add(): invalid BotState at index "%s" being added.' % idx)
+        self._bot_states.extend(bot_states)
+        return self
+
+    async def load_all(self, turn_context: TurnContext, force: bool = False) -> None:
+        """
+        Reads in the state of every scope not cached in the context object yet, with one read per storage.
+        :param turn_context: The context object for this turn.
+        :param force: Optional. True to bypass the cache.
+        :return:
+        """
+        if turn_context is None:
+            raise TypeError('BotStateSet.load_all(): turn_context cannot be None.')
+
+        by_storage = self._group_by_storage(
+            bot_state for bot_state in self._bot_states if bot_state._load_required(turn_context, force))
+
+        async def read(storage: Storage, keys: Dict[BotState, List[str]]):
+            items = await storage.read(list(OrderedDict.fromkeys(itertools.chain(*keys.values()))))
+            for bot_state in keys:
+                bot_state._set_loaded_items(turn_context, keys[bot_state], items, force)
+
+        if by_storage:
+            with _phase_timer(turn_context, TurnPhases.state_load):
+                await asyncio.gather(
+                    *[read(storage, self._load_keys(turn_context, states, force)) for (storage, states) in by_storage])
+
+    async def save_all_changes(self, turn_context: TurnContext, force: bool = False) -> None:
+        """
+        Writes to storage the state of every scope that has changed, with one write per storage.
+        :param turn_context: The context object for this turn.
+        :param force: Optional. True to save the state of every scope whether or not there are changes.
+        :return:
+        """
+        if turn_context is None:
+            raise TypeError('BotStateSet.save_all_changes(): turn_context cannot be None.')
+
+        changed = {bot_state: bot_state._get_changed_state(turn_context, force) for bot_state in self._bot_states}
+        by_storage = self._group_by_storage(bot_state for (bot_state, cached) in changed.items() if cached is not None)
+
+        async def write(storage: Storage, bot_states: List[BotState]):
+            changes = {}
+            deleted_keys = []
+            for bot_state in bot_states:
+                (state_changes, state_deleted_keys) = bot_state._get_changes(turn_context, changed[bot_state], force)
+                changes.update(state_changes)
+                deleted_keys.extend(state_deleted_keys)
+            if changes:
+                await storage.write(changes)
+            if deleted_keys:
+                await storage.delete(deleted_keys)
+            for bot_state in bot_states:
+                changed[bot_state].mark_saved()
+
+        if by_storage:
+            with _phase_timer(turn_context, TurnPhases.state_save):
+                await asyncio.gather(*[write(storage, states) for (storage, states) in by_storage])
+
+    @staticmethod
+    def _group_by_storage(bot_states) -> list:
+        # Storages aren't necessarily hashable, so they're grouped by identity, in the order the scopes were added.
+        groups = {}
+        for bot_state in bot_states:
+            groups.setdefault(id(bot_state._storage), (bot_state._storage, []))[1].append(bot_state)
+        return list(groups.values())
+
+    @staticmethod
+    def _load_keys(turn_context: TurnContext, bot_states: List[BotState], force: bool) -> Dict[BotState, List[str]]:
+        return {bot_state: bot_state._get_load_keys(turn_context, force) for bot_state in bot_states}
@@ -0,0 +1,304 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import base64
+import logging
+import lzma
+import math
+import pickle
+import time
+import zlib
+from typing import Callable, Dict, List
+
+from .storage import Storage, StoreItem
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# The key under which a compressed item is stored, and the header starting its payload.
+COMPRESSED_KEY = 'compressedItem'
+_MAGIC = b'BBZ'
+_VERSION = 1
+
+
+def _zstd_compress(data: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+# Codec name: (id written in the header, default level, compress(data, level), decompress(data)).
+_CODECS = {
+    'zlib': (1, 6, zlib.compress, zlib.decompress),
+    'lzma': (2, 6, lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+    'zstd': (3, 3, _zstd_compress, _zstd_decompress),
+}
+_CODECS_BY_ID = {codec[0]: name for (name, codec) in _CODECS.items()}
+_SERIALIZER_JSON = 1
+_SERIALIZER_PICKLE = 2
+_SERIALIZER_BINARY = 3
+_SERIALIZERS = (_SERIALIZER_JSON, _SERIALIZER_PICKLE, _SERIALIZER_BINARY)
+
+_LOGGER = logging.getLogger(__name__)
+_JSON_SCALAR_TYPES = frozenset((str, int, bool, type(None)))
+
+
+def _is_json_exact(value) -> bool:
+    # Whether parsing the JSON of a value restores it with the same types, rather than e.g. a list for a tuple or
+    # str keys for int keys.
+    value_type = type(value)
+    if value_type in _JSON_SCALAR_TYPES:
+        return True
+    if value_type is float:
+        # orjson writes NaN and infinity as null.
+        return math.isfinite(value)
+    if value_type is list:
+        return all(map(_is_json_exact, value))
+    if value_type is dict:
+        return all(type(key) is str for key in value) and all(map(_is_json_exact, value.values()))
+    return False
+
+
+class CompressionRecord(object):
+    """
+    The outcome of writing or reading one item through a `CompressedStorage`.
+    """
+    def __init__(self, key: str, operation: str, codec: str, original_size: int, stored_size: int,
+                 seconds: float):
+        self.key = key
+        # 'compress' or 'decompress'.
+        self.operation = operation
+        self.codec = codec
+        self.original_size = original_size
+        self.stored_size = stored_size
+        # The seconds spent serializing and compressing, or decompressing and parsing, the item.
+        self.seconds = seconds
+
+    @property
+    def ratio(self) -> float:
+        """
+        The size of the stored item relative to the serialized item, e.g. 0.25 for a 4x smaller item.
+        :return:
+        """
+        return self.stored_size / self.original_size if self.original_size else 1.0
+
+
+class CompressionStats(object):
+    """
+    Totals of the items written and read through a `CompressedStorage`.
+    """
+    def __init__(self):
+        self.items_compressed = 0
+        self.items_uncompressed = 0
+        self.items_decompressed = 0
+        self.original_bytes = 0
+        self.stored_bytes = 0
+        self.compress_seconds = 0.0
+        self.decompress_seconds = 0.0
+
+    @property
+    def ratio(self) -> float:
+        """
+        The size of the compressed items relative to their serialized size.
+        :return:
+        """
+        return self.stored_bytes / self.original_bytes if self.original_bytes else 1.0
+
+    @property
+    def compress_seconds_per_item(self) -> float:
+        return self.compress_seconds / self.items_compressed if self.items_compressed else 0.0
+
+    @property
+    def decompress_seconds_per_item(self) -> float:
+        return self.decompress_seconds / self.items_decompressed if self.items_decompressed else 0.0
+
+
+class CompressedStorage(Storage):
+    """
+    Compresses the large items written to another `Storage`. An item, a dict or a `StoreItem`, is serialized to
+    JSON and, if that takes at least `threshold` bytes and compresses well, stored as a single `compressedItem`
+    field holding the compressed JSON as base85 text. Items holding schema models or datetimes are serialized
+    with the schema's `BinaryCodec` instead. Only items read back unchanged are compressed: items of derived
+    classes, or holding values that neither serializer restores with the same types, such as tuples or objects,
+    are stored as is, as are smaller items. The eTag stays outside the compressed payload, so that the wrapped
+    storage still checks it.
+
+    With `allow_pickle`, items holding objects, such as a dialog stack with prompt options, are compressed with
+    pickle. Reading them runs whatever code the stored bytes ask for, so only allow it for storage no one but the
+    bot can write to; otherwise reading an item compressed with pickle raises a ValueError.
+
+    The payload starts with a header naming the codec, so items are read back whatever the codec configured
+    when they were written, and items stored before the wrapper was added are read unchanged.
+
+    Usage Example:
+    storage = CompressedStorage(CosmosDbStorage(config), threshold=16384, codec='zstd')
+    conversation_state = ConversationState(storage)
+    """
+    def __init__(self, storage: Storage, threshold: int = 4096, codec: str = 'zlib', level: int = None,
+                 min_saving: float = 0.1, on_item: Callable[[CompressionRecord], None] = None,
+                 allow_pickle: bool = False):
+        """
+        Creates a new CompressedStorage instance.
+        :param storage: the storage written to.
+        :param threshold: the serialized size in bytes from which items are compressed.
+        :param codec: 'zlib', 'lzma', or 'zstd' when the "zstandard" package is installed.
+        :param level: Optional. The compression level, defaults to the codec's default.
+        :param min_saving: the fraction of the size compression must save for an item to be stored compressed.
+        :param on_item: Optional. Called with a `CompressionRecord` for each item written or read compressed.
+        :param allow_pickle: if True, items that aren't JSON or schema models are compressed with pickle, and
+        items compressed with pickle are read.
+        """
+        if codec not in _CODECS:
+            raise ValueError('CompressedStorage(): unknown codec "%s", expected one of %s.'
+                             % (codec, tuple(_CODECS)))
+        if codec == 'zstd' and zstandard is None:
+            raise ImportError('CompressedStorage(): the "zstd" codec requires the "zstandard" package to be '
+                              'installed.')
+        # Imported here rather than at the top, as they import the schema models.
+        from botbuilder.schema.binary_codec import BinaryCodec
+        from botbuilder.schema.json_codec import DEFAULT_CODEC
+
+        super(CompressedStorage, self).__init__()
+        self.storage = storage
+        self.threshold = threshold
+        self.codec = codec
+        self.level = level if level is not None else _CODECS[codec][1]
+        self.min_saving = min_saving
+        self.on_item = on_item
+        self.allow_pickle = allow_pickle
+        self.stats = CompressionStats()
+        self._json = DEFAULT_CODEC
+        self._binary = BinaryCodec()
+
+    @property
+    def supports_create_only(self) -> bool:
+        return getattr(self.storage, 'supports_create_only', False)
+
+    async def read(self, keys: List[str]):
+        items = await self.storage.read(keys)
+        return {key: self._decompress_item(key, item) for (key, item) in items.items()}
+
+    async def write(self, changes: Dict[str, StoreItem]):
+        await self.storage.write({key: self._compress_item(key, change) for (key, change) in changes.items()})
+
+    async def delete(self, keys: List[str]):
+        await self.storage.delete(keys)
+
+    def _compress_item(self, key: str, item):
+        # Items are read back as a dict or a `StoreItem`, so those of derived classes are stored as is.
+        if type(item) is StoreItem:
+            e_tag = item.e_tag
+            values = {attr: value for (attr, value) in vars(item).items() if attr != 'e_tag'}
+        elif type(item) is dict and COMPRESSED_KEY not in item:
+            e_tag = item.get('eTag')
+            values = {attr: value for (attr, value) in item.items() if attr != 'eTag'}
+        else:
+            return item
+
+        start = time.perf_counter()
+        serialized = self._serialize(key, values)
+        if serialized is None:
+            self.stats.items_uncompressed += 1
+            return item
+        (serializer_id, data) = serialized
+        if len(data) < self.threshold:
+            self.stats.items_uncompressed += 1
+            return item
+
+        (codec_id, _, compress, _) = _CODECS[self.codec]
+        payload = _MAGIC + bytes([_VERSION, codec_id, serializer_id]) + compress(data, self.level)
+        text = base64.b85encode(payload).decode('ascii')
+        seconds = time.perf_counter() - start
+        if len(text) > len(data) * (1 - self.min_saving):
+            self.stats.items_uncompressed += 1
+            return item
+
+        self.stats.items_compressed += 1
+        self.stats.original_bytes += len(data)
+        self.stats.stored_bytes += len(text)
+        self.stats.compress_seconds += seconds
+        if self.on_item is not None:
+            self.on_item(CompressionRecord(key, 'compress', self.codec, len(data), len(text), seconds))
+
+        if isinstance(item, StoreItem):
+            return StoreItem(e_tag=e_tag, **{COMPRESSED_KEY: text})
+        compressed = {COMPRESSED_KEY: text}
+        if 'eTag' in item:
+            compressed['eTag'] = e_tag
+        return compressed
+
+    def _serialize(self, key: str, values: dict):
+        # Returns the id of the serializer used and the serialized values, or None if no serializer can encode them.
+        if _is_json_exact(values):
+            return _SERIALIZER_JSON, self._json.dumps(values, strict=True)
+        if self._binary.is_exact(values):
+            try:
+                return _SERIALIZER_BINARY, self._binary.dumps(values)
+            except OverflowError:
+                # An integer larger than 64 bits.
+                pass
+        if not self.allow_pickle:
+            _LOGGER.debug('CompressedStorage: item "%s" holds values that would not be read back '
+                          'unchanged, stored as is.', key)
+            return None
+        try:
+            data = pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as error:
+            _LOGGER.warning('CompressedStorage: item "%s" can be serialized neither to JSON nor with pickle (%s), '
+                            'stored as is.', key, error)
+            return None
+        _LOGGER.debug('CompressedStorage: item "%s" is not JSON, serialized with pickle.', key)
+        return _SERIALIZER_PICKLE, data
+
+    def _decompress_item(self, key: str, item):
+        if isinstance(item, StoreItem):
+            text = getattr(item, COMPRESSED_KEY, None)
+        elif isinstance(item, dict):
+            text = item.get(COMPRESSED_KEY)
+        else:
+            return item
+        if not isinstance(text, str):
+            return item
+
+        start = time.perf_counter()
+        try:
+            payload = base64.b85decode(text)
+        except ValueError:
+            payload = b''
+        if payload[:len(_MAGIC)] != _MAGIC:
+            # Not written by a CompressedStorage.
+            return item
+        (version, codec_id, serializer_id) = payload[len(_MAGIC):len(_MAGIC) + 3]
+        codec = _CODECS_BY_ID.get(codec_id)
+        if version != _VERSION or codec is None or serializer_id not in _SERIALIZERS:
+            raise ValueError('CompressedStorage.read(): item "%s" was written with an unsupported version %s, '
+                             'codec %s or serializer %s.' % (key, version, codec_id, serializer_id))
+        if serializer_id == _SERIALIZER_PICKLE and not self.allow_pickle:
+            raise ValueError('CompressedStorage.read(): item "%s" is serialized with pickle, which is only read '
+                             'with allow_pickle=True.' % key)
+        if codec == 'zstd' and zstandard is None:
+            raise ImportError('CompressedStorage.read(): item "%s" is compressed with zstd, which requires the '
+                              '"zstandard" package to be installed.' % key)
+        data = _CODECS[codec][3](payload[len(_MAGIC) + 3:])
+        if serializer_id == _SERIALIZER_JSON:
+            values = self._json.loads(data)
+        elif serializer_id == _SERIALIZER_BINARY:
+            values = self._binary.loads(data)
+        else:
+            values = pickle.loads(data)
+        seconds = time.perf_counter() - start
+
+        self.stats.items_decompressed += 1
+        self.stats.decompress_seconds += seconds
+        if self.on_item is not None:
+            self.on_item(CompressionRecord(key, 'decompress', codec, len(data), len(text), seconds))
+
+        if isinstance(item, StoreItem):
+            return StoreItem(e_tag=item.e_tag, **values)
+        if 'eTag' in item:
+            values['eTag'] = item['eTag']
+        return values
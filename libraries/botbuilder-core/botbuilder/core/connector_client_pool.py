@@ -0,0 +1,113 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from typing import Callable
+
+
+class ConnectorClientPool(object):
+    """
+    A bounded cache of connector clients keyed by service url and credentials. Reusing a client keeps its
+    serializers and its keep-alive HTTP session warm between turns instead of reconnecting on every call.
+    Clients that have not been used for `idle_timeout` seconds, or that fall off the end of the LRU list
+    once `max_size` is exceeded, are evicted. A turn may still be using an evicted client, so eviction doesn't
+    close it: it is released once nothing refers to it anymore. Await `close()` on shutdown to close the pooled
+    clients and the evicted ones still in use. Async clients, such as the aio `ConnectorClient`, are closed by
+    leaving their async context, which closes their HTTP session.
+    """
+    def __init__(self, max_size: int = 100, idle_timeout: float = 300.0):
+        """
+        Creates a new ConnectorClientPool instance.
+        :param max_size: maximum number of clients kept alive at once.
+        :param idle_timeout: number of seconds a client may stay unused before it is evicted.
+        """
+        if max_size < 1:
+            raise ValueError('ConnectorClientPool(): max_size must be greater than 0.')
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clients = OrderedDict()
+        self._evicted = weakref.WeakSet()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, service_url: str, credentials, factory: Callable[[], object]):
+        """
+        Returns the pooled client for a service url and set of credentials, calling `factory()` to build
+        one on a miss.
+        :param service_url:
+        :param credentials:
+        :param factory:
+        :return:
+        """
+        now = time.monotonic()
+        self._evict_idle(now)
+
+        # The pooled client holds a reference to its credentials, so their id() is stable while pooled.
+        key = (service_url, id(credentials))
+        entry = self._clients.get(key)
+        if entry is not None:
+            self.hits += 1
+            entry[1] = now
+            self._clients.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        client = factory()
+        self._clients[key] = [client, now]
+        while len(self._clients) > self.max_size:
+            self._evict(next(iter(self._clients)))
+        return client
+
+    def clear(self) -> None:
+        """
+        Evicts every pooled client. The clients aren't closed, see `close()`.
+        :return:
+        """
+        for key in list(self._clients):
+            self._evict(key)
+
+    async def close(self) -> None:
+        """
+        Evicts every pooled client, and closes them along with the clients evicted earlier that are still in use.
+        Call on shutdown, once no turn is running.
+        :return:
+        """
+        clients = {id(client): client for (client, _) in self._clients.values()}
+        self.clear()
+        clients.update((id(client), client) for client in list(self._evicted))
+        self._evicted.clear()
+        closing = [closed for closed in map(self._close_client, clients.values()) if asyncio.iscoroutine(closed)]
+        # A client that fails to close is dropped all the same.
+        await asyncio.gather(*closing, return_exceptions=True)
+
+    def _evict_idle(self, now: float) -> None:
+        # Entries are kept in least-recently-used order, so idle clients are always at the front.
+        while self._clients:
+            key, (_, last_used) = next(iter(self._clients.items()))
+            if now - last_used <= self.idle_timeout:
+                break
+            self._evict(key)
+
+    def _evict(self, key) -> None:
+        client, _ = self._clients.pop(key)
+        self.evictions += 1
+        try:
+            self._evicted.add(client)
+        except TypeError:
+            # Clients that can't be referenced weakly are left to the garbage collector.
+            pass
+
+    @staticmethod
+    def _close_client(client):
+        # Returns the coroutine closing an async client.
+        if hasattr(client, '__aexit__'):
+            return client.__aexit__(None, None, None)
+        close = getattr(client, 'close', None)
+        return close() if callable(close) else None
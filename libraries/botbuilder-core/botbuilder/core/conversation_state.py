@@ -13,13 +13,17 @@ class ConversationState(BotState):
 
     no_key_error_message = 'ConversationState: channelId and/or conversation missing from context.activity.'
 
-    def __init__(self, storage: Storage):
+    def __init__(self, storage: Storage, per_property: bool = False, track_in_place_changes: bool = True):
         """Creates a new ConversationState instance.
         Parameters
         ----------
         storage : Storage
             Where to store 
         namespace: str
+        per_property: bool
+            True to store each property as its own storage item, see `BotState`.
+        track_in_place_changes: bool
+            False to save only properties that are set or deleted, see `BotState`.
         """
         def call_get_storage_key(context):
             key = self.get_storage_key(context)
@@ -28,7 +32,8 @@ class ConversationState(BotState):
             else:
                 return key
 
-        super(ConversationState, self).__init__(storage, 'ConversationState')
+        super(ConversationState, self).__init__(storage, 'ConversationState', per_property,
+                                                track_in_place_changes)
 
 
     def get_storage_key(self, context: TurnContext):
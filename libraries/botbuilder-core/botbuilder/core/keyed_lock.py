@@ -0,0 +1,73 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+
+
+class KeyedLock(object):
+    """
+    A table of asyncio locks keyed by string. Holders of the same key run one after another in FIFO order
+    while different keys run in parallel. An entry only exists while its lock is held or awaited, so the
+    table does not grow with the number of keys ever seen.
+
+    Usage Example:
+    async with locks.lock(conversation_id):
+        await run_turn()
+    """
+    def __init__(self):
+        self._locks = {}
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def lock(self, key: str) -> '_KeyedLockContext':
+        """
+        Returns an async context manager that holds the lock for `key`.
+        :param key:
+        :return:
+        """
+        return _KeyedLockContext(self, key)
+
+    async def acquire(self, key: str) -> None:
+        """
+        Waits until the lock for `key` is free and takes it.
+        :param key:
+        :return:
+        """
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            await entry[0].acquire()
+        except BaseException:
+            self._remove_reference(key, entry)
+            raise
+
+    def release(self, key: str) -> None:
+        """
+        Releases the lock for `key`, dropping the entry once nobody else is waiting for it.
+        :param key:
+        :return:
+        """
+        entry = self._locks[key]
+        entry[0].release()
+        self._remove_reference(key, entry)
+
+    def _remove_reference(self, key: str, entry: list) -> None:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._locks[key]
+
+
+class _KeyedLockContext(object):
+    def __init__(self, locks: KeyedLock, key: str):
+        self._locks = locks
+        self._key = key
+
+    async def __aenter__(self):
+        await self._locks.acquire(self._key)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self._locks.release(self._key)
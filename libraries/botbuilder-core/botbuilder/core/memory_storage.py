@@ -3,10 +3,12 @@
 
 from typing import Dict, List
 from copy import deepcopy
-from .storage import Storage, StoreItem
+from .storage import CREATE_ONLY_E_TAG, Storage, StoreItem
 
 
 class MemoryStorage(Storage):
+    supports_create_only = True
+
     def __init__(self, dictionary=None):
         super(MemoryStorage, self).__init__()
         self.memory = dictionary if dictionary is not None else {}
@@ -54,7 +56,12 @@ class MemoryStorage(Storage):
                 
                 # Set ETag if applicable
                 if isinstance(new_value, StoreItem):
-                    if old_state_etag is not None and new_value.e_tag != "*" and new_value.e_tag < old_state_etag:
+                    if new_value.e_tag == CREATE_ONLY_E_TAG:
+                        # Only written if the key doesn't exist yet.
+                        conflict = old_state is not None
+                    else:
+                        conflict = old_state_etag is not None and new_value.e_tag != "*" and new_value.e_tag < old_state_etag
+                    if conflict:
                         raise KeyError("Etag conflict.\nOriginal: %s\r\nCurrent: %s" % \
                                         (new_value.e_tag, old_state_etag) )
                     new_state.e_tag = str(self._e_tag)
@@ -31,19 +31,21 @@ class MiddlewareSet(Middleware):
     def __init__(self):
         super(MiddlewareSet, self).__init__()
         self._middleware = []
+        self._chain = ()
 
     def use(self, *middleware: Middleware):
         """
-        Registers middleware plugin(s) with the bot or set.
+        Registers middleware plugin(s) with the bot or set, in the order given. If any of them is invalid, a
+        TypeError is raised and none of them is registered.
         :param middleware :
         :return:
         """
         for (idx, m) in enumerate(middleware):
-            if hasattr(m, 'on_process_request') and callable(m.on_process_request):
-                self._middleware.append(m)
-                return self
-            else:
+            if not hasattr(m, 'on_process_request') or not callable(m.on_process_request):
                 raise TypeError('MiddlewareSet.use(): invalid middleware at index "%s" being added.' % idx)
+        self._middleware.extend(middleware)
+        self._chain = tuple(m.on_process_request for m in self._middleware)
+        return self
 
     async def receive_activity(self, context: TurnContext):
         await self.receive_activity_internal(context, None)
@@ -56,18 +58,33 @@ class MiddlewareSet(Middleware):
         return await self.receive_activity_internal(context, callback)
 
     async def receive_activity_internal(self, context, callback, next_middleware_index=0):
-        if next_middleware_index == len(self._middleware):
-            if callback:
-                return await callback(context)
-            else:
-                return None
-        next_middleware = self._middleware[next_middleware_index]
-
-        async def call_next_middleware():
-            return await self.receive_activity_internal(context, callback, next_middleware_index+1)
-
-        try:
-            return await next_middleware.on_process_request(context,
-                                                            call_next_middleware)
-        except Exception as e:
-            raise e
\ No newline at end of file
+        return await _NextMiddleware(self._chain, context, callback, next_middleware_index)()
+
+
+async def _end_of_chain():
+    return None
+
+
+class _NextMiddleware(object):
+    """
+    The `next` continuation handed to a middleware. The chain of `on_process_request` handlers is compiled
+    once in `MiddlewareSet.use()`, so running a turn only allocates one of these small objects per
+    middleware, and calling it returns the next handler's awaitable directly rather than wrapping it in
+    another coroutine.
+    """
+    __slots__ = ('_chain', '_context', '_callback', '_index')
+
+    def __init__(self, chain: tuple, context: TurnContext, callback, index: int):
+        self._chain = chain
+        self._context = context
+        self._callback = callback
+        self._index = index
+
+    def __call__(self):
+        chain = self._chain
+        index = self._index
+        if index == len(chain):
+            if self._callback:
+                return self._callback(self._context)
+            return _end_of_chain()
+        return chain[index](self._context, _NextMiddleware(chain, self._context, self._callback, index + 1))
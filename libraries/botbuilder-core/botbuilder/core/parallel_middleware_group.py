@@ -0,0 +1,91 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+from typing import List
+
+from .middleware_set import Middleware
+from .turn_context import TurnContext
+
+
+class ParallelMiddlewareError(Exception):
+    """
+    Raised when more than one member of a `ParallelMiddlewareGroup` fails. `errors` holds every exception
+    raised, in the order the members were registered.
+    """
+    def __init__(self, errors: List[Exception]):
+        super(ParallelMiddlewareError, self).__init__('%s middleware failed: %s' % (
+            len(errors), '; '.join(repr(error) for error in errors)))
+        self.errors = errors
+
+
+class ParallelMiddlewareGroup(Middleware):
+    """
+    Runs a group of independent middleware concurrently. The part of each member before it calls `next()` runs
+    concurrently with the other members; once every member has called `next()` the rest of the pipeline runs
+    once, and then the part of each member after `next()` runs concurrently. If a member returns without calling
+    `next()` the rest of the pipeline is skipped and `next()` returns None to the other members.
+
+    A single failure is re-raised as is, several are raised together as a `ParallelMiddlewareError`.
+
+    Usage Example:
+    adapter.use(ParallelMiddlewareGroup(TranslationMiddleware(), SentimentMiddleware(), TranscriptLoggerMiddleware()))
+    """
+    def __init__(self, *middleware: Middleware):
+        for (idx, m) in enumerate(middleware):
+            if not hasattr(m, 'on_process_request') or not callable(m.on_process_request):
+                raise TypeError('ParallelMiddlewareGroup(): invalid middleware at index "%s" being added.' % idx)
+        self._middleware = list(middleware)
+
+    async def on_process_request(self, context: TurnContext, logic):
+        if not self._middleware:
+            return await logic()
+
+        loop = asyncio.get_event_loop()
+        called_next = [loop.create_future() for _ in self._middleware]
+        downstream = loop.create_future()
+
+        def create_next(index: int):
+            async def call_next():
+                if not called_next[index].done():
+                    called_next[index].set_result(True)
+                # Shielded so that a member cancelling its own wait doesn't cancel it for the others.
+                return await asyncio.shield(downstream)
+            return call_next
+
+        async def run_member(index: int, middleware: Middleware):
+            try:
+                return await middleware.on_process_request(context, create_next(index))
+            finally:
+                if not called_next[index].done():
+                    called_next[index].set_result(False)
+
+        members = [asyncio.ensure_future(run_member(index, m)) for (index, m) in enumerate(self._middleware)]
+        try:
+            await asyncio.wait(called_next)
+            if all(future.result() for future in called_next):
+                try:
+                    downstream.set_result(await logic())
+                except Exception as error:
+                    downstream.set_exception(error)
+            else:
+                downstream.set_result(None)
+            results = await asyncio.gather(*members, return_exceptions=True)
+        finally:
+            for member in members:
+                member.cancel()
+            if not downstream.done():
+                downstream.cancel()
+
+        errors = []
+        for result in results:
+            if isinstance(result, BaseException) and not any(result is error for error in errors):
+                errors.append(result)
+        if not errors and downstream.exception() is not None:
+            # Every member handled the failure of the rest of the pipeline.
+            return None
+        if len(errors) == 1:
+            raise errors[0]
+        if errors:
+            raise ParallelMiddlewareError(errors)
+        return downstream.result()
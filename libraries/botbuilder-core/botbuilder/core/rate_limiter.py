@@ -0,0 +1,182 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+class TokenBucket(object):
+    """
+    A token bucket that allows `rate` operations per second with bursts of up to `capacity` operations.
+    Callers reserve a token up front and sleep until it becomes available, so waiters are served in the
+    order they called `acquire()`.
+    """
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Creates a new TokenBucket instance.
+        :param rate: number of tokens added to the bucket per second.
+        :param capacity: maximum number of tokens the bucket can hold.
+        """
+        if rate <= 0:
+            raise ValueError('TokenBucket(): rate must be greater than 0.')
+        if capacity < 1:
+            raise ValueError('TokenBucket(): capacity must be at least 1.')
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Takes a token from the bucket and returns the number of seconds to wait before using it.
+        :return:
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    async def acquire(self) -> None:
+        """
+        Waits until a token is available.
+        :return:
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class RateLimiter(object):
+    """
+    Throttles outgoing connector calls with token buckets keyed by service url and by conversation id.
+    Sends over the limit are queued until a token is available instead of failing, and when a channel
+    answers with a 429 its `Retry-After` interval pauses the conversation before the call is retried.
+    """
+    def __init__(self, conversation_rate: float = 1.0, conversation_capacity: float = 5.0,
+                 service_rate: float = None, service_capacity: float = 50.0,
+                 max_retries: int = 3, default_retry_after: float = 1.0, max_conversations: int = 10000):
+        """
+        Creates a new RateLimiter instance.
+        :param conversation_rate: number of sends per second allowed to a single conversation.
+        :param conversation_capacity: number of sends a single conversation can burst.
+        :param service_rate: Optional. Number of sends per second allowed to a single service url.
+        :param service_capacity: number of sends a single service url can burst.
+        :param max_retries: number of times a send throttled with a 429 is retried before the error surfaces.
+        :param default_retry_after: seconds to pause when a 429 has no usable `Retry-After` header.
+        :param max_conversations: number of conversation buckets kept before the least recently used is dropped.
+        """
+        self.conversation_rate = conversation_rate
+        self.conversation_capacity = conversation_capacity
+        self.service_rate = service_rate
+        self.service_capacity = service_capacity
+        self.max_retries = max_retries
+        self.default_retry_after = default_retry_after
+        self.max_conversations = max_conversations
+        self.queue_depth = 0
+        self.throttled_count = 0
+        self.throttled_time = 0.0
+        self._conversations = OrderedDict()
+        self._services = {}
+        self._paused_until = {}
+
+    async def acquire(self, service_url: str, conversation_id: str) -> None:
+        """
+        Waits until a send to the conversation is allowed.
+        :param service_url:
+        :param conversation_id:
+        :return:
+        """
+        key = (service_url, conversation_id)
+        wait = self._get_conversation_bucket(key).reserve()
+        paused_until = self._paused_until.get(key)
+        if paused_until is not None:
+            pause = paused_until - time.monotonic()
+            if pause > 0:
+                wait = max(wait, pause)
+            else:
+                del self._paused_until[key]
+        if self.service_rate:
+            service = self._services.get(service_url)
+            if service is None:
+                service = self._services[service_url] = TokenBucket(self.service_rate, self.service_capacity)
+            wait = max(wait, service.reserve())
+
+        if wait > 0:
+            self.queue_depth += 1
+            self.throttled_time += wait
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self.queue_depth -= 1
+
+    def throttle(self, service_url: str, conversation_id: str, retry_after: float = None) -> None:
+        """
+        Pauses sends to a conversation after the channel has answered with a 429.
+        :param service_url:
+        :param conversation_id:
+        :param retry_after: seconds to pause, usually taken from the `Retry-After` header.
+        :return:
+        """
+        key = (service_url, conversation_id)
+        retry_after = self.default_retry_after if retry_after is None else retry_after
+        self.throttled_count += 1
+        self._paused_until[key] = max(self._paused_until.get(key, 0), time.monotonic() + retry_after)
+
+    async def send(self, service_url: str, conversation_id: str, send):
+        """
+        Calls `send()` once the conversation is allowed to send, retrying it when it fails with a 429.
+        :param service_url:
+        :param conversation_id:
+        :param send: function returning the awaitable connector call.
+        :return:
+        """
+        retries = 0
+        while True:
+            await self.acquire(service_url, conversation_id)
+            try:
+                return await send()
+            except Exception as e:
+                response = getattr(e, 'response', None)
+                status = getattr(response, 'status_code', None) or getattr(response, 'status', None)
+                if status != 429 or retries >= self.max_retries:
+                    raise
+                retries += 1
+                self.throttle(service_url, conversation_id, RateLimiter.get_retry_after(response))
+
+    @staticmethod
+    def get_retry_after(response) -> float:
+        """
+        Returns the number of seconds asked for by a `Retry-After` header, or None if it is missing or invalid.
+        :param response:
+        :return:
+        """
+        headers = getattr(response, 'headers', None) or {}
+        value = headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def _get_conversation_bucket(self, key) -> TokenBucket:
+        bucket = self._conversations.get(key)
+        if bucket is None:
+            bucket = self._conversations[key] = TokenBucket(self.conversation_rate, self.conversation_capacity)
+            while len(self._conversations) > self.max_conversations:
+                (evicted, _) = self._conversations.popitem(last=False)
+                self._paused_until.pop(evicted, None)
+        else:
+            self._conversations.move_to_end(key)
+        return bucket
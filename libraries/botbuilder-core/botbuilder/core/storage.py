@@ -9,6 +9,9 @@ from .turn_context import TurnContext
 
 
 class Storage(ABC):
+    # Whether `write()` honours `CREATE_ONLY_E_TAG`. Other storages treat it as an ordinary eTag.
+    supports_create_only = False
+
     @abstractmethod
     async def read(self, keys: List[str]):
         """
@@ -21,7 +24,10 @@ class Storage(ABC):
     @abstractmethod
     async def write(self, changes):
         """
-        Saves store items to storage.
+        Saves store items to storage. An item whose eTag is '*' or None is written whether or not the stored item
+        changed since it was read, while an item with another eTag raises a `KeyError` if the stored item's eTag
+        differs. If `supports_create_only` is True, an item whose eTag is `CREATE_ONLY_E_TAG` is only written if the
+        key doesn't exist yet, and raises a `KeyError` otherwise.
         :param changes:
         :return:
         """
@@ -58,6 +64,10 @@ class StoreItem(ABC):
 
 StorageKeyFactory = Callable[[TurnContext], str]
 
+# The eTag of a `StoreItem` that must only be created: the write fails, as on an eTag conflict, if the key
+# already exists. '*' on the other hand writes the item whether or not it exists.
+CREATE_ONLY_E_TAG = 'create-only'
+
 
 def calculate_change_hash(item: StoreItem) -> str:
     """
@@ -11,9 +11,14 @@ from botbuilder.schema import (
                             ResourceResponse
                             )
 from .assertions import BotAssert
+from .turn_timing import TurnPhases
 
 
 class TurnContext(object):
+    __slots__ = ('adapter', '_activity', 'responses', '_services', '_on_send_activities', '_on_update_activity',
+                 '_on_delete_activity', '_responded', 'turn_timing', 'buffer_activities', '_buffered_activities',
+                 '_turn_state')
+
     def __init__(self, adapter_or_context, request: Activity=None):
         """
         Creates a new TurnContext instance.
@@ -31,6 +36,9 @@ class TurnContext(object):
             self._on_update_activity: Callable[[]] = []
             self._on_delete_activity: Callable[[]] = []
             self._responded : bool = False
+            self.turn_timing = None
+            self.buffer_activities: bool = False
+            self._buffered_activities: List[Activity] = []
 
         if self.adapter is None:
             raise TypeError('TurnContext must be instantiated with an adapter.')
@@ -53,7 +61,8 @@ class TurnContext(object):
         :return:
         """
         for attribute in ['adapter', 'activity', '_responded', '_services',
-                          '_on_send_activities', '_on_update_activity', '_on_delete_activity']:
+                          '_on_send_activities', '_on_update_activity', '_on_delete_activity', 'turn_timing',
+                          'buffer_activities', '_buffered_activities']:
             setattr(context, attribute, getattr(self, attribute))
 
     @property
@@ -79,10 +88,12 @@ class TurnContext(object):
     @property
     def responded(self) -> bool:
         """
-        If `true` at least one response has been sent for the current turn of conversation.
+        If `true` at least one response has been sent for the current turn of conversation. While
+        `buffer_activities` is set, activities queued for `flush()` count as a response, so that a bot doesn't
+        send a second reply because the first one is still waiting in the queue.
         :return:
         """
-        return self._responded
+        return self._responded or bool(self._buffered_activities)
 
     @responded.setter
     def responded(self, value: bool):
@@ -131,24 +142,58 @@ class TurnContext(object):
 
     async def send_activity(self, *activity_or_text: Union[Activity, str]) -> ResourceResponse:
         """
-        Sends a single activity or message to the user.
+        Sends a single activity or message to the user. If `buffer_activities` is set the activities are queued
+        and sent with the rest of the turn's activities by `flush()`, and `responded` is already True.
         :param activity_or_text:
         :return:
         """
-        reference = TurnContext.get_conversation_reference(self.activity)
-
-        output = [TurnContext.apply_conversation_reference(
-            Activity(text=a, type='message') if isinstance(a, str) else a, reference)
-            for a in activity_or_text]
-        for activity in output:
+        # Addressed as `apply_conversation_reference()` does with the reference of the received activity, without
+        # creating the reference. As before, the activities of a call share one copy of each account.
+        request = self.activity
+        conversation = copy(request.conversation)
+        bot = copy(request.recipient)
+        user = copy(request.from_property)
+        output = []
+        for a in activity_or_text:
+            activity = Activity(text=a, type='message') if isinstance(a, str) else a
+            activity.channel_id = request.channel_id
+            activity.service_url = request.service_url
+            activity.conversation = conversation
+            activity.from_property = bot
+            activity.recipient = user
+            if request.id:
+                activity.reply_to_id = request.id
             activity.input_hint = 'acceptingInput'
+            output.append(activity)
+
+        if self.buffer_activities:
+            self._buffered_activities.extend(output)
+            return
+
+        await self._emit(self._on_send_activities, output, self._send_activities(output))
 
-        async def callback(context: 'TurnContext', output):
-            responses = await context.adapter.send_activities(context, output)
-            context._responded = True
-            return responses
+    async def flush(self) -> List[ResourceResponse]:
+        """
+        Sends the activities queued while `buffer_activities` is set as a single batch, running the
+        `on_send_activities()` handlers once for the whole batch. The adapter flushes at the end of every
+        turn it runs with buffering enabled; call this to send the queued activities earlier, e.g. before a
+        long running operation.
+        :return:
+        """
+        if not self._buffered_activities:
+            return []
+        output = list(self._buffered_activities)
+        del self._buffered_activities[:]
+        return await self._emit(self._on_send_activities, output, self._send_activities(output))
 
-        await self._emit(self._on_send_activities, output, callback(self, output))
+    async def _send_activities(self, output: List[Activity]) -> List[ResourceResponse]:
+        if self.turn_timing is None:
+            responses = await self.adapter.send_activities(self, output)
+        else:
+            with self.turn_timing.phase(TurnPhases.send_activities):
+                responses = await self.adapter.send_activities(self, output)
+        self._responded = True
+        return responses
 
     async def update_activity(self, activity: Activity):
         """
@@ -199,19 +244,8 @@ class TurnContext(object):
         return self
 
     async def _emit(self, plugins, arg, logic):
-        handlers = copy(plugins)
-
-        async def emit_next(i: int):
-            context = self
-            try:
-                if i < len(handlers):
-                    async def next_handler():
-                        await emit_next(i + 1)
-                    await handlers[i](context, arg, next_handler)
-
-            except Exception as e:
-                raise e
-        await emit_next(0)
+        if plugins:
+            await _EmitNext(tuple(plugins), self, arg, 0)()
         # This should be changed to `return await logic()`
         return await logic
 
@@ -261,3 +295,29 @@ class TurnContext(object):
                 activity.reply_to_id = reference.activity_id
 
         return activity
+
+
+async def _end_of_handlers():
+    return None
+
+
+class _EmitNext(object):
+    """
+    The `next` continuation handed to an `on_send_activities()`, `on_update_activity()` or `on_delete_activity()`
+    handler. Calling it returns the next handler's awaitable directly, so dispatch doesn't nest a closure and a
+    coroutine per handler.
+    """
+    __slots__ = ('_handlers', '_context', '_arg', '_index')
+
+    def __init__(self, handlers: tuple, context: TurnContext, arg, index: int):
+        self._handlers = handlers
+        self._context = context
+        self._arg = arg
+        self._index = index
+
+    def __call__(self):
+        index = self._index
+        if index == len(self._handlers):
+            return _end_of_handlers()
+        return self._handlers[index](self._context, self._arg,
+                                     _EmitNext(self._handlers, self._context, self._arg, index + 1))
@@ -0,0 +1,130 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import time
+from bisect import bisect_left
+from typing import Dict, List
+
+from .bot_telemetry_client import BotTelemetryClient
+
+
+class TurnPhases(object):
+    """
+    Names of the phases recorded in a `TurnTimingRecord`. `bot_logic` runs inside the middleware pipeline,
+    and state I/O and `send_activities` run inside either of them. `bot_logic` includes the state I/O and
+    sends of the bot logic, while the `middleware` phase is the time spent in the pipeline excluding
+    `bot_logic` and the state I/O and sends of the middleware, so no time is counted in both.
+    """
+    parse_request = 'parse_request'
+    authenticate_request = 'authenticate_request'
+    middleware = 'middleware'
+    bot_logic = 'bot_logic'
+    state_load = 'state_load'
+    state_save = 'state_save'
+    send_activities = 'send_activities'
+
+
+class TurnTimingRecord(object):
+    """
+    The time spent in each phase of a single turn, measured with a monotonic clock. A phase that runs
+    several times during the turn, e.g. `send_activities`, accumulates its durations.
+    """
+    def __init__(self, channel_id: str = None, activity_type: str = None):
+        self.channel_id = channel_id
+        self.activity_type = activity_type
+        self.start = time.monotonic()
+        self.end = None
+        self.phases: Dict[str, float] = {}
+
+    @property
+    def duration(self) -> float:
+        """
+        Number of seconds from the start of the turn to its end, or to now if the turn is still running.
+        :return:
+        """
+        return (self.end if self.end is not None else time.monotonic()) - self.start
+
+    def add(self, phase: str, seconds: float) -> None:
+        """
+        Adds time spent in a phase.
+        :param phase:
+        :param seconds:
+        :return:
+        """
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def phase(self, phase: str) -> '_PhaseTimer':
+        """
+        Returns a context manager that adds the time spent in its body to a phase.
+
+        Usage Example:
+        with record.phase(TurnPhases.state_load):
+            items = await storage.read(keys)
+        :param phase:
+        :return:
+        """
+        return _PhaseTimer(self, phase)
+
+    def finish(self) -> None:
+        self.end = time.monotonic()
+
+    def to_metrics(self) -> Dict[str, float]:
+        """
+        Returns the duration of the turn and of each phase in milliseconds.
+        :return:
+        """
+        metrics = {phase: seconds * 1000 for (phase, seconds) in self.phases.items()}
+        metrics['turn'] = self.duration * 1000
+        return metrics
+
+
+class _PhaseTimer(object):
+    def __init__(self, record: TurnTimingRecord, phase: str):
+        self._record = record
+        self._phase = phase
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._record.add(self._phase, time.monotonic() - self._start)
+
+
+class TelemetryTurnTimingHandler(object):
+    """
+    A turn timing handler that forwards the metrics of each turn to a `BotTelemetryClient`.
+
+    Usage Example:
+    adapter.on_turn_timing(TelemetryTurnTimingHandler(telemetry_client))
+    """
+    def __init__(self, telemetry_client: BotTelemetryClient, prefix: str = 'botbuilder.turn.'):
+        self._telemetry_client = telemetry_client
+        self._prefix = prefix
+
+    def __call__(self, record: TurnTimingRecord) -> None:
+        properties = {'channelId': record.channel_id, 'activityType': record.activity_type}
+        for (name, milliseconds) in record.to_metrics().items():
+            self._telemetry_client.track_metric(self._prefix + name, milliseconds, properties=properties)
+
+
+class TurnTimingHistogram(object):
+    """
+    A turn timing handler that aggregates the metrics of every turn into per-phase histograms, for export
+    to a metrics system. `counts[phase][i]` is the number of samples no larger than `bounds[i]`
+    milliseconds, and the last bucket counts the samples above the largest bound.
+    """
+    def __init__(self, bounds: List[float] = None):
+        self.bounds = sorted(bounds or [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000])
+        self.counts: Dict[str, List[int]] = {}
+        self.sums: Dict[str, float] = {}
+
+    def __call__(self, record: TurnTimingRecord) -> None:
+        for (name, milliseconds) in record.to_metrics().items():
+            counts = self.counts.get(name)
+            if counts is None:
+                counts = self.counts[name] = [0] * (len(self.bounds) + 1)
+                self.sums[name] = 0.0
+            counts[bisect_left(self.bounds, milliseconds)] += 1
+            self.sums[name] += milliseconds
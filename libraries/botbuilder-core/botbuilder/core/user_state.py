@@ -13,11 +13,14 @@ class UserState(BotState):
 
     no_key_error_message = 'UserState: channel_id and/or conversation missing from context.activity.'
 
-    def __init__(self, storage: Storage, namespace=''):
+    def __init__(self, storage: Storage, namespace='', per_property: bool = False,
+                 track_in_place_changes: bool = True):
         """
         Creates a new UserState instance.
         :param storage:
         :param namespace:
+        :param per_property: True to store each property as its own storage item, see `BotState`.
+        :param track_in_place_changes: False to save only properties that are set or deleted, see `BotState`.
         """
         self.namespace = namespace
 
@@ -28,7 +31,7 @@ class UserState(BotState):
             else:
                 return key
 
-        super(UserState, self).__init__(storage, "UserState")
+        super(UserState, self).__init__(storage, "UserState", per_property, track_in_place_changes)
 
     def get_storage_key(self, context: TurnContext) -> str:
         """
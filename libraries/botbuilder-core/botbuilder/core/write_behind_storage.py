@@ -0,0 +1,257 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import itertools
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Dict, List
+
+from .storage import CREATE_ONLY_E_TAG, Storage, StoreItem
+
+
+class _CachedItem(object):
+    __slots__ = ('value', 'store_e_tag', 'local_e_tag', 'version', 'flushed_version')
+
+    def __init__(self, value, store_e_tag: str):
+        # The latest value of the key, None if the key doesn't exist.
+        self.value = value
+        # The eTag of the value held by the wrapped storage, and the one handed out with `value`.
+        self.store_e_tag = store_e_tag
+        self.local_e_tag = store_e_tag
+        self.version = 0
+        self.flushed_version = 0
+
+    @property
+    def is_dirty(self) -> bool:
+        return self.version != self.flushed_version
+
+
+def _get_e_tag(item) -> str:
+    if isinstance(item, StoreItem):
+        return item.e_tag
+    if isinstance(item, dict):
+        return item.get('eTag')
+    return None
+
+
+def _set_e_tag(item, e_tag: str):
+    if isinstance(item, StoreItem):
+        item.e_tag = e_tag
+    elif isinstance(item, dict) and 'eTag' in item:
+        item['eTag'] = e_tag
+    return item
+
+
+def _has_e_tag(item) -> bool:
+    return isinstance(item, StoreItem) or (isinstance(item, dict) and 'eTag' in item)
+
+
+class WriteBehindFlushError(Exception):
+    """
+    Raised when `WriteBehindStorage` fails to write some of the pending changes. `errors` maps each key that
+    wasn't written to the exception raised for it; these keys stay pending and are retried by the next flush.
+    """
+    def __init__(self, errors: Dict[str, Exception]):
+        super(WriteBehindFlushError, self).__init__('%s pending change(s) not written: %s' % (
+            len(errors), '; '.join('%s: %r' % (key, error) for (key, error) in errors.items())))
+        self.errors = errors
+
+
+class WriteBehindStorage(Storage):
+    """
+    Keeps recently read and written items of another `Storage` in memory and writes changes back in the
+    background. Several writes to the same key within `flush_delay` seconds are coalesced into one, and the
+    pending changes of all keys are flushed together, `max_batch` keys at a time.
+
+    Optimistic concurrency is preserved: items read through the wrapper carry a local eTag that changes with
+    every buffered write, and a write with a stale eTag raises a `KeyError` as `MemoryStorage` does, as does a
+    write with `CREATE_ONLY_E_TAG` of a key that exists or has a pending change. The first flush of a key writes
+    it with the eTag it was read with, or with `CREATE_ONLY_E_TAG` if it was created that way and the wrapped
+    storage supports it, so that the wrapped storage rejects it if another instance created the key in the
+    meantime. Since `Storage.write()` doesn't return the new eTag, later flushes of the key use the eTag the
+    wrapped storage set on the written item, if any, and are otherwise last-writer-wins.
+
+    Since reads are served from memory, all turns of a conversation should be handled by the same instance.
+    Call `close()` on shutdown so that pending changes are not lost.
+
+    Usage Example:
+    storage = WriteBehindStorage(CosmosDbStorage(config), flush_delay=5.0)
+    conversation_state = ConversationState(storage)
+    ...
+    await storage.close()
+    """
+    supports_create_only = True
+
+    def __init__(self, storage: Storage, flush_delay: float = 1.0, max_pending: int = 100, max_batch: int = 50,
+                 max_cached: int = 10000):
+        """
+        Creates a new WriteBehindStorage instance.
+        :param storage: the storage written to.
+        :param flush_delay: number of seconds a change is kept in memory before it is flushed.
+        :param max_pending: number of changed keys that triggers a flush without waiting for `flush_delay`.
+        :param max_batch: maximum number of keys written concurrently.
+        :param max_cached: maximum number of unchanged items kept in memory.
+        """
+        if flush_delay < 0 or max_pending < 1 or max_batch < 1 or max_cached < 0:
+            raise ValueError('WriteBehindStorage(): flush_delay and max_cached must not be negative, max_pending and '
+                             'max_batch must be positive.')
+        super(WriteBehindStorage, self).__init__()
+        self.storage = storage
+        self.flush_delay = flush_delay
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.max_cached = max_cached
+        # Counters showing how many writes were coalesced.
+        self.writes_received = 0
+        self.items_flushed = 0
+        self._cache: Dict[str, _CachedItem] = OrderedDict()
+        self._pending = 0
+        self._e_tags = itertools.count(1)
+        self._flush_lock: asyncio.Lock = None
+        self._flush_task: asyncio.Future = None
+        self._flush_error: Exception = None
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of keys with changes not written to the wrapped storage yet.
+        :return:
+        """
+        return self._pending
+
+    async def read(self, keys: List[str]):
+        await self._load(keys)
+        data = {}
+        for key in keys:
+            cached = self._cache[key]
+            self._cache.move_to_end(key)
+            if cached.value is not None:
+                data[key] = _set_e_tag(deepcopy(cached.value), cached.local_e_tag)
+        self._evict()
+        return data
+
+    async def write(self, changes: Dict[str, StoreItem]):
+        # Whether a key to be created only exists is known once it is cached.
+        await self._load([key for (key, change) in changes.items() if _get_e_tag(change) == CREATE_ONLY_E_TAG])
+        for (key, change) in changes.items():
+            cached = self._cache.get(key)
+            e_tag = _get_e_tag(change)
+            if e_tag == CREATE_ONLY_E_TAG:
+                if cached.value is not None:
+                    raise KeyError("Etag conflict.\nOriginal: %s\r\nCurrent: %s" % (e_tag, cached.local_e_tag))
+            elif cached is not None and e_tag not in (None, '*') and e_tag != cached.local_e_tag:
+                raise KeyError("Etag conflict.\nOriginal: %s\r\nCurrent: %s" % (e_tag, cached.local_e_tag))
+
+        for (key, change) in changes.items():
+            cached = self._cache.get(key)
+            if cached is None:
+                # Written without being read through the wrapper, with the eTag read from the wrapped storage.
+                cached = self._cache[key] = _CachedItem(None, _get_e_tag(change))
+            elif cached.value is None and not cached.is_dirty and _get_e_tag(change) == CREATE_ONLY_E_TAG and \
+                    getattr(self.storage, 'supports_create_only', False):
+                cached.store_e_tag = CREATE_ONLY_E_TAG
+            if not cached.is_dirty:
+                self._pending += 1
+            cached.value = deepcopy(change)
+            cached.local_e_tag = 'write-behind-%d' % next(self._e_tags) if _has_e_tag(change) else None
+            cached.version += 1
+            self._cache.move_to_end(key)
+            self.writes_received += 1
+
+        if self._pending >= self.max_pending:
+            await self.flush()
+        elif self._pending and self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+
+    async def delete(self, keys: List[str]):
+        for key in keys:
+            cached = self._cache.pop(key, None)
+            if cached is not None and cached.is_dirty:
+                self._pending -= 1
+        await self.storage.delete(keys)
+
+    async def flush(self) -> None:
+        """
+        Writes all pending changes to the wrapped storage now. Every key is written on its own, so a key that
+        can't be written doesn't hold back the others: it stays pending, and once all keys were attempted a
+        `WriteBehindFlushError` naming the failed keys is raised. Otherwise raises the error of a background flush
+        that failed since the last call.
+        :return:
+        """
+        if self._flush_lock is None:
+            # Created on first use, in the event loop the storage is used from.
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            error, self._flush_error = self._flush_error, None
+            dirty = [(key, cached) for (key, cached) in self._cache.items() if cached.is_dirty]
+            errors = {}
+            for start in range(0, len(dirty), self.max_batch):
+                errors.update(await self._write_batch(dirty[start:start + self.max_batch]))
+            self._evict()
+        if errors:
+            raise WriteBehindFlushError(errors)
+        if error is not None:
+            raise error
+
+    async def close(self) -> None:
+        """
+        Cancels the scheduled flush and writes all pending changes. Call on shutdown. Changes that can't be
+        written stay pending and are reported by a `WriteBehindFlushError`.
+        :return:
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    async def _load(self, keys: List[str]) -> None:
+        missing = [key for key in keys if key not in self._cache]
+        if missing:
+            items = await self.storage.read(missing)
+            for key in missing:
+                if key not in self._cache:
+                    value = items.get(key)
+                    self._cache[key] = _CachedItem(value, _get_e_tag(value))
+
+    async def _write_batch(self, batch: list) -> Dict[str, Exception]:
+        results = await asyncio.gather(*[self._write_item(key, cached) for (key, cached) in batch],
+                                       return_exceptions=True)
+        return {key: result for ((key, _), result) in zip(batch, results) if isinstance(result, Exception)}
+
+    async def _write_item(self, key: str, cached: _CachedItem) -> None:
+        version = cached.version
+        change = None
+        if cached.value is not None:
+            e_tag = cached.store_e_tag if cached.store_e_tag is not None else '*'
+            change = _set_e_tag(deepcopy(cached.value), e_tag)
+            await self.storage.write({key: change})
+            self.items_flushed += 1
+
+        if cached.version == version and self._cache.get(key) is cached:
+            self._pending -= 1
+        cached.flushed_version = version
+        if change is not None and _has_e_tag(change):
+            # Storage.write() doesn't return the eTag it assigned. Storages that set it on the item written are
+            # matched by the next flush of the key, with the others the next flush is last-writer-wins.
+            written_e_tag = _get_e_tag(change)
+            cached.store_e_tag = written_e_tag if written_e_tag != e_tag else '*'
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_delay)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            # Kept for the next flush() or close(). The changes that failed stay pending, and are retried by the
+            # flush scheduled by the next write.
+            self._flush_error = error
+
+    def _evict(self) -> None:
+        # Drops the least recently used unchanged items.
+        excess = len(self._cache) - self._pending - self.max_cached
+        if excess > 0:
+            for key in [key for (key, cached) in self._cache.items() if not cached.is_dirty][:excess]:
+                del self._cache[key]
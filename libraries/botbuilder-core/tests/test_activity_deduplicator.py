@@ -0,0 +1,155 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import time
+import aiounittest
+
+from botbuilder.schema import Activity, ActivityTypes, ChannelAccount, ConversationAccount
+from botbuilder.core import (CREATE_ONLY_E_TAG, ActivityDeduplicator, BotFrameworkAdapter,
+                             BotFrameworkAdapterSettings, MemoryStorage, WriteBehindStorage)
+
+
+class YieldingMemoryStorage(MemoryStorage):
+    """
+    Lets other coroutines run between reads and writes, as a remote storage would.
+    """
+    async def read(self, keys):
+        await asyncio.sleep(0)
+        return await super(YieldingMemoryStorage, self).read(keys)
+
+
+class LegacyMemoryStorage(MemoryStorage):
+    """
+    A storage that doesn't support create-only writes.
+    """
+    supports_create_only = False
+
+    async def write(self, changes):
+        assert all(change.e_tag != CREATE_ONLY_E_TAG for change in changes.values())
+        await super(LegacyMemoryStorage, self).write(changes)
+
+
+class AdapterUnderTest(BotFrameworkAdapter):
+    async def authenticate_request(self, request, auth_header):
+        pass
+
+
+def create_activity(activity_id='1234', conversation_id='convo1'):
+    return Activity(id=activity_id, type=ActivityTypes.message, text='hi', channel_id='test',
+                    service_url='https://example.org',
+                    from_property=ChannelAccount(id='user'),
+                    recipient=ChannelAccount(id='bot'),
+                    conversation=ConversationAccount(id=conversation_id))
+
+
+class TestActivityDeduplicator(aiounittest.AsyncTestCase):
+    async def test_should_detect_duplicate_activities(self):
+        deduplicator = ActivityDeduplicator()
+
+        assert await deduplicator.begin(create_activity())
+        assert not await deduplicator.begin(create_activity())
+        assert await deduplicator.begin(create_activity(activity_id='5678'))
+        assert await deduplicator.begin(create_activity(conversation_id='convo2'))
+        assert deduplicator.duplicates == 1
+
+    async def test_should_ignore_activities_without_id(self):
+        deduplicator = ActivityDeduplicator()
+
+        assert await deduplicator.begin(create_activity(activity_id=None))
+        assert await deduplicator.begin(create_activity(activity_id=None))
+
+    async def test_should_forget_activities_after_ttl(self):
+        deduplicator = ActivityDeduplicator(ttl=0.01)
+
+        assert await deduplicator.begin(create_activity())
+        time.sleep(0.02)
+        assert await deduplicator.begin(create_activity())
+
+    async def test_should_bound_memory_cache(self):
+        deduplicator = ActivityDeduplicator(max_size=2)
+
+        for activity_id in ['1', '2', '3']:
+            assert await deduplicator.begin(create_activity(activity_id=activity_id))
+
+        assert await deduplicator.begin(create_activity(activity_id='1'))
+
+    async def test_should_share_seen_activities_through_storage(self):
+        storage = MemoryStorage()
+        first_instance = ActivityDeduplicator(storage=storage)
+        second_instance = ActivityDeduplicator(storage=storage)
+
+        assert await first_instance.begin(create_activity())
+        assert not await second_instance.begin(create_activity())
+
+        await first_instance.abandon(create_activity())
+        assert await second_instance.begin(create_activity())
+
+    async def test_should_begin_concurrent_activity_on_one_instance_only(self):
+        storage = YieldingMemoryStorage()
+        instances = [ActivityDeduplicator(storage=storage) for _ in range(3)]
+
+        begun = await asyncio.gather(*[instance.begin(create_activity()) for instance in instances])
+
+        assert begun.count(True) == 1
+        assert sum(instance.duplicates for instance in instances) == 2
+
+    async def test_should_share_seen_activities_through_write_behind_storage(self):
+        inner = YieldingMemoryStorage()
+        storage = WriteBehindStorage(inner, flush_delay=60)
+        instances = [ActivityDeduplicator(storage=storage) for _ in range(3)]
+
+        begun = await asyncio.gather(*[instance.begin(create_activity()) for instance in instances])
+        await storage.close()
+
+        assert begun.count(True) == 1
+        assert sum(instance.duplicates for instance in instances) == 2
+        assert 'deduplication/test/convo1/1234' in inner.memory
+
+    async def test_should_fall_back_to_plain_writes_without_create_only_support(self):
+        storage = LegacyMemoryStorage()
+        with self.assertLogs('botbuilder.core.activity_deduplicator', 'WARNING') as _:
+            first_instance = ActivityDeduplicator(storage=storage)
+        second_instance = ActivityDeduplicator(storage=storage)
+
+        assert await first_instance.begin(create_activity())
+        assert not await second_instance.begin(create_activity())
+
+    async def test_should_replace_expired_storage_marker(self):
+        storage = MemoryStorage()
+        first_instance = ActivityDeduplicator(ttl=0.01, storage=storage)
+        second_instance = ActivityDeduplicator(ttl=0.01, storage=storage)
+
+        assert await first_instance.begin(create_activity())
+        time.sleep(0.02)
+        assert await second_instance.begin(create_activity())
+
+    async def test_adapter_should_not_run_duplicate_turns(self):
+        adapter = AdapterUnderTest(BotFrameworkAdapterSettings('', ''),
+                                   activity_deduplicator=ActivityDeduplicator())
+        turns = 0
+
+        async def logic(context):
+            nonlocal turns
+            turns += 1
+            return 'processed'
+
+        assert await adapter.process_activity(create_activity(), '', logic) == 'processed'
+        assert await adapter.process_activity(create_activity(), '', logic) is None
+        assert turns == 1
+
+    async def test_adapter_should_run_retry_of_failed_turn(self):
+        adapter = AdapterUnderTest(BotFrameworkAdapterSettings('', ''),
+                                   activity_deduplicator=ActivityDeduplicator())
+        turns = 0
+
+        async def logic(context):
+            nonlocal turns
+            turns += 1
+            if turns == 1:
+                raise ValueError('failed turn')
+
+        with self.assertRaises(ValueError):
+            await adapter.process_activity(create_activity(), '', logic)
+        await adapter.process_activity(create_activity(), '', logic)
+        assert turns == 2
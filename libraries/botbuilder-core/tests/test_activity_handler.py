@@ -0,0 +1,98 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from unittest.mock import patch
+
+import aiounittest
+
+from botbuilder.schema import Activity, ActivityTypes, ChannelAccount
+from botbuilder.core import ActivityHandler, TurnContext
+from botbuilder.core.adapters import TestAdapter
+
+
+class RecordingActivityHandler(ActivityHandler):
+    def __init__(self):
+        self.record = []
+
+    async def on_message_activity(self, turn_context: TurnContext):
+        self.record.append('on_message_activity')
+        return 'message'
+
+    async def on_members_added_activity(self, members_added, turn_context: TurnContext):
+        self.record.append('on_members_added_activity')
+
+    async def on_event(self, turn_context: TurnContext):
+        self.record.append('on_event')
+
+    async def on_unrecognized_activity_type(self, turn_context: TurnContext):
+        self.record.append('on_unrecognized_activity_type')
+
+
+class TypingActivityHandler(RecordingActivityHandler):
+    activity_type_handlers = {ActivityTypes.typing: 'on_typing_activity'}
+
+    async def on_typing_activity(self, turn_context: TurnContext):
+        self.record.append('on_typing_activity')
+
+
+def create_context(activity: Activity) -> TurnContext:
+    return TurnContext(TestAdapter(), activity)
+
+
+class TestActivityHandler(aiounittest.AsyncTestCase):
+    async def test_should_only_run_message_handler(self):
+        bot = RecordingActivityHandler()
+
+        result = await bot.on_turn(create_context(Activity(type=ActivityTypes.message)))
+
+        assert result == 'message'
+        assert bot.record == ['on_message_activity']
+
+    async def test_should_route_conversation_update(self):
+        bot = RecordingActivityHandler()
+
+        await bot.on_turn(create_context(Activity(type=ActivityTypes.conversation_update,
+                                                  members_added=[ChannelAccount(id='user')])))
+
+        assert bot.record == ['on_members_added_activity']
+
+    async def test_should_route_event(self):
+        bot = RecordingActivityHandler()
+
+        await bot.on_turn(create_context(Activity(type=ActivityTypes.event, name='some/event')))
+
+        assert bot.record == ['on_event']
+
+    async def test_should_route_unrecognized_activity_type(self):
+        bot = RecordingActivityHandler()
+
+        await bot.on_turn(create_context(Activity(type=ActivityTypes.typing)))
+
+        assert bot.record == ['on_unrecognized_activity_type']
+
+    async def test_derived_class_should_route_additional_types(self):
+        bot = TypingActivityHandler()
+
+        await bot.on_turn(create_context(Activity(type=ActivityTypes.typing)))
+        await bot.on_turn(create_context(Activity(type=ActivityTypes.message)))
+
+        assert bot.record == ['on_typing_activity', 'on_message_activity']
+
+    async def test_should_use_handlers_overridden_after_class_creation(self):
+        bot = RecordingActivityHandler()
+
+        async def on_message_activity(turn_context: TurnContext):
+            bot.record.append('instance override')
+        bot.on_message_activity = on_message_activity
+        await bot.on_turn(create_context(Activity(type=ActivityTypes.message)))
+
+        async def on_event_activity(self, turn_context: TurnContext):
+            self.record.append('patched')
+        with patch.object(RecordingActivityHandler, 'on_event_activity', on_event_activity):
+            await bot.on_turn(create_context(Activity(type=ActivityTypes.event, name='some/event')))
+
+        assert bot.record == ['instance override', 'patched']
+
+    async def test_should_not_accept_context_without_type(self):
+        with self.assertRaises(TypeError):
+            await RecordingActivityHandler().on_turn(create_context(Activity()))
@@ -0,0 +1,96 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import aiounittest
+
+from botbuilder.schema import Activity, ActivityTypes, ChannelAccount, ConversationAccount
+from botbuilder.core import (AdmissionController, AdmissionRejectedError, BotFrameworkAdapter,
+                             BotFrameworkAdapterSettings)
+
+
+class AdapterUnderTest(BotFrameworkAdapter):
+    async def authenticate_request(self, request, auth_header):
+        pass
+
+
+def create_activity():
+    return Activity(type=ActivityTypes.message, text='hi', channel_id='test',
+                    service_url='https://example.org',
+                    from_property=ChannelAccount(id='user'),
+                    recipient=ChannelAccount(id='bot'),
+                    conversation=ConversationAccount(id='convo1'))
+
+
+class TestAdmissionController(aiounittest.AsyncTestCase):
+    async def test_should_admit_up_to_max_in_flight(self):
+        controller = AdmissionController(max_in_flight=2)
+
+        await controller.acquire()
+        await controller.acquire()
+
+        assert controller.in_flight == 2
+        assert controller.queued == 0
+
+    async def test_should_queue_and_hand_over_released_slots(self):
+        controller = AdmissionController(max_in_flight=1)
+        await controller.acquire()
+
+        waiter = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.queued == 1
+
+        controller.release()
+        await waiter
+        assert controller.in_flight == 1
+        assert controller.queued == 0
+
+        controller.release()
+        assert controller.in_flight == 0
+
+    async def test_should_reject_when_queue_is_full(self):
+        controller = AdmissionController(max_in_flight=1, max_queued=0, retry_after=2)
+        await controller.acquire()
+
+        with self.assertRaises(AdmissionRejectedError) as context:
+            await controller.acquire()
+
+        assert context.exception.status == 503
+        assert context.exception.retry_after == 2
+        assert controller.rejected == 1
+
+    async def test_should_reject_after_queue_timeout(self):
+        controller = AdmissionController(max_in_flight=1, queue_timeout=0.01)
+        await controller.acquire()
+
+        with self.assertRaises(AdmissionRejectedError):
+            await controller.acquire()
+
+        assert controller.rejected == 1
+        assert controller.queued == 0
+        controller.release()
+        assert controller.in_flight == 0
+
+    async def test_process_activity_should_limit_turns_in_flight(self):
+        controller = AdmissionController(max_in_flight=1, max_queued=1)
+        adapter = AdapterUnderTest(BotFrameworkAdapterSettings('', ''), admission_controller=controller)
+        release_turn = asyncio.Event()
+
+        async def logic(context):
+            await release_turn.wait()
+            return context.activity.text
+
+        first = asyncio.ensure_future(adapter.process_activity(create_activity(), '', logic))
+        second = asyncio.ensure_future(adapter.process_activity(create_activity(), '', logic))
+        await asyncio.sleep(0)
+        assert controller.in_flight == 1
+        assert controller.queued == 1
+
+        with self.assertRaises(AdmissionRejectedError):
+            await adapter.process_activity(create_activity(), '', logic)
+
+        release_turn.set()
+        assert await first == 'hi'
+        assert await second == 'hi'
+        assert controller.in_flight == 0
+        assert controller.rejected == 1
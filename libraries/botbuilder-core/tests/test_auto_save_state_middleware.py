@@ -0,0 +1,37 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+import aiounittest
+from unittest.mock import MagicMock
+
+from botbuilder.core import AutoSaveStateMiddleware, BotStateSet, ConversationState, MemoryStorage, UserState
+from botbuilder.core.adapters import TestAdapter
+
+
+class TestAutoSaveStateMiddleware(aiounittest.AsyncTestCase):
+    async def test_should_load_and_save_state_around_the_turn(self):
+        dictionary = {}
+        storage = MemoryStorage(dictionary)
+        storage.read = MagicMock(side_effect=storage.read)
+        storage.write = MagicMock(side_effect=storage.write)
+        user_state = UserState(storage)
+        conversation_state = ConversationState(storage)
+        count_property = conversation_state.create_property('count')
+        name_property = user_state.create_property('name')
+
+        async def logic(context):
+            count = await count_property.get(context, lambda: 0)
+            await count_property.set(context, count + 1)
+            await name_property.get(context, lambda: 'user')
+            await context.send_activity('count: %s' % (count + 1))
+
+        adapter = TestAdapter(logic)
+        adapter.use(AutoSaveStateMiddleware(BotStateSet(user_state), conversation_state))
+
+        step = await adapter.send('hi')
+        step = await step.assert_reply('count: 1')
+        step = await step.send('hi')
+        await step.assert_reply('count: 2')
+
+        self.assertEqual(storage.read.call_count, 2)
+        self.assertEqual(storage.write.call_count, 2)
+        self.assertEqual(2, dictionary['test/conversations/Convo1']['count'])
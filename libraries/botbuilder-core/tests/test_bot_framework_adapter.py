@@ -0,0 +1,208 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import json
+import aiounittest
+
+from botbuilder.schema import (Activity, ActivityTypes, ChannelAccount, ConversationAccount,
+                               ConversationReference, ResourceResponse)
+from botbuilder.schema.lazy_activity import LazyActivity
+from botbuilder.core import BotFrameworkAdapter, BotFrameworkAdapterSettings, RateLimiter, TurnContext
+
+SEND_LATENCY = 0.05
+
+
+class ThrottledResponseStub(object):
+    status_code = 429
+    headers = {'Retry-After': '0'}
+
+
+class ThrottledError(Exception):
+    response = ThrottledResponseStub()
+
+
+class ConversationsOperationsStub(object):
+    def __init__(self):
+        self.sent = []
+        self.throttle_next = False
+
+    async def send_to_conversation(self, conversation_id, activity):
+        await asyncio.sleep(SEND_LATENCY)
+        if self.throttle_next:
+            self.throttle_next = False
+            raise ThrottledError()
+        self.sent.append((conversation_id, activity.text))
+        return ResourceResponse(id=activity.text)
+
+
+class ConnectorClientStub(object):
+    def __init__(self):
+        self.conversations = ConversationsOperationsStub()
+
+
+class AdapterUnderTest(BotFrameworkAdapter):
+    def __init__(self, concurrent_send=False, rate_limiter=None):
+        super(AdapterUnderTest, self).__init__(BotFrameworkAdapterSettings('', ''), concurrent_send=concurrent_send,
+                                               rate_limiter=rate_limiter)
+        self.client = ConnectorClientStub()
+
+    def create_connector_client(self, service_url):
+        return self.client
+
+
+def message(conversation_id, text):
+    return Activity(type=ActivityTypes.message, text=text, service_url='https://example.org',
+                    conversation=ConversationAccount(id=conversation_id))
+
+
+def delay(conversation_id, delay_in_ms):
+    return Activity(type='delay', value=delay_in_ms, service_url='https://example.org',
+                    conversation=ConversationAccount(id=conversation_id))
+
+
+def create_context(adapter):
+    return TurnContext(adapter, message('convo1', 'incoming'))
+
+
+def reference(conversation_id, channel_id='test'):
+    return ConversationReference(channel_id=channel_id,
+                                 service_url='https://example.org',
+                                 user=ChannelAccount(id='user'),
+                                 bot=ChannelAccount(id='bot'),
+                                 conversation=ConversationAccount(id=conversation_id))
+
+
+class TestBotFrameworkAdapter(aiounittest.AsyncTestCase):
+    async def test_send_activities_should_send_in_order_by_default(self):
+        adapter = AdapterUnderTest()
+        activities = [message('convo1', 'a'), message('convo2', 'b'), message('convo1', 'c')]
+
+        responses = await adapter.send_activities(create_context(adapter), activities)
+
+        assert [response.id for response in responses] == ['a', 'b', 'c']
+        assert adapter.client.conversations.sent == [('convo1', 'a'), ('convo2', 'b'), ('convo1', 'c')]
+
+    async def test_concurrent_send_should_keep_order_within_a_conversation(self):
+        adapter = AdapterUnderTest(concurrent_send=True)
+        activities = [message('convo1', 'a1'), message('convo2', 'b1'),
+                      message('convo1', 'a2'), message('convo2', 'b2')]
+
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        responses = await adapter.send_activities(create_context(adapter), activities)
+        elapsed = loop.time() - start
+
+        assert [response.id for response in responses] == ['a1', 'b1', 'a2', 'b2']
+        sent = adapter.client.conversations.sent
+        assert [text for (conversation_id, text) in sent if conversation_id == 'convo1'] == ['a1', 'a2']
+        assert [text for (conversation_id, text) in sent if conversation_id == 'convo2'] == ['b1', 'b2']
+        # Two round trips per conversation, with both conversations in flight at once.
+        assert elapsed < 4 * SEND_LATENCY
+
+    async def test_concurrent_send_should_only_delay_its_own_conversation(self):
+        adapter = AdapterUnderTest(concurrent_send=True)
+        activities = [delay('convo1', 200), message('convo1', 'a'), message('convo2', 'b')]
+
+        responses = await adapter.send_activities(create_context(adapter), activities)
+
+        assert adapter.client.conversations.sent == [('convo2', 'b'), ('convo1', 'a')]
+        assert isinstance(responses[0], ResourceResponse)
+        assert [response.id for response in responses[1:]] == ['a', 'b']
+
+    async def test_concurrent_send_should_finish_other_conversations_before_raising(self):
+        adapter = AdapterUnderTest(concurrent_send=True)
+        activities = [message('convo1', 'a1'), delay('convo1', None), message('convo1', 'a2'),
+                      message('convo2', 'b1'), message('convo2', 'b2')]
+
+        with self.assertRaises(TypeError):
+            await adapter.send_activities(create_context(adapter), activities)
+
+        assert adapter.client.conversations.sent == [('convo1', 'a1'), ('convo2', 'b1'), ('convo2', 'b2')]
+
+    async def test_send_activities_should_retry_throttled_sends(self):
+        limiter = RateLimiter()
+        adapter = AdapterUnderTest(rate_limiter=limiter)
+        adapter.client.conversations.throttle_next = True
+
+        responses = await adapter.send_activities(create_context(adapter), [message('convo1', 'a')])
+
+        assert [response.id for response in responses] == ['a']
+        assert limiter.throttled_count == 1
+
+    async def test_continue_conversations_should_report_each_reference(self):
+        adapter = AdapterUnderTest()
+
+        async def logic(context):
+            if context.activity.conversation.id == 'convo2':
+                raise ValueError('failed turn')
+            return context.activity.conversation.id
+
+        outcomes = [outcome async for outcome in adapter.continue_conversations(
+            [reference('convo1'), reference('convo2'), reference('convo3')], logic)]
+
+        assert sorted(outcome.reference.conversation.id for outcome in outcomes) == ['convo1', 'convo2', 'convo3']
+        failures = [outcome for outcome in outcomes if not outcome.succeeded]
+        assert len(failures) == 1
+        assert isinstance(failures[0].error, ValueError)
+        assert sorted(outcome.result for outcome in outcomes if outcome.succeeded) == ['convo1', 'convo3']
+
+    async def test_continue_conversations_should_cap_concurrency(self):
+        adapter = AdapterUnderTest()
+        running = 0
+        max_running = 0
+
+        async def logic(context):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        async def references():
+            for i in range(20):
+                yield reference('convo%s' % i)
+
+        outcomes = [outcome async for outcome in adapter.continue_conversations(references(), logic,
+                                                                                max_concurrency=3)]
+
+        assert len(outcomes) == 20
+        assert all(outcome.succeeded for outcome in outcomes)
+        assert max_running == 3
+
+    async def test_continue_conversations_should_rate_limit_per_channel(self):
+        adapter = AdapterUnderTest()
+        started = []
+
+        async def logic(context):
+            started.append((context.activity.channel_id, asyncio.get_event_loop().time()))
+
+        references = [reference('convo%s' % i, 'slow') for i in range(3)] + [reference('fast', 'fast')]
+        async for _ in adapter.continue_conversations(references, logic, channel_rate_limits={'slow': 20}):
+            pass
+
+        slow = [time for (channel_id, time) in started if channel_id == 'slow']
+        assert len(slow) == 3
+        assert slow[-1] - slow[0] >= 0.09
+
+    async def test_parse_request_should_decode_raw_body(self):
+        body = b'{"type": "message", "text": "hi", "from": {"id": "user"}, "channelId": "test"}'
+
+        for req in [body, {'body': body}, {'body': body.decode('utf-8')}]:
+            activity = await BotFrameworkAdapter.parse_request(req)
+            assert activity.type == ActivityTypes.message
+            assert activity.text == 'hi'
+            assert activity.from_property.id == 'user'
+
+    async def test_parse_request_should_reject_raw_body_without_type(self):
+        with self.assertRaises(TypeError):
+            await BotFrameworkAdapter.parse_request(b'{"text": "hi"}')
+
+    async def test_parse_request_should_create_lazy_activity(self):
+        body = b'{"type": "message", "text": "hi", "entities": [{"type": "clientInfo"}]}'
+
+        for req in [body, {'body': json.loads(body.decode('utf-8'))}]:
+            activity = await BotFrameworkAdapter.parse_request(req, lazy=True)
+            assert isinstance(activity, LazyActivity)
+            assert activity.text == 'hi'
+            assert 'entities' not in activity.__dict__
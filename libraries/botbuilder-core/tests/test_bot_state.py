@@ -5,6 +5,7 @@ from unittest.mock import MagicMock
 
 from botbuilder.core import TurnContext, BotState, MemoryStorage, UserState
 from botbuilder.core.adapters import TestAdapter
+from botbuilder.core.bot_state import CachedBotState
 from botbuilder.schema import Activity
 
 from test_utilities import TestUtilities
@@ -334,4 +335,177 @@ class TestBotState(aiounittest.AsyncTestCase):
         obj2 = dictionary["EmptyContext/users/empty@empty.context.org"]
         self.assertEqual("hello-2", obj2["property-a"])
         with self.assertRaises(KeyError) as _:
-            obj2["property-b"]
\ No newline at end of file
+            obj2["property-b"]
+
+    async def test_save_should_write_values_changed_in_place(self):
+        dictionary = {}
+        user_state = UserState(MemoryStorage(dictionary))
+        context = TestUtilities.create_empty_context()
+        property_a = user_state.create_property("property-a")
+
+        profile = await property_a.get(context, lambda: {'name': 'user'})
+        await user_state.save_changes(context)
+        profile['name'] = 'changed'
+        await user_state.save_changes(context)
+
+        obj = dictionary["EmptyContext/users/empty@empty.context.org"]
+        self.assertEqual({'name': 'changed'}, obj["property-a"])
+
+    async def test_save_should_skip_unchanged_mutable_values(self):
+        storage = MemoryStorage({"EmptyContext/users/empty@empty.context.org": {"property-a": {'name': 'user'}}})
+        storage.write = MagicMock(side_effect=storage.write)
+        user_state = UserState(storage)
+        context = TestUtilities.create_empty_context()
+        property_a = user_state.create_property("property-a")
+
+        profile = await property_a.get(context)
+        profile['name'] = 'user'
+        await user_state.save_changes(context)
+
+        self.assertEqual(storage.write.call_count, 0)
+
+    async def test_save_should_not_hash_state_that_was_not_handed_out(self):
+        storage = MemoryStorage({"EmptyContext/users/empty@empty.context.org": {"property-a": 'a', "property-b": {}}})
+        user_state = UserState(storage)
+        context = TestUtilities.create_empty_context()
+        property_a = user_state.create_property("property-a")
+
+        self.assertEqual('a', await property_a.get(context))
+        cached = context.turn_state[user_state._context_service_key]
+        cached.compute_hash = MagicMock(side_effect=cached.compute_hash)
+        await user_state.save_changes(context)
+
+        self.assertEqual(cached.compute_hash.call_count, 0)
+        self.assertFalse(cached.is_changed)
+
+    async def test_save_should_digest_values_once(self):
+        dictionary = {}
+        user_state = UserState(MemoryStorage(dictionary))
+        context = TestUtilities.create_empty_context()
+        property_a = user_state.create_property("property-a")
+
+        profile = await property_a.get(context, lambda: {'name': 'user'})
+        await user_state.save_changes(context)
+        cached = context.turn_state[user_state._context_service_key]
+        cached.compute_hash = MagicMock(side_effect=cached.compute_hash)
+        profile['name'] = 'changed'
+        await user_state.save_changes(context)
+
+        self.assertEqual(cached.compute_hash.call_count, 1)
+        self.assertEqual({'name': 'changed'}, dictionary["EmptyContext/users/empty@empty.context.org"]["property-a"])
+
+    async def test_save_should_only_track_assignments_when_in_place_tracking_is_off(self):
+        storage = MemoryStorage({"EmptyContext/users/empty@empty.context.org": {"property-a": {'name': 'user'}}})
+        storage.write = MagicMock(side_effect=storage.write)
+        user_state = UserState(storage, track_in_place_changes=False)
+        context = TestUtilities.create_empty_context()
+        property_a = user_state.create_property("property-a")
+
+        profile = await property_a.get(context)
+        cached = context.turn_state[user_state._context_service_key]
+        cached.compute_hash = MagicMock(side_effect=cached.compute_hash)
+        profile['name'] = 'changed'
+        await user_state.save_changes(context)
+        self.assertEqual(storage.write.call_count, 0)
+
+        await property_a.set(context, profile)
+        await user_state.save_changes(context)
+        self.assertEqual(storage.write.call_count, 1)
+        self.assertEqual(cached.compute_hash.call_count, 0)
+
+    def test_deprecated_hash_should_mark_state_saved(self):
+        cached = CachedBotState({'property-a': 'a'})
+        cached.set_property('property-b', 'b')
+
+        with self.assertWarns(DeprecationWarning):
+            cached.hash = cached.compute_hash(cached.state)
+        self.assertFalse(cached.is_changed)
+        with self.assertWarns(DeprecationWarning):
+            cached.hash = b'outdated'
+        self.assertTrue(cached.is_changed)
+
+    async def test_changes_to_state_dict_should_be_saved(self):
+        dictionary = {"EmptyContext/users/empty@empty.context.org": {"property-a": 'a'}}
+        user_state = UserState(MemoryStorage(dictionary))
+        context = TestUtilities.create_empty_context()
+
+        await user_state.load(context)
+        user_state.get(context)['property-b'] = 'b'
+        await user_state.save_changes(context)
+
+        obj = dictionary["EmptyContext/users/empty@empty.context.org"]
+        self.assertEqual('b', obj["property-b"])
+
+    async def test_per_property_should_write_only_changed_properties(self):
+        dictionary = {}
+        storage = MemoryStorage(dictionary)
+        storage.read = MagicMock(side_effect=storage.read)
+        storage.write = MagicMock(side_effect=storage.write)
+        user_state = UserState(storage, per_property=True)
+        profile_property = user_state.create_property("profile")
+        count_property = user_state.create_property("count")
+        context = TestUtilities.create_empty_context()
+
+        await profile_property.set(context, {'name': 'user', 'history': list(range(100))})
+        await count_property.set(context, 1)
+        await user_state.save_changes(context)
+        self.assertEqual({'value': 1}, dictionary["EmptyContext/users/empty@empty.context.org/properties/count"])
+
+        context = TestUtilities.create_empty_context()
+        profile = await profile_property.get(context)
+        await count_property.set(context, 2)
+        await user_state.save_changes(context)
+
+        self.assertEqual(storage.read.call_count, 2)
+        self.assertEqual(2, len(storage.read.call_args[0][0]))
+        self.assertEqual(["EmptyContext/users/empty@empty.context.org/properties/count"],
+                         list(storage.write.call_args[0][0]))
+
+        profile['name'] = 'changed'
+        await user_state.save_changes(context)
+        self.assertEqual(["EmptyContext/users/empty@empty.context.org/properties/profile"],
+                         list(storage.write.call_args[0][0]))
+        self.assertEqual('changed', dictionary["EmptyContext/users/empty@empty.context.org/properties/profile"]
+                         ['value']['name'])
+
+    async def test_per_property_should_delete_deleted_properties(self):
+        dictionary = {"EmptyContext/users/empty@empty.context.org/properties/property-a": {'value': 'a'},
+                      "EmptyContext/users/empty@empty.context.org/properties/property-b": {'value': 'b'}}
+        user_state = UserState(MemoryStorage(dictionary), per_property=True)
+        property_a = user_state.create_property("property-a")
+        property_b = user_state.create_property("property-b")
+        context = TestUtilities.create_empty_context()
+
+        self.assertEqual('a', await property_a.get(context))
+        await property_b.delete(context)
+        await user_state.save_changes(context)
+
+        self.assertEqual(["EmptyContext/users/empty@empty.context.org/properties/property-a"], list(dictionary))
+
+        await user_state.clear_state(context)
+        await user_state.save_changes(context)
+        self.assertEqual({}, dictionary)
+
+    async def test_per_property_should_read_properties_created_after_load(self):
+        dictionary = {"EmptyContext/users/empty@empty.context.org/properties/property-a": {'value': 'a'},
+                      "EmptyContext/users/empty@empty.context.org/properties/property-b": {'value': 'b'}}
+        user_state = UserState(MemoryStorage(dictionary), per_property=True)
+        property_a = user_state.create_property("property-a")
+        context = TestUtilities.create_empty_context()
+
+        self.assertEqual('a', await property_a.get(context))
+        property_b = user_state.create_property("property-b")
+        self.assertEqual('b', await property_b.get(context, lambda: 'default'))
+        await user_state.save_changes(context)
+
+        self.assertEqual({'value': 'b'}, dictionary["EmptyContext/users/empty@empty.context.org/properties/property-b"])
+
+    async def test_per_property_should_reject_properties_not_created(self):
+        user_state = UserState(MemoryStorage(), per_property=True)
+        property_a = user_state.create_property("property-a")
+        context = TestUtilities.create_empty_context()
+
+        await property_a.set(context, 'a')
+        user_state.get(context)['property-b'] = 'b'
+        with self.assertRaises(ValueError):
+            await user_state.save_changes(context)
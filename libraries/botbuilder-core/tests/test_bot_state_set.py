@@ -0,0 +1,105 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+import aiounittest
+from unittest.mock import MagicMock
+
+from botbuilder.core import BotState, BotStateSet, ConversationState, MemoryStorage, UserState
+
+from test_utilities import TestUtilities
+
+USER_KEY = "EmptyContext/users/empty@empty.context.org"
+CONVERSATION_KEY = "EmptyContext/conversations/test"
+
+
+class PrivateState(BotState):
+    def __init__(self, storage):
+        super(PrivateState, self).__init__(storage, 'PrivateState')
+
+    def get_storage_key(self, context):
+        return 'private'
+
+
+def create_storage(dictionary: dict) -> MemoryStorage:
+    storage = MemoryStorage(dictionary)
+    storage.read = MagicMock(side_effect=storage.read)
+    storage.write = MagicMock(side_effect=storage.write)
+    return storage
+
+
+class TestBotStateSet(aiounittest.AsyncTestCase):
+    def test_add_should_reject_non_bot_state(self):
+        with self.assertRaises(TypeError) as _:
+            BotStateSet(MemoryStorage())
+
+    async def test_load_all_should_read_once_per_storage(self):
+        storage = create_storage({USER_KEY: {'name': 'user'}, CONVERSATION_KEY: {'count': 1}})
+        user_state = UserState(storage)
+        conversation_state = ConversationState(storage)
+        context = TestUtilities.create_empty_context()
+
+        await BotStateSet(user_state, conversation_state).load_all(context)
+
+        self.assertEqual(storage.read.call_count, 1)
+        self.assertCountEqual([USER_KEY, CONVERSATION_KEY], storage.read.call_args[0][0])
+        self.assertEqual('user', await user_state.create_property('name').get(context))
+        self.assertEqual(1, await conversation_state.create_property('count').get(context))
+        self.assertEqual(storage.read.call_count, 1)
+
+    async def test_load_all_should_skip_loaded_scopes(self):
+        storage = create_storage({})
+        user_state = UserState(storage)
+        context = TestUtilities.create_empty_context()
+
+        await user_state.load(context)
+        await BotStateSet(user_state).load_all(context)
+        self.assertEqual(storage.read.call_count, 1)
+
+        await BotStateSet(user_state).load_all(context, True)
+        self.assertEqual(storage.read.call_count, 2)
+
+    async def test_save_all_changes_should_write_changed_scopes_once_per_storage(self):
+        dictionary = {}
+        storage = create_storage(dictionary)
+        other_storage = create_storage({})
+        user_state = UserState(storage)
+        conversation_state = ConversationState(storage)
+        unchanged_state = PrivateState(other_storage)
+        bot_state_set = BotStateSet(user_state, conversation_state, unchanged_state)
+        context = TestUtilities.create_empty_context()
+
+        await bot_state_set.load_all(context)
+        await user_state.create_property('name').set(context, 'user')
+        await conversation_state.create_property('count').set(context, 1)
+        await bot_state_set.save_all_changes(context)
+
+        self.assertEqual(storage.write.call_count, 1)
+        self.assertEqual(other_storage.write.call_count, 0)
+        self.assertEqual({'name': 'user'}, dictionary[USER_KEY])
+        self.assertEqual({'count': 1}, dictionary[CONVERSATION_KEY])
+
+        await bot_state_set.save_all_changes(context)
+        self.assertEqual(storage.write.call_count, 1)
+
+    async def test_should_batch_per_property_scopes(self):
+        dictionary = {CONVERSATION_KEY: {'count': 1}, USER_KEY + '/properties/name': {'value': 'user'}}
+        storage = create_storage(dictionary)
+        user_state = UserState(storage, per_property=True)
+        conversation_state = ConversationState(storage)
+        name_property = user_state.create_property('name')
+        user_state.create_property('age')
+        bot_state_set = BotStateSet(user_state, conversation_state)
+        context = TestUtilities.create_empty_context()
+
+        await bot_state_set.load_all(context)
+        self.assertEqual(storage.read.call_count, 1)
+        self.assertEqual(3, len(storage.read.call_args[0][0]))
+        self.assertEqual('user', await name_property.get(context))
+
+        await name_property.set(context, 'changed')
+        await conversation_state.create_property('count').set(context, 2)
+        await bot_state_set.save_all_changes(context)
+
+        self.assertEqual(storage.write.call_count, 1)
+        self.assertEqual({'value': 'changed'}, dictionary[USER_KEY + '/properties/name'])
+        self.assertEqual({'count': 2}, dictionary[CONVERSATION_KEY])
+        self.assertNotIn(USER_KEY + '/properties/age', dictionary)
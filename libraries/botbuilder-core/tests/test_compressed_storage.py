@@ -0,0 +1,128 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import base64
+import datetime
+
+import aiounittest
+
+from botbuilder.schema import Activity
+from botbuilder.core import CompressedStorage, ConversationState, MemoryStorage, StoreItem
+from botbuilder.core.compressed_storage import COMPRESSED_KEY
+
+from test_utilities import TestUtilities
+
+LARGE_STATE = {'history': [{'text': 'message %s' % index, 'from': 'user'} for index in range(500)]}
+
+
+class PromptOptionsStub(object):
+    def __init__(self, prompt: str):
+        self.prompt = prompt
+
+
+class SimpleStoreItem(StoreItem):
+    def __init__(self, counter=1, e_tag='*'):
+        super(SimpleStoreItem, self).__init__()
+        self.counter = counter
+        self.e_tag = e_tag
+
+
+class TestCompressedStorage(aiounittest.AsyncTestCase):
+    def test_should_reject_unknown_codec(self):
+        with self.assertRaises(ValueError) as _:
+            CompressedStorage(MemoryStorage(), codec='brotli')
+
+    async def test_should_compress_large_items(self):
+        records = []
+        inner = MemoryStorage()
+        storage = CompressedStorage(inner, on_item=records.append)
+
+        await storage.write({'large': dict(LARGE_STATE, eTag='*'), 'small': {'count': 1}})
+
+        self.assertEqual({'count': 1}, inner.memory['small'])
+        self.assertEqual({COMPRESSED_KEY, 'eTag'}, set(inner.memory['large']))
+        self.assertEqual(1, storage.stats.items_compressed)
+        self.assertLess(storage.stats.ratio, 0.5)
+        self.assertEqual(('large', 'compress', 'zlib'), (records[0].key, records[0].operation, records[0].codec))
+
+        items = await storage.read(['large', 'small', 'missing'])
+        self.assertEqual(dict(LARGE_STATE, eTag='*'), items['large'])
+        self.assertEqual({'count': 1}, items['small'])
+        self.assertEqual(1, storage.stats.items_decompressed)
+
+    async def test_should_read_items_written_with_another_codec_or_uncompressed(self):
+        inner = MemoryStorage({'plain': dict(LARGE_STATE)})
+        await CompressedStorage(inner, codec='lzma').write({'lzma': LARGE_STATE})
+
+        items = await CompressedStorage(inner, codec='zlib').read(['plain', 'lzma'])
+
+        self.assertEqual(LARGE_STATE, items['plain'])
+        self.assertEqual(LARGE_STATE, items['lzma'])
+
+    async def test_should_compress_items_holding_models(self):
+        inner = MemoryStorage()
+        storage = CompressedStorage(inner, threshold=0)
+        model_state = {'when': datetime.datetime(2019, 4, 1), 'history': LARGE_STATE['history'],
+                       'dialogStack': [{'id': 'prompt', 'state': {'options': Activity(type='message', text='hi')}}]}
+
+        await storage.write({'models': model_state})
+
+        self.assertEqual(3, base64.b85decode(inner.memory['models'][COMPRESSED_KEY])[5])
+        self.assertEqual(model_state, (await storage.read(['models']))['models'])
+
+    async def test_should_store_items_holding_objects_as_is_unless_pickle_is_allowed(self):
+        inner = MemoryStorage()
+        object_state = {'options': PromptOptionsStub('hi'), 'history': LARGE_STATE['history']}
+
+        await CompressedStorage(inner, threshold=0).write({'objects': object_state})
+        self.assertNotIn(COMPRESSED_KEY, inner.memory['objects'])
+
+        storage = CompressedStorage(inner, threshold=0, allow_pickle=True)
+        await storage.write({'objects': object_state, 'lambda': {'value': lambda: None}})
+        self.assertEqual((1, 1), (storage.stats.items_compressed, storage.stats.items_uncompressed))
+        self.assertEqual(2, base64.b85decode(inner.memory['objects'][COMPRESSED_KEY])[5])
+        self.assertEqual('hi', (await storage.read(['objects']))['objects']['options'].prompt)
+
+        with self.assertRaises(ValueError) as _:
+            await CompressedStorage(inner).read(['objects'])
+
+    async def test_should_store_values_json_would_change_as_is(self):
+        inner = MemoryStorage()
+        storage = CompressedStorage(inner, threshold=0, min_saving=-10)
+        tuple_state = {'history': LARGE_STATE['history'], 'position': (1, 2)}
+
+        await storage.write({'tuple': tuple_state, 'int_keys': {1: 'one'}, 'item': SimpleStoreItem(counter=5)})
+
+        # The BinaryCodec keeps int keys.
+        self.assertEqual(3, base64.b85decode(inner.memory['int_keys'][COMPRESSED_KEY])[5])
+        self.assertEqual((1, 1), (storage.stats.items_compressed, storage.stats.items_uncompressed))
+        items = await storage.read(['tuple', 'int_keys', 'item'])
+        self.assertEqual((1, 2), items['tuple']['position'])
+        self.assertEqual({1: 'one'}, items['int_keys'])
+        self.assertIsInstance(items['item'], SimpleStoreItem)
+
+    async def test_should_keep_store_item_e_tags(self):
+        inner = MemoryStorage()
+        storage = CompressedStorage(inner, threshold=0, min_saving=-10)
+
+        await storage.write({'item': StoreItem(counter=5)})
+        item = (await storage.read(['item']))['item']
+        self.assertEqual((5, '0'), (item.counter, item.e_tag))
+
+        item.counter = 6
+        await storage.write({'item': item})
+        self.assertEqual('1', inner.memory['item'].e_tag)
+        self.assertEqual(6, (await storage.read(['item']))['item'].counter)
+
+    async def test_bot_state_should_save_through_compression(self):
+        inner = MemoryStorage()
+        conversation_state = ConversationState(CompressedStorage(inner))
+        history = conversation_state.create_property('history')
+
+        context = TestUtilities.create_empty_context()
+        await history.set(context, LARGE_STATE['history'])
+        await conversation_state.save_changes(context)
+
+        self.assertIn(COMPRESSED_KEY, inner.memory['EmptyContext/conversations/test'])
+        context = TestUtilities.create_empty_context()
+        self.assertEqual(LARGE_STATE['history'], await history.get(context))
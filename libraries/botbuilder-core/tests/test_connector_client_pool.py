@@ -0,0 +1,126 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import aiounittest
+from botframework.connector.aio import ConnectorClient
+from botframework.connector.auth import MicrosoftAppCredentials
+
+from botbuilder.core import BotFrameworkAdapter, BotFrameworkAdapterSettings, ConnectorClientPool
+
+
+class SimpleClient(object):
+    def __init__(self, service_url):
+        self.service_url = service_url
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectorClientPool(unittest.TestCase):
+    def test_should_reuse_client_for_same_service_url_and_credentials(self):
+        pool = ConnectorClientPool()
+        credentials = object()
+
+        first = pool.get('https://example.org', credentials, lambda: SimpleClient('https://example.org'))
+        second = pool.get('https://example.org', credentials, lambda: SimpleClient('https://example.org'))
+
+        assert first is second
+        assert pool.hits == 1
+        assert pool.misses == 1
+        assert len(pool) == 1
+
+    def test_should_create_separate_clients_per_service_url_and_credentials(self):
+        pool = ConnectorClientPool()
+        credentials = object()
+
+        first = pool.get('https://one.org', credentials, lambda: SimpleClient('https://one.org'))
+        second = pool.get('https://two.org', credentials, lambda: SimpleClient('https://two.org'))
+        third = pool.get('https://one.org', object(), lambda: SimpleClient('https://one.org'))
+
+        assert first is not second
+        assert first is not third
+        assert pool.misses == 3
+        assert len(pool) == 3
+
+    def test_should_evict_least_recently_used_client_when_full(self):
+        pool = ConnectorClientPool(max_size=2)
+        credentials = object()
+
+        first = pool.get('https://one.org', credentials, lambda: SimpleClient('https://one.org'))
+        pool.get('https://two.org', credentials, lambda: SimpleClient('https://two.org'))
+        pool.get('https://one.org', credentials, lambda: SimpleClient('https://one.org'))
+        pool.get('https://three.org', credentials, lambda: SimpleClient('https://three.org'))
+
+        assert len(pool) == 2
+        assert pool.evictions == 1
+        assert not first.closed
+        assert pool.get('https://one.org', credentials, lambda: SimpleClient('https://one.org')) is first
+
+    def test_should_evict_idle_clients_without_closing_them(self):
+        pool = ConnectorClientPool(idle_timeout=0.01)
+        credentials = object()
+
+        first = pool.get('https://example.org', credentials, lambda: SimpleClient('https://example.org'))
+        time.sleep(0.02)
+        second = pool.get('https://example.org', credentials, lambda: SimpleClient('https://example.org'))
+
+        assert first is not second
+        assert not first.closed
+        assert pool.evictions == 1
+
+    def test_clear_should_evict_all_clients_without_closing_them(self):
+        pool = ConnectorClientPool()
+        client = pool.get('https://example.org', object(), lambda: SimpleClient('https://example.org'))
+        pool.clear()
+
+        assert not client.closed
+        assert len(pool) == 0
+
+    def test_should_not_create_pool_without_capacity(self):
+        with self.assertRaises(ValueError):
+            ConnectorClientPool(max_size=0)
+
+    def test_adapter_should_reuse_connector_clients(self):
+        pool = ConnectorClientPool()
+        adapter = BotFrameworkAdapter(BotFrameworkAdapterSettings('', ''), connector_client_pool=pool)
+
+        first = adapter.create_connector_client('https://example.org')
+        second = adapter.create_connector_client('https://example.org')
+
+        assert first is second
+        assert pool.hits == 1
+
+
+class TestConnectorClientPoolAsyncClients(aiounittest.AsyncTestCase):
+    async def test_close_should_close_pooled_and_evicted_clients_in_use(self):
+        pool = ConnectorClientPool(max_size=1)
+        credentials = object()
+
+        in_use = pool.get('https://one.org', credentials, lambda: SimpleClient('https://one.org'))
+        pooled = pool.get('https://two.org', credentials, lambda: SimpleClient('https://two.org'))
+        assert not in_use.closed
+        await pool.close()
+
+        assert in_use.closed
+        assert pooled.closed
+        assert len(pool) == 0
+
+    async def test_close_should_close_aio_connector_clients(self):
+        pool = ConnectorClientPool(max_size=1)
+        credentials = MicrosoftAppCredentials('', '')
+
+        first = pool.get('https://one.org', credentials,
+                         lambda: ConnectorClient(credentials, base_url='https://one.org'))
+        session = first.config.pipeline._sender.driver.session
+        session.close = MagicMock(side_effect=session.close)
+        pool.get('https://two.org', credentials, lambda: ConnectorClient(credentials, base_url='https://two.org'))
+        await pool.close()
+
+        assert session.close.call_count == 1
+        assert pool.evictions == 2
+        assert len(pool) == 0
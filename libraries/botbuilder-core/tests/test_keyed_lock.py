@@ -0,0 +1,93 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import aiounittest
+
+from botbuilder.schema import Activity, ActivityTypes, ChannelAccount, ConversationAccount
+from botbuilder.core import BotFrameworkAdapter, BotFrameworkAdapterSettings, KeyedLock
+
+
+class AdapterUnderTest(BotFrameworkAdapter):
+    async def authenticate_request(self, request, auth_header):
+        pass
+
+
+def create_activity(conversation_id, text):
+    return Activity(type=ActivityTypes.message, text=text, channel_id='test',
+                    service_url='https://example.org',
+                    from_property=ChannelAccount(id='user'),
+                    recipient=ChannelAccount(id='bot'),
+                    conversation=ConversationAccount(id=conversation_id))
+
+
+class TestKeyedLock(aiounittest.AsyncTestCase):
+    async def test_should_serialize_holders_of_the_same_key(self):
+        locks = KeyedLock()
+        events = []
+
+        async def hold(key, name):
+            async with locks.lock(key):
+                events.append('%s start' % name)
+                await asyncio.sleep(0.01)
+                events.append('%s end' % name)
+
+        await asyncio.gather(hold('a', 'first'), hold('a', 'second'))
+
+        assert events == ['first start', 'first end', 'second start', 'second end']
+
+    async def test_should_run_different_keys_in_parallel(self):
+        locks = KeyedLock()
+        events = []
+
+        async def hold(key):
+            async with locks.lock(key):
+                events.append('%s start' % key)
+                await asyncio.sleep(0.01)
+                events.append('%s end' % key)
+
+        await asyncio.gather(hold('a'), hold('b'))
+
+        assert events[:2] == ['a start', 'b start']
+
+    async def test_should_drop_idle_entries(self):
+        locks = KeyedLock()
+
+        async with locks.lock('a'):
+            assert len(locks) == 1
+        assert len(locks) == 0
+
+        with self.assertRaises(ValueError):
+            async with locks.lock('b'):
+                raise ValueError()
+        assert len(locks) == 0
+
+    async def test_should_drop_entries_of_cancelled_waiters(self):
+        locks = KeyedLock()
+        await locks.acquire('a')
+
+        waiter = asyncio.ensure_future(locks.acquire('a'))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+        locks.release('a')
+        assert len(locks) == 0
+
+    async def test_adapter_should_serialize_turns_per_conversation(self):
+        adapter = AdapterUnderTest(BotFrameworkAdapterSettings('', ''), serialize_conversation_turns=True)
+        events = []
+
+        async def logic(context):
+            events.append('%s start' % context.activity.text)
+            await asyncio.sleep(0.01)
+            events.append('%s end' % context.activity.text)
+
+        await asyncio.gather(adapter.process_activity(create_activity('convo1', 'a1'), '', logic),
+                             adapter.process_activity(create_activity('convo1', 'a2'), '', logic),
+                             adapter.process_activity(create_activity('convo2', 'b1'), '', logic))
+
+        convo1 = [event for event in events if event.startswith('a')]
+        assert convo1 == ['a1 start', 'a1 end', 'a2 start', 'a2 end']
+        assert events.index('b1 start') < events.index('a1 end')
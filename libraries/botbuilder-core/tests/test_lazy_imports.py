@@ -0,0 +1,38 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import os
+import subprocess
+import sys
+
+import aiounittest
+
+import botbuilder.core
+
+
+def loaded_modules(statement: str) -> set:
+    script = 'import sys\n%s\nprint(" ".join(sys.modules))' % statement
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.check_output([sys.executable, '-c', script], env=env)
+    return set(output.decode('utf-8').split())
+
+
+class TestLazyImports(aiounittest.AsyncTestCase):
+    def test_import_should_not_load_members(self):
+        modules = loaded_modules('import botbuilder.core')
+
+        assert 'botbuilder.core.turn_context' not in modules
+        assert 'botbuilder.schema._models_py3' not in modules
+        assert 'msrest' not in modules
+
+    def test_adapter_import_should_not_load_auth_or_python2_models(self):
+        modules = loaded_modules('from botbuilder.core import BotFrameworkAdapter')
+
+        assert 'botbuilder.core.bot_framework_adapter' in modules
+        assert 'botframework.connector.auth' not in modules
+        assert 'botbuilder.schema._models' not in modules
+
+    def test_should_resolve_every_public_name(self):
+        for name in botbuilder.core.__all__:
+            assert getattr(botbuilder.core, name) is not None
+        assert set(botbuilder.core.__all__) <= set(dir(botbuilder.core))
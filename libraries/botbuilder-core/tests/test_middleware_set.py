@@ -276,3 +276,71 @@ class TestMiddlewareSet(aiounittest.AsyncTestCase):
             raise e
         else:
             raise AssertionError('MiddlewareSet.use(): should not have added an invalid middleware.')
+
+    async def test_use_should_add_every_middleware(self):
+        called = []
+
+        async def processor_one(context, logic):
+            called.append('one')
+            return await logic()
+
+        async def processor_two(context, logic):
+            called.append('two')
+            return await logic()
+
+        middleware_set = MiddlewareSet().use(AnonymousReceiveMiddleware(processor_one),
+                                             AnonymousReceiveMiddleware(processor_two))
+
+        await middleware_set.receive_activity(None)
+        assert called == ['one', 'two']
+
+        middleware_set.use(AnonymousReceiveMiddleware(processor_two), AnonymousReceiveMiddleware(processor_one))
+        called.clear()
+        await middleware_set.receive_activity(None)
+        assert called == ['one', 'two', 'two', 'one']
+
+    def test_use_should_not_add_any_middleware_when_one_is_invalid(self):
+        async def processor(context, logic):
+            return await logic()
+
+        middleware_set = MiddlewareSet()
+
+        with self.assertRaises(TypeError):
+            middleware_set.use(AnonymousReceiveMiddleware(processor), 2)
+        assert middleware_set._middleware == []
+
+    async def test_should_return_result_of_callback(self):
+        async def processor(context, logic):
+            return await logic()
+
+        middleware_set = MiddlewareSet().use(AnonymousReceiveMiddleware(processor))
+
+        async def runs_after_pipeline(context):
+            return 'result'
+
+        assert await middleware_set.receive_activity_with_status(None, runs_after_pipeline) == 'result'
+
+    async def test_should_run_nested_middleware_sets(self):
+        called = []
+
+        async def outer(context, logic):
+            called.append('outer')
+            return await logic()
+
+        async def inner(context, logic):
+            called.append('inner')
+            return await logic()
+
+        async def runs_after_pipeline(context):
+            called.append('callback')
+
+        inner_set = MiddlewareSet().use(AnonymousReceiveMiddleware(inner))
+        middleware_set = MiddlewareSet().use(AnonymousReceiveMiddleware(outer), inner_set)
+
+        await middleware_set.receive_activity_with_status(None, runs_after_pipeline)
+        assert called == ['outer', 'inner', 'callback']
+
+        inner_set.use(AnonymousReceiveMiddleware(inner))
+        called.clear()
+        await middleware_set.receive_activity_with_status(None, runs_after_pipeline)
+        assert called == ['outer', 'inner', 'inner', 'callback']
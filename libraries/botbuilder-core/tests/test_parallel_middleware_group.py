@@ -0,0 +1,87 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import aiounittest
+
+from botbuilder.core import (AnonymousReceiveMiddleware, MiddlewareSet, ParallelMiddlewareError,
+                             ParallelMiddlewareGroup)
+
+
+def create_middleware(name, events, delay=0.0, call_next=True, error=None):
+    async def processor(context, logic):
+        events.append('%s before' % name)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        if not call_next:
+            return None
+        result = await logic()
+        events.append('%s after' % name)
+        return result
+    return AnonymousReceiveMiddleware(processor)
+
+
+class TestParallelMiddlewareGroup(aiounittest.AsyncTestCase):
+    async def test_should_run_members_concurrently(self):
+        events = []
+        group = ParallelMiddlewareGroup(create_middleware('slow', events, delay=0.02),
+                                        create_middleware('fast', events))
+        middleware_set = MiddlewareSet().use(group)
+
+        async def logic(context):
+            events.append('logic')
+            return 'result'
+
+        assert await middleware_set.receive_activity_with_status(None, logic) == 'result'
+        assert events[:2] == ['slow before', 'fast before']
+        assert events[2] == 'logic'
+        assert sorted(events[3:]) == ['fast after', 'slow after']
+
+    async def test_should_skip_pipeline_when_member_does_not_call_next(self):
+        events = []
+        group = ParallelMiddlewareGroup(create_middleware('first', events),
+                                        create_middleware('second', events, call_next=False))
+
+        async def logic(context):
+            events.append('logic')
+
+        await MiddlewareSet().use(group).receive_activity_with_status(None, logic)
+        assert 'logic' not in events
+        assert 'first after' in events
+
+    async def test_should_raise_single_error_as_is(self):
+        events = []
+        group = ParallelMiddlewareGroup(create_middleware('first', events),
+                                        create_middleware('second', events, error=ValueError('failed')))
+
+        async def logic(context):
+            events.append('logic')
+
+        with self.assertRaises(ValueError):
+            await MiddlewareSet().use(group).receive_activity_with_status(None, logic)
+        assert 'logic' not in events
+
+    async def test_should_aggregate_errors(self):
+        events = []
+        group = ParallelMiddlewareGroup(create_middleware('first', events, error=ValueError('first')),
+                                        create_middleware('second', events, error=KeyError('second')))
+
+        with self.assertRaises(ParallelMiddlewareError) as context:
+            await MiddlewareSet().use(group).receive_activity(None)
+        assert [type(error) for error in context.exception.errors] == [ValueError, KeyError]
+
+    async def test_should_propagate_pipeline_error_once(self):
+        events = []
+        group = ParallelMiddlewareGroup(create_middleware('first', events),
+                                        create_middleware('second', events))
+
+        async def logic(context):
+            raise ValueError('failed turn')
+
+        with self.assertRaises(ValueError):
+            await MiddlewareSet().use(group).receive_activity_with_status(None, logic)
+
+    def test_invalid_middleware_should_be_rejected(self):
+        with self.assertRaises(TypeError):
+            ParallelMiddlewareGroup(2)
@@ -0,0 +1,105 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import aiounittest
+
+from botbuilder.core import RateLimiter, TokenBucket
+
+SERVICE_URL = 'https://example.org'
+
+
+class ResponseStub(object):
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class HttpErrorStub(Exception):
+    def __init__(self, response):
+        super(HttpErrorStub, self).__init__('HTTP %s' % response.status_code)
+        self.response = response
+
+
+class TestRateLimiter(aiounittest.AsyncTestCase):
+    def test_token_bucket_should_allow_bursts_up_to_capacity(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert 0.09 < bucket.reserve() <= 0.1
+
+    def test_token_bucket_should_not_accept_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+    async def test_should_queue_sends_over_the_conversation_limit(self):
+        limiter = RateLimiter(conversation_rate=20, conversation_capacity=1)
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+
+        await asyncio.gather(*[limiter.acquire(SERVICE_URL, 'convo1') for _ in range(3)],
+                             limiter.acquire(SERVICE_URL, 'convo2'))
+
+        assert loop.time() - start >= 0.09
+        assert limiter.queue_depth == 0
+        assert limiter.throttled_time > 0
+
+    async def test_should_report_queue_depth_while_waiting(self):
+        limiter = RateLimiter(conversation_rate=20, conversation_capacity=1)
+        await limiter.acquire(SERVICE_URL, 'convo1')
+
+        waiter = asyncio.ensure_future(limiter.acquire(SERVICE_URL, 'convo1'))
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+        await waiter
+        assert limiter.queue_depth == 0
+
+    async def test_should_retry_after_429_honoring_retry_after(self):
+        limiter = RateLimiter(conversation_rate=100, conversation_capacity=10)
+        attempts = []
+
+        async def send():
+            attempts.append(asyncio.get_event_loop().time())
+            if len(attempts) == 1:
+                raise HttpErrorStub(ResponseStub(429, {'Retry-After': '0.1'}))
+            return 'sent'
+
+        result = await limiter.send(SERVICE_URL, 'convo1', send)
+
+        assert result == 'sent'
+        assert len(attempts) == 2
+        assert attempts[1] - attempts[0] >= 0.09
+        assert limiter.throttled_count == 1
+
+    async def test_should_raise_after_max_retries(self):
+        limiter = RateLimiter(max_retries=1, default_retry_after=0)
+        attempts = 0
+
+        async def send():
+            nonlocal attempts
+            attempts += 1
+            raise HttpErrorStub(ResponseStub(429))
+
+        with self.assertRaises(HttpErrorStub):
+            await limiter.send(SERVICE_URL, 'convo1', send)
+        assert attempts == 2
+
+    async def test_should_not_retry_other_errors(self):
+        limiter = RateLimiter()
+        attempts = 0
+
+        async def send():
+            nonlocal attempts
+            attempts += 1
+            raise HttpErrorStub(ResponseStub(500))
+
+        with self.assertRaises(HttpErrorStub):
+            await limiter.send(SERVICE_URL, 'convo1', send)
+        assert attempts == 1
+
+    def test_get_retry_after_should_parse_seconds_and_dates(self):
+        assert RateLimiter.get_retry_after(ResponseStub(429, {'Retry-After': '3'})) == 3
+        assert RateLimiter.get_retry_after(ResponseStub(429, {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'})) == 0
+        assert RateLimiter.get_retry_after(ResponseStub(429, {'Retry-After': 'soon'})) is None
+        assert RateLimiter.get_retry_after(ResponseStub(429)) is None
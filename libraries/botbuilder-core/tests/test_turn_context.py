@@ -39,6 +39,16 @@ class SimpleAdapter(BotAdapter):
         assert reference.activity_id == '1234'
 
 
+class CountingAdapter(SimpleAdapter):
+    def __init__(self):
+        super(CountingAdapter, self).__init__()
+        self.batches = []
+
+    async def send_activities(self, context, activities):
+        self.batches.append(activities)
+        return await super(CountingAdapter, self).send_activities(context, activities)
+
+
 class TestBotContext(aiounittest.AsyncTestCase):
     def test_should_create_context_with_request_and_adapter(self):
         context = TurnContext(SimpleAdapter(), ACTIVITY)
@@ -208,6 +218,101 @@ class TestBotContext(aiounittest.AsyncTestCase):
         await context.update_activity(ACTIVITY)
         assert called is True
 
+    async def test_should_buffer_activities_until_flush(self):
+        adapter = CountingAdapter()
+        context = TurnContext(adapter, ACTIVITY)
+        context.buffer_activities = True
+        handler_calls = 0
+
+        async def send_handler(context, activities, next_handler_coroutine):
+            nonlocal handler_calls
+            handler_calls += 1
+            assert len(activities) == 3
+            await next_handler_coroutine()
+
+        context.on_send_activities(send_handler)
+        await context.send_activity('one')
+        await context.send_activity('two', 'three')
+        assert adapter.batches == []
+        assert context.responded
+
+        responses = await context.flush()
+        assert len(responses) == 3
+        assert [[a.text for a in batch] for batch in adapter.batches] == [['one', 'two', 'three']]
+        assert handler_calls == 1
+        assert context.responded
+        assert await context.flush() == []
+
+    async def test_buffered_activities_should_count_as_a_response(self):
+        context = TurnContext(CountingAdapter(), ACTIVITY)
+        context.buffer_activities = True
+        assert not context.responded
+
+        await context.send_activity('one')
+        new_context = TurnContext(context)
+        assert context.responded and new_context.responded
+
+    async def test_adapter_should_flush_buffered_activities_at_end_of_turn(self):
+        adapter = CountingAdapter()
+        adapter.buffer_activities = True
+
+        async def logic(context):
+            await context.send_activity('one')
+            await context.send_activity('two')
+            assert adapter.batches == []
+
+        await adapter.run_middleware(TurnContext(adapter, ACTIVITY), logic)
+        assert len(adapter.batches) == 1
+
+    async def test_should_call_multiple_on_send_activities_handlers_in_order(self):
+        context = TurnContext(SimpleAdapter(), ACTIVITY)
+        called = []
+
+        async def first_send_handler(context, activities, next_handler_coroutine):
+            called.append('first')
+            # Handlers registered while sending only apply to later sends.
+            context.on_send_activities(first_send_handler)
+            await next_handler_coroutine()
+            called.append('first done')
+
+        async def second_send_handler(context, activities, next_handler_coroutine):
+            called.append('second')
+            await next_handler_coroutine()
+
+        context.on_send_activities(first_send_handler)
+        context.on_send_activities(second_send_handler)
+        await context.send_activity('test')
+        assert called == ['first', 'second', 'first done']
+
+    async def test_should_address_replies_from_the_current_activity(self):
+        context = TurnContext(SimpleAdapter(), ACTIVITY)
+        sent = []
+
+        async def send_handler(context, activities, next_handler_coroutine):
+            sent.extend(activities)
+            await next_handler_coroutine()
+
+        context.on_send_activities(send_handler)
+        await context.send_activity('one')
+        sent[0].conversation.id = 'changed'
+        await context.send_activity('two')
+        assert sent[1].conversation.id == 'convo'
+        assert sent[0].conversation is not sent[1].conversation
+        assert sent[0].recipient is not sent[1].recipient
+        assert ACTIVITY.conversation.id == 'convo'
+        assert sent[1].recipient.id == 'user'
+
+        context.activity = Activity(type='message', conversation=ConversationAccount(id='other'),
+                                    from_property=ChannelAccount(id='user'), recipient=ChannelAccount(id='bot'))
+        await context.send_activity('three')
+        assert sent[2].conversation.id == 'other'
+
+        context.activity.service_url = 'https://example.org/changed'
+        context.activity.conversation = ConversationAccount(id='changed')
+        await context.send_activity('four', 'five')
+        assert [(activity.service_url, activity.conversation.id) for activity in sent[3:]] == \
+            [('https://example.org/changed', 'changed')] * 2
+
     def test_get_conversation_reference_should_return_valid_reference(self):
         reference = TurnContext.get_conversation_reference(ACTIVITY)
 
@@ -0,0 +1,159 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+
+import aiounittest
+
+from botbuilder.schema import Activity, ActivityTypes, ChannelAccount, ConversationAccount
+from botbuilder.core import (AnonymousReceiveMiddleware, BotFrameworkAdapter, BotFrameworkAdapterSettings,
+                             ConversationState, MemoryStorage, NullTelemetryClient, TelemetryTurnTimingHandler,
+                             TurnContext, TurnPhases, TurnTimingHistogram, TurnTimingRecord)
+from botbuilder.core.adapters import TestAdapter
+
+
+class AdapterUnderTest(BotFrameworkAdapter):
+    async def authenticate_request(self, request, auth_header):
+        pass
+
+
+class TelemetryClientUnderTest(NullTelemetryClient):
+    def __init__(self):
+        self.metrics = []
+
+    def track_metric(self, name, value, type=None, count=None, min=None, max=None, std_dev=None,
+                     properties=None):
+        self.metrics.append((name, value, properties))
+
+
+def create_activity():
+    return Activity(id='1234', type=ActivityTypes.message, text='hi', channel_id='test',
+                    service_url='https://example.org',
+                    from_property=ChannelAccount(id='user'),
+                    recipient=ChannelAccount(id='bot'),
+                    conversation=ConversationAccount(id='convo1'))
+
+
+class TestTurnTiming(aiounittest.AsyncTestCase):
+    async def test_should_record_phases_of_a_turn(self):
+        adapter = AdapterUnderTest(BotFrameworkAdapterSettings('', ''))
+        records = []
+        adapter.on_turn_timing(records.append)
+        state = ConversationState(MemoryStorage())
+
+        async def logic(context):
+            await state.load(context)
+            await state.save_changes(context, True)
+
+        await adapter.process_activity(create_activity(), '', logic)
+
+        assert len(records) == 1
+        record = records[0]
+        assert record.channel_id == 'test'
+        assert record.activity_type == ActivityTypes.message
+        for phase in [TurnPhases.parse_request, TurnPhases.authenticate_request, TurnPhases.middleware,
+                      TurnPhases.bot_logic, TurnPhases.state_load, TurnPhases.state_save]:
+            assert phase in record.phases
+        assert record.duration >= record.phases[TurnPhases.bot_logic]
+
+    async def test_should_record_send_activities(self):
+        adapter = TestAdapter()
+        records = []
+        adapter.on_turn_timing(records.append)
+
+        async def logic(context: TurnContext):
+            await context.send_activity('one')
+            await context.send_activity('two')
+
+        context = TurnContext(adapter, create_activity())
+        await adapter.run_middleware(context, logic)
+
+        assert TurnPhases.send_activities in records[-1].phases
+
+    async def test_should_record_failed_turns(self):
+        adapter = AdapterUnderTest(BotFrameworkAdapterSettings('', ''))
+        records = []
+        adapter.on_turn_timing(records.append)
+
+        async def logic(context):
+            raise ValueError('failed turn')
+
+        with self.assertRaises(ValueError):
+            await adapter.process_activity(create_activity(), '', logic)
+
+        assert len(records) == 1
+        assert records[0].end is not None
+
+    async def test_should_not_count_state_io_of_middleware_as_middleware(self):
+        adapter = TestAdapter()
+        records = []
+        adapter.on_turn_timing(records.append)
+
+        async def save_state(context, next_handler):
+            await next_handler()
+            with context.turn_timing.phase(TurnPhases.state_save):
+                await asyncio.sleep(0.05)
+
+        async def logic(context):
+            with context.turn_timing.phase(TurnPhases.state_load):
+                await asyncio.sleep(0.05)
+
+        adapter.use(AnonymousReceiveMiddleware(save_state))
+        await adapter.run_middleware(TurnContext(adapter, create_activity()), logic)
+
+        phases = records[0].phases
+        assert phases[TurnPhases.state_save] >= 0.05 and phases[TurnPhases.state_load] >= 0.05
+        assert phases[TurnPhases.bot_logic] >= 0.05
+        assert phases[TurnPhases.middleware] < 0.05
+
+    async def test_should_report_to_every_handler_and_keep_the_turn_error(self):
+        adapter = AdapterUnderTest(BotFrameworkAdapterSettings('', ''))
+        records = []
+
+        def failing_handler(record):
+            raise RuntimeError('failed handler')
+
+        adapter.on_turn_timing(failing_handler).on_turn_timing(records.append)
+
+        async def logic(context):
+            raise ValueError('failed turn')
+
+        with self.assertLogs('botbuilder.core.bot_adapter', 'ERROR'), self.assertRaises(ValueError):
+            await adapter.process_activity(create_activity(), '', logic)
+
+        assert len(records) == 1
+
+    async def test_should_not_record_without_handlers(self):
+        adapter = AdapterUnderTest(BotFrameworkAdapterSettings('', ''))
+        contexts = []
+
+        async def logic(context):
+            contexts.append(context)
+
+        await adapter.process_activity(create_activity(), '', logic)
+
+        assert contexts[0].turn_timing is None
+
+    def test_telemetry_handler_should_track_metrics(self):
+        telemetry_client = TelemetryClientUnderTest()
+        record = TurnTimingRecord('test', ActivityTypes.message)
+        record.add(TurnPhases.bot_logic, 0.5)
+        record.finish()
+
+        TelemetryTurnTimingHandler(telemetry_client)(record)
+
+        metrics = {name: value for (name, value, _) in telemetry_client.metrics}
+        assert metrics['botbuilder.turn.bot_logic'] == 500
+        assert 'botbuilder.turn.turn' in metrics
+        assert telemetry_client.metrics[0][2] == {'channelId': 'test', 'activityType': ActivityTypes.message}
+
+    def test_histogram_should_bucket_metrics(self):
+        histogram = TurnTimingHistogram(bounds=[10, 100])
+        for seconds in [0.005, 0.05, 0.5, 0.01]:
+            record = TurnTimingRecord()
+            record.add(TurnPhases.bot_logic, seconds)
+            record.finish()
+            histogram(record)
+
+        assert histogram.counts[TurnPhases.bot_logic] == [2, 1, 1]
+        assert round(histogram.sums[TurnPhases.bot_logic]) == 565
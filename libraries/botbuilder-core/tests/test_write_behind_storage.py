@@ -0,0 +1,165 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+from unittest.mock import MagicMock
+
+import aiounittest
+
+from botbuilder.core import (CREATE_ONLY_E_TAG, ConversationState, MemoryStorage, StoreItem, WriteBehindFlushError,
+                             WriteBehindStorage)
+
+from test_utilities import TestUtilities
+
+
+class SimpleStoreItem(StoreItem):
+    def __init__(self, counter=1, e_tag='*'):
+        super(SimpleStoreItem, self).__init__()
+        self.counter = counter
+        self.e_tag = e_tag
+
+
+def create_storage(dictionary: dict = None) -> MemoryStorage:
+    storage = MemoryStorage(dictionary)
+    storage.read = MagicMock(side_effect=storage.read)
+    storage.write = MagicMock(side_effect=storage.write)
+    return storage
+
+
+class TestWriteBehindStorage(aiounittest.AsyncTestCase):
+    def test_should_reject_invalid_limits(self):
+        with self.assertRaises(ValueError) as _:
+            WriteBehindStorage(MemoryStorage(), max_batch=0)
+
+    async def test_should_coalesce_writes_to_the_same_key(self):
+        inner = create_storage()
+        storage = WriteBehindStorage(inner, flush_delay=60)
+
+        for counter in range(1, 4):
+            await storage.write({'key': {'counter': counter}})
+        self.assertEqual(inner.write.call_count, 0)
+        self.assertEqual({'counter': 3}, (await storage.read(['key']))['key'])
+        self.assertEqual(inner.read.call_count, 0)
+
+        await storage.close()
+        self.assertEqual(inner.write.call_count, 1)
+        self.assertEqual({'counter': 3}, inner.memory['key'])
+        self.assertEqual((3, 1), (storage.writes_received, storage.items_flushed))
+
+    async def test_should_flush_after_delay(self):
+        inner = create_storage()
+        storage = WriteBehindStorage(inner, flush_delay=0.01)
+
+        await storage.write({'a': {'counter': 1}, 'b': {'counter': 2}})
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(storage.pending, 0)
+        self.assertEqual(inner.write.call_count, 2)
+        self.assertEqual({'counter': 2}, inner.memory['b'])
+
+    async def test_should_flush_when_max_pending_is_reached(self):
+        inner = create_storage()
+        storage = WriteBehindStorage(inner, flush_delay=60, max_pending=5, max_batch=2)
+
+        await storage.write({str(key): {'counter': key} for key in range(4)})
+        self.assertEqual(inner.write.call_count, 0)
+        await storage.write({'4': {'counter': 4}})
+
+        self.assertEqual(inner.write.call_count, 5)
+        self.assertEqual(5, len(inner.memory))
+        await storage.close()
+
+    async def test_should_detect_e_tag_conflicts(self):
+        storage = WriteBehindStorage(MemoryStorage({'key': SimpleStoreItem(e_tag='1')}), flush_delay=60)
+
+        first = (await storage.read(['key']))['key']
+        second = (await storage.read(['key']))['key']
+        first.counter = 2
+        await storage.write({'key': first})
+        with self.assertRaises(KeyError) as _:
+            await storage.write({'key': second})
+        await storage.close()
+
+    async def test_create_only_should_conflict_with_existing_or_pending_keys(self):
+        inner = create_storage({'existing': StoreItem(e_tag='1')})
+        storage = WriteBehindStorage(inner, flush_delay=60)
+
+        await storage.write({'new': StoreItem(e_tag=CREATE_ONLY_E_TAG)})
+        for key in ['new', 'existing']:
+            with self.assertRaises(KeyError) as _:
+                await storage.write({key: StoreItem(e_tag=CREATE_ONLY_E_TAG)})
+
+        # Created in the wrapped storage by another instance before the flush.
+        await inner.write({'new': StoreItem()})
+        with self.assertRaises(WriteBehindFlushError) as context:
+            await storage.close()
+        self.assertEqual(['new'], list(context.exception.errors))
+
+    async def test_should_write_with_the_e_tag_read_and_then_last_writer_wins(self):
+        inner = MemoryStorage()
+        await inner.write({'key': SimpleStoreItem()})
+        storage = WriteBehindStorage(inner, flush_delay=60)
+        write = inner.write
+        written_e_tags = []
+
+        async def record_e_tag_and_write(changes):
+            written_e_tags.append(changes['key'].e_tag)
+            await write(changes)
+        inner.write = record_e_tag_and_write
+
+        for counter in range(2, 5):
+            item = (await storage.read(['key']))['key']
+            item.counter = counter
+            await storage.write({'key': item})
+            await storage.flush()
+
+        self.assertEqual(['0', '*', '*'], written_e_tags)
+        self.assertEqual(4, inner.memory['key'].counter)
+        await storage.close()
+
+    async def test_failed_key_should_not_block_other_keys(self):
+        inner = create_storage()
+        write = inner.write
+
+        async def reject_bad_key(changes):
+            if 'bad' in changes:
+                raise KeyError('Etag conflict.')
+            await write(changes)
+        inner.write = reject_bad_key
+        storage = WriteBehindStorage(inner, flush_delay=60, max_batch=1)
+
+        await storage.write({'bad': {'counter': 1}, 'good': {'counter': 2}})
+        with self.assertRaises(WriteBehindFlushError) as context:
+            await storage.close()
+
+        self.assertEqual(['bad'], list(context.exception.errors))
+        self.assertEqual({'counter': 2}, inner.memory['good'])
+        self.assertEqual(storage.pending, 1)
+
+    async def test_delete_should_drop_pending_changes(self):
+        inner = create_storage({'key': {'counter': 1}})
+        storage = WriteBehindStorage(inner, flush_delay=60)
+
+        await storage.write({'key': {'counter': 2}})
+        await storage.delete(['key'])
+        await storage.close()
+
+        self.assertEqual(storage.pending, 0)
+        self.assertEqual(inner.write.call_count, 0)
+        self.assertEqual({}, await storage.read(['key']))
+
+    async def test_bot_state_should_save_through_write_behind(self):
+        inner = create_storage()
+        storage = WriteBehindStorage(inner, flush_delay=60)
+        conversation_state = ConversationState(storage)
+        count = conversation_state.create_property('count')
+
+        for turn in range(1, 4):
+            context = TestUtilities.create_empty_context()
+            await count.set(context, turn)
+            await conversation_state.save_changes(context)
+        await storage.close()
+
+        self.assertEqual(inner.read.call_count, 1)
+        self.assertEqual(inner.write.call_count, 1)
+        self.assertEqual({'count': 3}, inner.memory['EmptyContext/conversations/test'])
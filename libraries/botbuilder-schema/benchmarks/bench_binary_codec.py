@@ -0,0 +1,73 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures the size of an encoded message activity, and the time to encode and decode it, with msrest and JSON,
+with the JSON codec and with the binary codec.
+
+Usage: python benchmarks/bench_binary_codec.py [--iterations 5000] [--repeat 5]
+"""
+
+import argparse
+import json
+import timeit
+
+from botbuilder.schema import Activity
+from botbuilder.schema.binary_codec import BinaryCodec, msgpack
+from botbuilder.schema.json_codec import JsonCodec, orjson
+
+ACTIVITY = {
+    'type': 'message',
+    'id': '1234',
+    'timestamp': '2019-04-01T10:20:30.123Z',
+    'localTimestamp': '2019-04-01T12:20:30.123+02:00',
+    'serviceUrl': 'https://smba.trafficmanager.net/amer/',
+    'channelId': 'msteams',
+    'from': {'id': 'user', 'name': 'User', 'aadObjectId': 'aad'},
+    'conversation': {'id': 'convo', 'conversationType': 'personal', 'tenantId': 'tenant'},
+    'recipient': {'id': 'bot', 'name': 'Bot'},
+    'textFormat': 'plain',
+    'locale': 'en-US',
+    'text': 'hello bot',
+    'attachments': [{'contentType': 'text/html', 'content': '<div>hello bot</div>'}],
+    'entities': [{'type': 'clientInfo', 'locale': 'en-US', 'country': 'US', 'platform': 'Web'}],
+    'channelData': {'tenant': {'id': 'tenant'}},
+}
+
+
+class MsrestJson:
+    @staticmethod
+    def encode(model):
+        return json.dumps(model.serialize()).encode('utf-8')
+
+    @staticmethod
+    def decode(model_type, data):
+        return model_type.deserialize(json.loads(data))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5, help='the best of this many runs is reported')
+    args = parser.parse_args()
+
+    activity = Activity.deserialize(ACTIVITY)
+    codecs = [('msrest + json', MsrestJson()), ('JsonCodec(json)', JsonCodec('json'))]
+    if orjson is not None:
+        codecs.append(('JsonCodec(orjson)', JsonCodec('orjson')))
+    codecs.append(('BinaryCodec(python)', BinaryCodec(backend='python')))
+    if msgpack is not None:
+        codecs.append(('BinaryCodec(msgpack)', BinaryCodec(backend='msgpack')))
+
+    for (name, codec) in codecs:
+        data = codec.encode(activity)
+        # JSON drops additional properties, e.g. the tenantId of the conversation and the entity fields.
+        lossless = codec.decode(Activity, data) == activity
+        encode = min(timeit.repeat(lambda: codec.encode(activity), number=args.iterations, repeat=args.repeat))
+        decode = min(timeit.repeat(lambda: codec.decode(Activity, data), number=args.iterations, repeat=args.repeat))
+        print('%-20s %4d bytes, encode %.1f us, decode %.1f us, lossless: %s'
+              % (name, len(data), encode / args.iterations * 1e6, decode / args.iterations * 1e6, lossless))
+
+
+if __name__ == '__main__':
+    main()
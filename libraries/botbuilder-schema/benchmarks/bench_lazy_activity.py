@@ -0,0 +1,59 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures the time to deserialize a large Teams message activity and read the attributes a typical turn uses,
+eagerly and with a LazyActivity.
+
+Usage: python benchmarks/bench_lazy_activity.py [--entities 50] [--iterations 5000]
+"""
+
+import argparse
+import timeit
+
+from botbuilder.schema import Activity
+from botbuilder.schema.lazy_activity import LazyActivity
+from botbuilder.schema.serialization import from_dict
+
+
+def create_activity(entities: int) -> dict:
+    return {
+        'type': 'message',
+        'id': '1234',
+        'timestamp': '2019-04-01T10:20:30.123Z',
+        'serviceUrl': 'https://smba.trafficmanager.net/amer/',
+        'channelId': 'msteams',
+        'from': {'id': 'user', 'name': 'User', 'aadObjectId': 'aad'},
+        'conversation': {'id': 'convo', 'conversationType': 'channel', 'tenantId': 'tenant'},
+        'recipient': {'id': 'bot', 'name': 'Bot'},
+        'text': 'hello bot',
+        'attachments': [{'contentType': 'text/html', 'content': '<div>hello bot</div>'}],
+        'entities': [{'type': 'mention', 'mentioned': {'id': 'user%s' % i, 'name': 'User %s' % i},
+                      'text': '<at>User %s</at>' % i} for i in range(entities)],
+        'channelData': {'tenant': {'id': 'tenant'}, 'team': {'id': 'team'}, 'channel': {'id': 'channel'}},
+    }
+
+
+def read_turn_attributes(activity: Activity):
+    return activity.type, activity.text, activity.from_property.id, activity.conversation.id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entities', type=int, default=50)
+    parser.add_argument('--iterations', type=int, default=5000)
+    args = parser.parse_args()
+
+    data = create_activity(args.entities)
+    cases = [
+        ('msrest deserialize', lambda: read_turn_attributes(Activity.deserialize(data))),
+        ('from_dict', lambda: read_turn_attributes(from_dict(Activity, data))),
+        ('LazyActivity', lambda: read_turn_attributes(LazyActivity.from_dict(data))),
+    ]
+    for (name, case) in cases:
+        elapsed = timeit.timeit(case, number=args.iterations)
+        print('%-20s %d entities: %.1f us/turn' % (name, args.entities, elapsed / args.iterations * 1e6))
+
+
+if __name__ == '__main__':
+    main()
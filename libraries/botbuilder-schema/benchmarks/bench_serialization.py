@@ -0,0 +1,53 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures the time to deserialize and serialize a typical incoming message activity with msrest and with the
+generated serializers.
+
+Usage: python benchmarks/bench_serialization.py [--iterations 10000]
+"""
+
+import argparse
+import timeit
+
+from botbuilder.schema import Activity
+from botbuilder.schema.serialization import from_dict, to_dict
+
+ACTIVITY = {
+    'type': 'message',
+    'id': '1234',
+    'timestamp': '2019-04-01T10:20:30.123Z',
+    'serviceUrl': 'https://smba.trafficmanager.net/amer/',
+    'channelId': 'msteams',
+    'from': {'id': 'user', 'name': 'User', 'aadObjectId': 'aad'},
+    'conversation': {'id': 'convo', 'conversationType': 'personal', 'tenantId': 'tenant'},
+    'recipient': {'id': 'bot', 'name': 'Bot'},
+    'textFormat': 'plain',
+    'locale': 'en-US',
+    'text': 'hello bot',
+    'attachments': [{'contentType': 'text/html', 'content': '<div>hello bot</div>'}],
+    'entities': [{'type': 'clientInfo', 'locale': 'en-US', 'country': 'US', 'platform': 'Web'}],
+    'channelData': {'tenant': {'id': 'tenant'}},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=10000)
+    args = parser.parse_args()
+
+    activity = Activity.deserialize(ACTIVITY)
+    cases = [
+        ('msrest deserialize', lambda: Activity.deserialize(ACTIVITY)),
+        ('from_dict', lambda: from_dict(Activity, ACTIVITY)),
+        ('msrest serialize', lambda: activity.serialize()),
+        ('to_dict', lambda: to_dict(activity)),
+    ]
+    for (name, case) in cases:
+        elapsed = timeit.timeit(case, number=args.iterations)
+        print('%-20s %.1f us/activity' % (name, elapsed / args.iterations * 1e6))
+
+
+if __name__ == '__main__':
+    main()
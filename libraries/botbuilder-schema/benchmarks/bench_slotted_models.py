@@ -0,0 +1,66 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Measures the memory held per activity, and the time to deserialize one, with the schema models and with the
+slotted models and interned strings.
+
+Usage: python benchmarks/bench_slotted_models.py [--activities 10000]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from botbuilder.schema import Activity
+from botbuilder.schema import slotted_models
+from botbuilder.schema.serialization import from_dict
+
+
+def create_payloads(count: int) -> list:
+    # Parsed from JSON like incoming requests, so equal strings are separate objects.
+    return [json.loads(json.dumps({
+        'type': 'message',
+        'id': 'activity-%s' % i,
+        'timestamp': '2019-04-01T10:20:30.123Z',
+        'serviceUrl': 'https://smba.trafficmanager.net/amer/',
+        'channelId': 'msteams',
+        'from': {'id': 'user-%s' % (i % 100), 'name': 'User %s' % (i % 100), 'aadObjectId': 'aad-%s' % (i % 100)},
+        'conversation': {'id': 'convo-%s' % (i % 100), 'conversationType': 'personal', 'tenantId': 'tenant'},
+        'recipient': {'id': 'bot', 'name': 'Bot'},
+        'textFormat': 'plain',
+        'locale': 'en-US',
+        'text': 'message %s' % i,
+    })) for i in range(count)]
+
+
+def bytes_held(deserialize, count: int) -> float:
+    # Includes the strings of the payloads that the activities still reference once the payloads are dropped.
+    tracemalloc.start()
+    try:
+        payloads = create_payloads(count)
+        activities = [deserialize(Activity, payload) for payload in payloads]
+        del payloads
+        return tracemalloc.get_traced_memory()[0] / len(activities)
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--activities', type=int, default=10000)
+    args = parser.parse_args()
+
+    for (name, deserialize) in [('schema models', from_dict), ('slotted models', slotted_models.from_dict)]:
+        payloads = create_payloads(args.activities)
+        start = time.perf_counter()
+        for payload in payloads:
+            deserialize(Activity, payload)
+        elapsed = time.perf_counter() - start
+        print('%-15s %d bytes/activity, %.1f us/activity'
+              % (name, bytes_held(deserialize, args.activities), elapsed / args.activities * 1e6))
+
+
+if __name__ == '__main__':
+    main()
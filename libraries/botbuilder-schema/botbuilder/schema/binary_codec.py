@@ -0,0 +1,715 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+A compact binary encoding of the schema models and of the JSON-like values kept in state.
+
+The encoding is MessagePack, written and read by the optional `msgpack` package when it is installed and by the
+pure Python fallback below otherwise; both produce the same bytes. There are two extension types:
+
+- a model is encoded as a class id followed by a map from field ids to values, using the ids assigned in
+  `_MODEL_IDS`, so neither class names nor the long camelCase keys are written. Models and attributes without
+  an id are written under their class name and JSON key, as are additional properties;
+- a datetime is encoded with its fields and UTC offset, so it is restored exactly.
+
+Ids are never changed or reused, so records stay readable as the schema evolves: fields the decoding schema
+doesn't know are skipped. Everything `BinaryCodec.dumps()` returns starts with a two byte header carrying the
+format version. A buffer can hold many records, which `BinaryCodec.iter_loads()` reads one at a time.
+"""
+
+import datetime
+import enum
+import functools
+import operator
+import struct
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Type, Union
+
+from msrest.serialization import Model
+
+from .serialization import _SCALAR_TYPES, _models
+
+try:
+    import msgpack
+    # Creates an ExtType without the argument checks of its constructor, which only ever gets valid ones here.
+    _ext_type = functools.partial(tuple.__new__, msgpack.ExtType)
+except ImportError:
+    msgpack = None
+
+_MAGIC = b'\xc1'  # Never used by MessagePack.
+_FORMAT_VERSION = 1
+_HEADER = _MAGIC + bytes((_FORMAT_VERSION,))
+_MODEL_EXT = 1
+_DATETIME_EXT = 2
+_BACKENDS = ('msgpack', 'python')
+
+_DATETIME = struct.Struct('>HBBBBBIBi')
+_PACK_DOUBLE = struct.Struct('>d').pack
+_UNPACK_DOUBLE = struct.Struct('>d').unpack_from
+# The types restored exactly, and those of the dict keys restored exactly.
+_EXACT_TYPES = frozenset((str, int, bool, float, bytes, type(None)))
+_EXACT_KEY_TYPES = frozenset((str, int, bool))
+
+
+# The class id of each model, and its attributes in field id order. Ids are fixed once assigned, so that stored
+# records stay readable: new models and attributes are appended with new ids, and the ids of removed ones are
+# never reused.
+_MODEL_IDS: Dict[str, Tuple[int, Tuple[str, ...]]] = {
+    'Activity': (1, ('type', 'id', 'timestamp', 'local_timestamp', 'local_timezone', 'service_url', 'channel_id',
+                     'from_property', 'conversation', 'recipient', 'text_format', 'attachment_layout', 'members_added',
+                     'members_removed', 'reactions_added', 'reactions_removed', 'topic_name', 'history_disclosed',
+                     'locale', 'text', 'speak', 'input_hint', 'summary', 'suggested_actions', 'attachments', 'entities',
+                     'channel_data', 'action', 'reply_to_id', 'label', 'value_type', 'value', 'name', 'relates_to',
+                     'code', 'expiration', 'importance', 'delivery_mode', 'listen_for', 'text_highlights',
+                     'semantic_action')),
+    'AnimationCard': (2, ('title', 'subtitle', 'text', 'image', 'media', 'buttons', 'shareable', 'autoloop',
+                          'autostart', 'aspect', 'duration', 'value')),
+    'Attachment': (3, ('content_type', 'content_url', 'content', 'name', 'thumbnail_url')),
+    'AttachmentData': (4, ('type', 'name', 'original_base64', 'thumbnail_base64')),
+    'AttachmentInfo': (5, ('name', 'type', 'views')),
+    'AttachmentView': (6, ('view_id', 'size')),
+    'AudioCard': (7, ('title', 'subtitle', 'text', 'image', 'media', 'buttons', 'shareable', 'autoloop', 'autostart',
+                      'aspect', 'duration', 'value')),
+    'BasicCard': (8, ('title', 'subtitle', 'text', 'images', 'buttons', 'tap')),
+    'CardAction': (9, ('type', 'title', 'image', 'text', 'display_text', 'value', 'channel_data')),
+    'CardImage': (10, ('url', 'alt', 'tap')),
+    'ChannelAccount': (11, ('id', 'name', 'aad_object_id', 'role')),
+    'ConversationAccount': (12, ('is_group', 'conversation_type', 'id', 'name', 'aad_object_id', 'role')),
+    'ConversationMembers': (13, ('id', 'members')),
+    'ConversationParameters': (14, ('is_group', 'bot', 'members', 'topic_name', 'activity', 'channel_data')),
+    'ConversationReference': (15, ('activity_id', 'user', 'bot', 'conversation', 'channel_id', 'service_url')),
+    'ConversationResourceResponse': (16, ('activity_id', 'service_url', 'id')),
+    'ConversationsResult': (17, ('continuation_token', 'conversations')),
+    'Entity': (18, ('type',)),
+    'Error': (19, ('code', 'message', 'inner_http_error')),
+    'ErrorResponse': (20, ('error',)),
+    'Fact': (21, ('key', 'value')),
+    'GeoCoordinates': (22, ('elevation', 'latitude', 'longitude', 'type', 'name')),
+    'HeroCard': (23, ('title', 'subtitle', 'text', 'images', 'buttons', 'tap')),
+    'InnerHttpError': (24, ('status_code', 'body')),
+    'MediaCard': (25, ('title', 'subtitle', 'text', 'image', 'media', 'buttons', 'shareable', 'autoloop', 'autostart',
+                       'aspect', 'duration', 'value')),
+    'MediaEventValue': (26, ('card_value',)),
+    'MediaUrl': (27, ('url', 'profile')),
+    'Mention': (28, ('mentioned', 'text', 'type')),
+    'MessageReaction': (29, ('type',)),
+    'MicrosoftPayMethodData': (30, ('merchant_id', 'supported_networks', 'supported_types')),
+    'OAuthCard': (31, ('text', 'connection_name', 'buttons')),
+    'PagedMembersResult': (32, ('continuation_token', 'members')),
+    'PaymentAddress': (33, ('country', 'address_line', 'region', 'city', 'dependent_locality', 'postal_code',
+                            'sorting_code', 'language_code', 'organization', 'recipient', 'phone')),
+    'PaymentCurrencyAmount': (34, ('currency', 'value', 'currency_system')),
+    'PaymentDetails': (35, ('total', 'display_items', 'shipping_options', 'modifiers', 'error')),
+    'PaymentDetailsModifier': (36, ('supported_methods', 'total', 'additional_display_items', 'data')),
+    'PaymentItem': (37, ('label', 'amount', 'pending')),
+    'PaymentMethodData': (38, ('supported_methods', 'data')),
+    'PaymentOptions': (39, ('request_payer_name', 'request_payer_email', 'request_payer_phone', 'request_shipping',
+                            'shipping_type')),
+    'PaymentRequest': (40, ('id', 'method_data', 'details', 'options', 'expires')),
+    'PaymentRequestComplete': (41, ('id', 'payment_request', 'payment_response')),
+    'PaymentRequestCompleteResult': (42, ('result',)),
+    'PaymentRequestUpdate': (43, ('id', 'details', 'shipping_address', 'shipping_option')),
+    'PaymentRequestUpdateResult': (44, ('details',)),
+    'PaymentResponse': (45, ('method_name', 'details', 'shipping_address', 'shipping_option', 'payer_email',
+                             'payer_phone')),
+    'PaymentShippingOption': (46, ('id', 'label', 'amount', 'selected')),
+    'Place': (47, ('address', 'geo', 'has_map', 'type', 'name')),
+    'ReceiptCard': (48, ('title', 'facts', 'items', 'tap', 'total', 'tax', 'vat', 'buttons')),
+    'ReceiptItem': (49, ('title', 'subtitle', 'text', 'image', 'price', 'quantity', 'tap')),
+    'ResourceResponse': (50, ('id',)),
+    'SemanticAction': (51, ('id', 'entities')),
+    'SigninCard': (52, ('text', 'buttons')),
+    'SuggestedActions': (53, ('to', 'actions')),
+    'TextHighlight': (54, ('text', 'occurrence')),
+    'Thing': (55, ('type', 'name')),
+    'ThumbnailCard': (56, ('title', 'subtitle', 'text', 'images', 'buttons', 'tap')),
+    'ThumbnailUrl': (57, ('url', 'alt')),
+    'TokenRequest': (58, ('provider', 'settings')),
+    'TokenResponse': (59, ('connection_name', 'token', 'expiration')),
+    'Transcript': (60, ('activities',)),
+    'VideoCard': (61, ('title', 'subtitle', 'text', 'image', 'media', 'buttons', 'shareable', 'autoloop', 'autostart',
+                       'aspect', 'duration', 'value')),
+}
+
+
+class _ModelLayout:
+    """
+    How one model class is encoded. `keys` holds the key of each attribute of `attributes`, its field id or its
+    JSON key, and `field_ids` the packed keys. `attributes_by_id[field_id]` is the attribute with that field id,
+    None if the class doesn't have it anymore.
+    """
+    __slots__ = ('model_type', 'class_id', 'attributes', 'keys', 'field_ids', 'attributes_by_id', 'attributes_by_key',
+                 'get_values', 'defaults', 'slotted')
+
+    def __init__(self, model_type: Type[Model], name: str):
+        (class_id, field_names) = _MODEL_IDS.get(name, (None, ()))
+        attribute_map = model_type._attribute_map
+        field_ids = {attribute: field_id for (field_id, attribute) in enumerate(field_names)}
+        self.model_type = model_type
+        self.class_id = _pack_int(class_id) if class_id is not None else _pack_str(name)
+        self.attributes = tuple(attribute_map)
+        self.keys = tuple(field_ids[attribute] if attribute in field_ids else attribute_map[attribute]['key']
+                          for attribute in self.attributes)
+        self.field_ids = tuple(_pack_int(key) if type(key) is int else _pack_str(key) for key in self.keys)
+        self.attributes_by_id = tuple(attribute if attribute in attribute_map else None for attribute in field_names)
+        self.attributes_by_key = {attribute_map[attribute]['key']: attribute for attribute in self.attributes
+                                  if attribute not in field_ids}
+        self.get_values = (lambda model: ()) if not self.attributes else \
+            operator.attrgetter(*self.attributes) if len(self.attributes) > 1 else \
+            (lambda model, get=operator.attrgetter(self.attributes[0]): (get(model),))
+        self.defaults = dict.fromkeys(self.attributes)
+        self.slotted = any('__slots__' in vars(klass) and klass.__slots__ for klass in model_type.__mro__)
+
+
+def _to_msgpack_expression(data_type: str, names: Dict[str, str]) -> str:
+    # Values of the declared type are converted inline, anything else by `_to_msgpack`.
+    if data_type in _SCALAR_TYPES:
+        return 'value if type(value) is %s else _to_msgpack(value)' % data_type
+    if data_type == 'iso-8601':
+        return '_datetime_ext(value) if type(value) is _datetime else _to_msgpack(value)'
+    if data_type.startswith('[') and data_type[1:-1] in names:
+        name = names[data_type[1:-1]]
+        return '[encode_%s(item) if type(item) is %s else _to_msgpack(item) for item in value] ' \
+            'if type(value) is list else _to_msgpack(value)' % (name, name)
+    if data_type in names:
+        return 'encode_%s(value) if type(value) is %s else _to_msgpack(value)' % (names[data_type], names[data_type])
+    return 'value if type(value) is str else _to_msgpack(value)'
+
+
+def _msgpack_encoder_source(layout: _ModelLayout, name: str, names: Dict[str, str]) -> List[str]:
+    # The fields are collected as `to_dict` does, with the values made packable for msgpack.
+    lines = ['def encode_%s(model):' % name,
+             '    result = {}']
+    for (attribute, key) in zip(layout.attributes, layout.keys):
+        lines += ['    value = model.%s' % attribute,
+                  '    if value is not None:',
+                  '        result[%r] = %s' % (key, _to_msgpack_expression(
+                      layout.model_type._attribute_map[attribute]['type'], names))]
+    return lines + ['    additional_properties = getattr(model, \'additional_properties\', None)',
+                    '    if additional_properties:',
+                    '        _add_properties(result, additional_properties)',
+                    '    return _ext_type((%d, %r + _pack(result)))' % (_MODEL_EXT, layout.class_id),
+                    '']
+
+
+def _datetime_ext(value: datetime.datetime) -> object:
+    return _ext_type((_DATETIME_EXT, _datetime_body(value)))
+
+
+def _pack_str(value: str) -> bytes:
+    data = value.encode('utf-8')
+    size = len(data)
+    if size < 32:
+        return bytes((0xa0 | size,)) + data
+    if size < 0x100:
+        return b'\xd9' + bytes((size,)) + data
+    if size < 0x10000:
+        return b'\xda' + size.to_bytes(2, 'big') + data
+    return b'\xdb' + size.to_bytes(4, 'big') + data
+
+
+def _container_header(size: int, fix: int, small: bytes, large: bytes) -> bytes:
+    if size < 16:
+        return bytes((fix | size,))
+    if size < 0x10000:
+        return small + size.to_bytes(2, 'big')
+    return large + size.to_bytes(4, 'big')
+
+
+def _ext_header(size: int, ext_type: int) -> bytes:
+    if size in _FIXEXT_CODES:
+        return bytes((_FIXEXT_CODES[size], ext_type))
+    if size < 0x100:
+        return b'\xc7' + bytes((size, ext_type))
+    if size < 0x10000:
+        return b'\xc8' + size.to_bytes(2, 'big') + bytes((ext_type,))
+    return b'\xc9' + size.to_bytes(4, 'big') + bytes((ext_type,))
+
+
+# The fixext code for each size that has one.
+_FIXEXT_CODES = {1: 0xd4, 2: 0xd5, 4: 0xd6, 8: 0xd7, 16: 0xd8}
+
+
+def _check_end(data, end: int) -> int:
+    # Returns the end of a value, checking that the data holds it.
+    if end > len(data):
+        raise ValueError('BinaryCodec: the record is truncated.')
+    return end
+
+
+def _pack_int(value: int) -> bytes:
+    if 0 <= value < 0x80:
+        return bytes((value,))
+    if -0x20 <= value < 0:
+        return bytes((value & 0xff,))
+    if value >= 0:
+        for (code, size) in ((b'\xcc', 1), (b'\xcd', 2), (b'\xce', 4), (b'\xcf', 8)):
+            if value < 1 << (8 * size):
+                return code + value.to_bytes(size, 'big')
+    else:
+        for (code, size) in ((b'\xd0', 1), (b'\xd1', 2), (b'\xd2', 4), (b'\xd3', 8)):
+            if value >= -(1 << (8 * size - 1)):
+                return code + value.to_bytes(size, 'big', signed=True)
+    raise OverflowError('BinaryCodec: integer %s does not fit in 64 bits.' % value)
+
+
+class BinaryCodec:
+    """
+    Encodes schema models, and JSON-like values containing them, into compact MessagePack records.
+
+    Values can be None, bool, int, float, str, bytes, list, tuple (decoded as a list), dict, datetime and any
+    model of the schema. Decoding a record restores an equal value.
+
+    Usage Example:
+    codec = BinaryCodec()
+    data = codec.dumps_many(transcript)
+    for activity in codec.iter_loads(data):
+        print(activity.text)
+    """
+    def __init__(self, model_types: Dict[str, type] = None, backend: str = None):
+        """
+        Creates a new BinaryCodec instance.
+        :param model_types: the model classes to create when decoding, by name. Defaults to the schema models.
+        :param backend: 'msgpack' or 'python'. Defaults to 'msgpack' when it is installed, otherwise 'python'.
+        """
+        if backend is None:
+            backend = 'python' if msgpack is None else 'msgpack'
+        if backend not in _BACKENDS:
+            raise ValueError('BinaryCodec(): unknown backend "%s", expected one of %s.' % (backend, _BACKENDS))
+        if backend == 'msgpack' and msgpack is None:
+            raise ImportError('BinaryCodec(): the "msgpack" backend requires the "msgpack" package to be installed.')
+        self.backend = backend
+        self._packer = msgpack.Packer() if backend == 'msgpack' else None
+        self._msgpack_encoders: Dict[type, Callable[[Model], object]] = None
+        self._model_types = dict(model_types or _models)
+        # Models are decoded by class id, or by class name for those without one.
+        self._layouts_by_id: Dict[Union[int, str], _ModelLayout] = {}
+        self._layouts: Dict[type, _ModelLayout] = {}
+        for (name, model_type) in self._model_types.items():
+            if isinstance(model_type, type) and issubclass(model_type, Model):
+                layout = self._layouts[model_type] = _ModelLayout(model_type, name)
+                self._layouts_by_id[_MODEL_IDS[name][0] if name in _MODEL_IDS else name] = layout
+
+    def dumps(self, value: object) -> bytes:
+        """
+        Encodes a value into a record.
+        :param value:
+        :return:
+        """
+        if self.backend == 'msgpack':
+            return _HEADER + self._msgpack_dumps(value)
+        out = bytearray(_HEADER)
+        self._pack(value, out)
+        return bytes(out)
+
+    def dumps_many(self, values: Iterable[object]) -> bytes:
+        """
+        Encodes many values into a single buffer, to be read back with `iter_loads()`.
+        :param values:
+        :return:
+        """
+        if self.backend == 'msgpack':
+            return _HEADER + b''.join(map(self._msgpack_dumps, values))
+        out = bytearray(_HEADER)
+        for value in values:
+            self._pack(value, out)
+        return bytes(out)
+
+    def loads(self, data: Union[bytes, bytearray]) -> object:
+        """
+        Decodes a record written by `dumps()`.
+        :param data:
+        :return:
+        """
+        position = self._check_header(data)
+        try:
+            if self.backend == 'msgpack':
+                return self._msgpack_loads(memoryview(data)[position:])
+            (value, position) = self._unpack(data, position)
+        except (IndexError, struct.error):
+            raise ValueError('BinaryCodec.loads(): the record is truncated.')
+        if position != len(data):
+            raise ValueError('BinaryCodec.loads(): %s unexpected bytes after the record.' % (len(data) - position))
+        return value
+
+    def iter_loads(self, data: Union[bytes, bytearray]) -> Iterator[object]:
+        """
+        Decodes the records of a buffer written by `dumps_many()` one at a time.
+        :param data:
+        :return:
+        """
+        position = self._check_header(data)
+        if self.backend == 'msgpack':
+            unpacker = msgpack.Unpacker(ext_hook=self._ext_hook, raw=False, strict_map_key=False,
+                                        max_buffer_size=max(len(data), 1))
+            unpacker.feed(memoryview(data)[position:])
+            start = position
+            try:
+                for value in unpacker:
+                    position = start + unpacker.tell()
+                    yield value
+            except (IndexError, struct.error):
+                raise ValueError('BinaryCodec.iter_loads(): the record at offset %s is truncated.' % position)
+            if position != len(data):
+                raise ValueError('BinaryCodec.iter_loads(): the record at offset %s is truncated.' % position)
+            return
+        while position < len(data):
+            try:
+                (value, position) = self._unpack(data, position)
+            except (IndexError, struct.error):
+                raise ValueError('BinaryCodec.iter_loads(): the record at offset %s is truncated.' % position)
+            yield value
+
+    def encode(self, model: Model) -> bytes:
+        """
+        Encodes a schema model into a record.
+        :param model:
+        :return:
+        """
+        return self.dumps(model)
+
+    def decode(self, model_type: Type[Model], data: Union[bytes, bytearray]) -> Model:
+        """
+        Decodes a record holding a model of the given class.
+        :param model_type:
+        :param data:
+        :return:
+        """
+        model = self.loads(data)
+        if not isinstance(model, model_type):
+            raise TypeError('BinaryCodec.decode(): expected a "%s" record, got "%s".'
+                            % (model_type.__name__, type(model).__name__))
+        return model
+
+    def is_exact(self, value: object) -> bool:
+        """
+        Tells whether decoding the record of a value restores the value with the same types, rather than e.g. a
+        list for a tuple or the schema model a derived class is encoded as. The members of str enums, as the
+        schema models hold them, are restored as their str value.
+        :param value:
+        :return:
+        """
+        value_type = type(value)
+        if value_type in _EXACT_TYPES:
+            return True
+        if value_type is list:
+            return all(map(self.is_exact, value))
+        if value_type is dict:
+            return all(type(key) in _EXACT_KEY_TYPES for key in value) and all(map(self.is_exact, value.values()))
+        if value_type is datetime.datetime:
+            # Unlike time zones, fixed offsets are restored, as a `datetime.timezone`.
+            return value.tzinfo is None or value.tzinfo.utcoffset(None) is not None
+        if isinstance(value, str):
+            return isinstance(value, enum.Enum)
+        layout = self._layouts.get(value_type)
+        if layout is None or layout.model_type is not value_type:
+            return False
+        additional_properties = getattr(value, 'additional_properties', None)
+        if type(additional_properties) is not dict or not self.is_exact(additional_properties):
+            return False
+        if not layout.slotted and not vars(value).keys() <= layout.defaults.keys() | {'additional_properties'}:
+            # Attributes outside the attribute map aren't encoded.
+            return False
+        return all(map(self.is_exact, layout.get_values(value)))
+
+    @staticmethod
+    def _check_header(data) -> int:
+        header = bytes(data[:len(_HEADER)])
+        if header[:1] != _MAGIC:
+            raise ValueError('BinaryCodec: the data was not written by a BinaryCodec.')
+        if header != _HEADER:
+            raise ValueError('BinaryCodec: the data was written in an unsupported format version.')
+        return len(header)
+
+    def _pack(self, value, out: bytearray) -> None:
+        value_type = type(value)
+        if value_type is str:
+            out += _pack_str(value)
+        elif value is None:
+            out.append(0xc0)
+        elif value_type is bool:
+            out.append(0xc3 if value else 0xc2)
+        elif value_type is int:
+            out += _pack_int(value)
+        elif value_type is dict:
+            out += _container_header(len(value), 0x80, b'\xde', b'\xdf')
+            for (key, item) in value.items():
+                self._pack(key, out)
+                self._pack(item, out)
+        elif value_type is list or value_type is tuple:
+            out += _container_header(len(value), 0x90, b'\xdc', b'\xdd')
+            for item in value:
+                self._pack(item, out)
+        elif value_type is float:
+            out.append(0xcb)
+            out += _PACK_DOUBLE(value)
+        elif isinstance(value, Model):
+            self._pack_model(value, out)
+        elif isinstance(value, str):
+            # e.g. the members of the str enums of the schema.
+            out += _pack_str(str.__str__(value))
+        elif isinstance(value, (bytes, bytearray)):
+            size = len(value)
+            out += (b'\xc4' + bytes((size,))) if size < 0x100 else \
+                (b'\xc5' + size.to_bytes(2, 'big')) if size < 0x10000 else (b'\xc6' + size.to_bytes(4, 'big'))
+            out += value
+        elif isinstance(value, datetime.datetime):
+            self._pack_datetime(value, out)
+        elif isinstance(value, int):
+            out += _pack_int(int(value))
+        elif isinstance(value, float):
+            out.append(0xcb)
+            out += _PACK_DOUBLE(value)
+        else:
+            raise TypeError('BinaryCodec: cannot encode a value of type "%s".' % value_type.__name__)
+
+    def _pack_model(self, model: Model, out: bytearray) -> None:
+        layout = self._layouts.get(type(model)) or self._layout(type(model))
+        body = bytearray(layout.class_id)
+        # A map16 header, replaced by the shortest header once the fields are counted.
+        start = len(body)
+        body += b'\xde\x00\x00'
+        count = 0
+        pack = self._pack
+        for (field_id, value) in zip(layout.field_ids, layout.get_values(model)):
+            if value is not None:
+                count += 1
+                body += field_id
+                if type(value) is str:
+                    body += _pack_str(value)
+                else:
+                    pack(value, body)
+        additional_properties = getattr(model, 'additional_properties', None)
+        if additional_properties:
+            for (key, value) in additional_properties.items():
+                if not isinstance(key, str):
+                    raise TypeError('BinaryCodec: additional property names must be strings, got "%s".' % (key,))
+                count += 1
+                body += _pack_str(key)
+                pack(value, body)
+        body[start:start + 3] = _container_header(count, 0x80, b'\xde', b'\xdf')
+        out += _ext_header(len(body), _MODEL_EXT)
+        out += body
+
+    def _layout(self, model_type: type) -> _ModelLayout:
+        # Derived classes, e.g. slotted or lazy activities, are encoded as the schema model they derive from.
+        layout = next((self._layouts[klass] for klass in model_type.__mro__ if klass in self._layouts), None)
+        if layout is None:
+            raise TypeError('BinaryCodec: "%s" is not a known model class.' % model_type.__name__)
+        self._layouts[model_type] = layout
+        return layout
+
+    @staticmethod
+    def _pack_datetime(value: datetime.datetime, out: bytearray) -> None:
+        body = _datetime_body(value)
+        out += _ext_header(len(body), _DATETIME_EXT)
+        out += body
+
+    def _msgpack_dumps(self, value: object) -> bytes:
+        # Models and datetimes are replaced by extension values innermost first, each packed on its own, so the
+        # packer never calls back into Python and one packer serves all records.
+        if self._msgpack_encoders is None:
+            self._generate_msgpack_encoders()
+        return self._packer.pack(self._to_msgpack(value))
+
+    def _to_msgpack(self, value: object) -> object:
+        # Returns the value with its models and datetimes replaced by extension values.
+        value_type = type(value)
+        if value_type in _EXACT_TYPES:
+            return value
+        if value_type is list or value_type is tuple:
+            to_msgpack = self._to_msgpack
+            return [item if type(item) is str else to_msgpack(item) for item in value]
+        if value_type is dict:
+            to_msgpack = self._to_msgpack
+            return {key if type(key) is str else to_msgpack(key): item if type(item) is str else to_msgpack(item)
+                    for (key, item) in value.items()}
+        encoder = self._msgpack_encoders.get(value_type)
+        if encoder is not None:
+            return encoder(value)
+        if isinstance(value, Model):
+            encoder = self._msgpack_encoders[value_type] = self._msgpack_encoders[self._layout(value_type).model_type]
+            return encoder(value)
+        if isinstance(value, datetime.datetime):
+            return _datetime_ext(value)
+        if isinstance(value, (str, int, float, bytes, bytearray)):
+            # e.g. the members of the enums of the schema, which msgpack writes as their base type.
+            return value
+        raise TypeError('BinaryCodec: cannot encode a value of type "%s".' % value_type.__name__)
+
+    def _generate_msgpack_encoders(self) -> None:
+        # One function per model class, generated on first use as the `to_dict` functions of `serialization` are.
+        layouts = {name: self._layouts[model_type] for (name, model_type) in self._model_types.items()
+                   if model_type in self._layouts}
+        names = {name: '_model_%d' % index for (index, name) in enumerate(layouts)}
+        namespace = {'_to_msgpack': self._to_msgpack, '_add_properties': self._add_msgpack_properties,
+                     '_pack': self._packer.pack, '_ext_type': _ext_type, '_datetime_ext': _datetime_ext,
+                     '_datetime': datetime.datetime}
+        lines = []
+        for (name, layout) in layouts.items():
+            namespace[names[name]] = layout.model_type
+            lines += _msgpack_encoder_source(layout, names[name], names)
+        exec(compile('\n'.join(lines), '<BinaryCodec encoders>', 'exec'), namespace)
+        self._msgpack_encoders = {layout.model_type: namespace['encode_%s' % names[name]]
+                                  for (name, layout) in layouts.items()}
+
+    def _add_msgpack_properties(self, fields: dict, additional_properties: dict) -> None:
+        to_msgpack = self._to_msgpack
+        for (key, value) in additional_properties.items():
+            if not isinstance(key, str):
+                raise TypeError('BinaryCodec: additional property names must be strings, got "%s".' % (key,))
+            fields[key] = value if type(value) is str else to_msgpack(value)
+
+    def _msgpack_loads(self, data) -> object:
+        return msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+
+    def _ext_hook(self, ext_type: int, data: bytes) -> object:
+        # Called by msgpack for the extension values it reads.
+        if ext_type == _MODEL_EXT:
+            (class_id, position) = self._unpack(data, 0)
+            return self._create_model(class_id, self._msgpack_loads(memoryview(data)[position:]))
+        if ext_type == _DATETIME_EXT:
+            if len(data) != _DATETIME.size:
+                raise ValueError('BinaryCodec: invalid datetime record.')
+            return self._unpack_datetime(data, 0)
+        raise ValueError('BinaryCodec: unknown extension type %s.' % ext_type)
+
+    def _unpack(self, data, position: int) -> Tuple[object, int]:
+        code = data[position]
+        position += 1
+        # The most frequent codes first.
+        if 0xa0 <= code <= 0xbf:
+            end = _check_end(data, position + (code & 0x1f))
+            return str(data[position:end], 'utf-8'), end
+        if code < 0x80:
+            return code, position
+        if code == 0xc0:
+            return None, position
+        if code <= 0x8f:
+            return self._unpack_map(data, position, code & 0x0f)
+        if 0xc7 <= code <= 0xc9 or 0xd4 <= code <= 0xd8:
+            if code <= 0xc9:
+                (size, position) = self._unpack_size(data, position, code - 0xc7)
+            else:
+                size = 1 << (code - 0xd4)
+            ext_type = data[position]
+            position += 1
+            end = _check_end(data, position + size)
+            if ext_type == _MODEL_EXT:
+                return self._unpack_model(data, position, end)
+            if ext_type == _DATETIME_EXT:
+                if size != _DATETIME.size:
+                    raise ValueError('BinaryCodec: invalid datetime record.')
+                return self._unpack_datetime(data, position), end
+            raise ValueError('BinaryCodec: unknown extension type %s.' % ext_type)
+        if code <= 0x9f:
+            return self._unpack_array(data, position, code & 0x0f)
+        if code == 0xc2:
+            return False, position
+        if code == 0xc3:
+            return True, position
+        if code >= 0xe0:
+            return code - 0x100, position
+        if code == 0xcb:
+            return _UNPACK_DOUBLE(data, position)[0], position + 8
+        if 0xd9 <= code <= 0xdb:
+            (size, position) = self._unpack_size(data, position, code - 0xd9)
+            end = _check_end(data, position + size)
+            return str(data[position:end], 'utf-8'), end
+        if 0xcc <= code <= 0xcf:
+            end = _check_end(data, position + (1 << (code - 0xcc)))
+            return int.from_bytes(data[position:end], 'big'), end
+        if 0xd0 <= code <= 0xd3:
+            end = _check_end(data, position + (1 << (code - 0xd0)))
+            return int.from_bytes(data[position:end], 'big', signed=True), end
+        if 0xc4 <= code <= 0xc6:
+            (size, position) = self._unpack_size(data, position, code - 0xc4)
+            end = _check_end(data, position + size)
+            return bytes(data[position:end]), end
+        if code in (0xdc, 0xdd):
+            (size, position) = self._unpack_size(data, position, code - 0xdb)
+            return self._unpack_array(data, position, size)
+        if code in (0xde, 0xdf):
+            (size, position) = self._unpack_size(data, position, code - 0xdd)
+            return self._unpack_map(data, position, size)
+        raise ValueError('BinaryCodec: invalid type code 0x%02x.' % code)
+
+    @staticmethod
+    def _unpack_size(data, position: int, width: int) -> Tuple[int, int]:
+        # width is 0, 1 or 2 for a 1, 2 or 4 byte size.
+        end = _check_end(data, position + (1 << width))
+        return int.from_bytes(data[position:end], 'big'), end
+
+    def _unpack_array(self, data, position: int, size: int) -> Tuple[List[object], int]:
+        unpack = self._unpack
+        items = []
+        for _ in range(size):
+            (item, position) = unpack(data, position)
+            items.append(item)
+        return items, position
+
+    def _unpack_map(self, data, position: int, size: int) -> Tuple[dict, int]:
+        unpack = self._unpack
+        result = {}
+        for _ in range(size):
+            (key, position) = unpack(data, position)
+            (result[key], position) = unpack(data, position)
+        return result, position
+
+    def _unpack_model(self, data, position: int, end: int) -> Tuple[Model, int]:
+        (class_id, position) = self._unpack(data, position)
+        (fields, position) = self._unpack(data, position)
+        if position != end:
+            raise ValueError('BinaryCodec: invalid model record.')
+        return self._create_model(class_id, fields), end
+
+    def _create_model(self, class_id, fields) -> Model:
+        layout = self._layouts_by_id.get(class_id) if type(class_id) in (int, str) else None
+        if layout is None:
+            raise ValueError('BinaryCodec: unknown model class %r.' % (class_id,))
+        if type(fields) is not dict:
+            raise ValueError('BinaryCodec: invalid "%s" record.' % layout.model_type.__name__)
+
+        attributes_by_id = layout.attributes_by_id
+        attributes_by_key = layout.attributes_by_key
+        values = dict(layout.defaults)
+        additional_properties = {}
+        for (key, value) in fields.items():
+            if type(key) is int:
+                if key < 0:
+                    raise ValueError('BinaryCodec: invalid field id %s in a "%s" record.'
+                                     % (key, layout.model_type.__name__))
+                attribute = attributes_by_id[key] if key < len(attributes_by_id) else None
+                # Fields of attributes the class doesn't have are skipped.
+                if attribute is not None:
+                    values[attribute] = value
+            elif type(key) is str:
+                attribute = attributes_by_key.get(key)
+                if attribute is not None:
+                    values[attribute] = value
+                else:
+                    additional_properties[key] = value
+            else:
+                raise ValueError('BinaryCodec: invalid field name %r in a "%s" record.'
+                                 % (key, layout.model_type.__name__))
+        values['additional_properties'] = additional_properties
+
+        model = object.__new__(layout.model_type)
+        if layout.slotted:
+            for (attr, value) in values.items():
+                setattr(model, attr, value)
+        else:
+            model.__dict__.update(values)
+        return model
+
+    @staticmethod
+    def _unpack_datetime(data, position: int) -> datetime.datetime:
+        (year, month, day, hour, minute, second, microsecond, has_offset, offset) = \
+            _DATETIME.unpack_from(data, position)
+        tzinfo = datetime.timezone(datetime.timedelta(seconds=offset)) if has_offset else None
+        return datetime.datetime(year, month, day, hour, minute, second, microsecond, tzinfo)
+
+
+def _datetime_body(value: datetime.datetime) -> bytes:
+    offset = value.utcoffset()
+    return _DATETIME.pack(value.year, value.month, value.day, value.hour, value.minute, value.second,
+                          value.microsecond, offset is not None, 0 if offset is None else int(offset.total_seconds()))
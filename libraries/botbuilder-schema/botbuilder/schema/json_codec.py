@@ -0,0 +1,124 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Encoding of the schema models to and from the JSON bytes sent on the wire.
+
+`JsonCodec` turns raw request or response bytes into a model, and a model back into bytes, in a single
+call. The stdlib `json` module is always available; when the optional `orjson` package is installed it is
+used instead, which parses bytes directly without first decoding them into a str and encodes straight
+into bytes.
+"""
+
+import codecs
+import json
+from typing import Type, Union
+
+from msrest.serialization import Model
+
+from . import Activity
+from .lazy_activity import LazyActivity
+from .serialization import from_dict, to_dict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_BACKENDS = ('orjson', 'json')
+# Hands the types `json` can't encode back to the fallback below, which raises for them.
+_ORJSON_STRICT = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                  if orjson is not None else None)
+
+
+class JsonCodec:
+    """
+    Converts schema models to and from JSON bytes, using the fastest JSON backend that is installed.
+
+    Usage Example:
+    codec = JsonCodec()
+    activity = codec.decode_activity(await request.read())
+    body = codec.encode(activity)
+    """
+    def __init__(self, backend: str = None):
+        """
+        Creates a new JsonCodec instance.
+        :param backend: 'orjson' or 'json'. Defaults to 'orjson' when it is installed, otherwise 'json'.
+        """
+        if backend is None:
+            backend = 'json' if orjson is None else 'orjson'
+        if backend not in _BACKENDS:
+            raise ValueError('JsonCodec(): unknown backend "%s", expected one of %s.' % (backend, _BACKENDS))
+        if backend == 'orjson' and orjson is None:
+            raise ImportError('JsonCodec(): the "orjson" backend requires the "orjson" package to be installed.')
+        self.backend = backend
+
+    def loads(self, data: Union[bytes, str]) -> object:
+        """
+        Parses a JSON document. A leading UTF-8 byte order mark is ignored.
+        :param data:
+        :return:
+        """
+        if isinstance(data, (bytes, bytearray)):
+            if data[:3] == codecs.BOM_UTF8:
+                data = data[3:]
+        elif data[:1] == '\ufeff':
+            data = data[1:]
+        if self.backend == 'orjson':
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def dumps(self, obj: object, strict: bool = False) -> bytes:
+        """
+        Encodes an object made of JSON types into compact UTF-8 JSON bytes.
+        :param obj:
+        :param strict: if True, types that orjson encodes but `json` doesn't, such as datetimes and dataclasses,
+        raise a TypeError with either backend.
+        :return:
+        """
+        if self.backend == 'orjson':
+            try:
+                return orjson.dumps(obj, option=_ORJSON_STRICT if strict else None)
+            except orjson.JSONEncodeError:
+                # orjson is stricter than json, e.g. about integers larger than 64 bits.
+                pass
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def decode(self, model_type: Type[Model], data: Union[bytes, str]) -> Model:
+        """
+        Parses a JSON document into a schema model.
+        :param model_type:
+        :param data:
+        :return:
+        """
+        return from_dict(model_type, self.loads(data))
+
+    def encode(self, model: Model) -> bytes:
+        """
+        Encodes a schema model into JSON bytes. The document holds the same JSON as `model.serialize()`.
+        :param model:
+        :return:
+        """
+        return self.dumps(to_dict(model))
+
+    def decode_activity(self, data: Union[bytes, str], lazy: bool = False) -> Activity:
+        """
+        Parses the body of a request received from a channel into an Activity.
+        :param data:
+        :param lazy: if True, returns a `LazyActivity` whose attributes are only deserialized when read.
+        :return:
+        """
+        if lazy:
+            return LazyActivity.from_dict(self.loads(data))
+        return self.decode(Activity, data)
+
+    def encode_activity(self, activity: Activity) -> bytes:
+        """
+        Encodes an Activity into JSON bytes.
+        :param activity:
+        :return:
+        """
+        return self.encode(activity)
+
+
+DEFAULT_CODEC = JsonCodec()
@@ -0,0 +1,98 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+An Activity that is deserialized on demand.
+
+Most turns only read a few attributes of the incoming activity, such as its `type`, `text`, sender and
+conversation, while `Activity.deserialize` builds every nested model of the payload up front. `LazyActivity`
+keeps the parsed JSON dict instead and deserializes an attribute the first time it is read.
+"""
+
+from typing import Callable, Dict, Tuple
+
+from . import Activity
+from .serialization import _TO_DICT, _attribute_from_dict_functions
+
+_ATTRIBUTES: Dict[str, Tuple[str, Callable]] = _attribute_from_dict_functions(Activity)
+_KEYS = frozenset(key for (key, _) in _ATTRIBUTES.values())
+
+
+class LazyActivity(Activity):
+    """
+    An `Activity` backed by the dict it was parsed from. Each attribute, e.g. `entities` or `channel_data`, is
+    deserialized the first time it is read and then cached, so a turn only pays for the attributes it uses.
+    Assigning an attribute works as for any `Activity`. The dict is owned by the activity and must not be
+    changed afterwards.
+
+    Usage Example:
+    activity = LazyActivity.from_dict(request_body)
+    """
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LazyActivity':
+        """
+        Creates a LazyActivity from the dict received on the wire. Nothing is deserialized until it is read.
+        :param data:
+        :return:
+        """
+        if not isinstance(data, dict):
+            raise TypeError('LazyActivity.from_dict(): data must be a dict, got "%s".' % type(data).__name__)
+        activity = object.__new__(cls)
+        activity._data = data
+        return activity
+
+    def __getattr__(self, name):
+        # Only called for attributes that have not been set yet.
+        data = self.__dict__.get('_data')
+        if data is None:
+            raise AttributeError(name)
+        if name == 'additional_properties':
+            value = {key: item for (key, item) in data.items() if key not in _KEYS}
+        elif name in _ATTRIBUTES:
+            (key, from_dict) = _ATTRIBUTES[name]
+            value = data.get(key)
+            if value is not None:
+                value = from_dict(value)
+        else:
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+        setattr(self, name, value)
+        return value
+
+    @property
+    def is_materialized(self) -> bool:
+        """
+        True once every attribute has been deserialized.
+        :return:
+        """
+        return '_data' not in self.__dict__
+
+    def materialize(self) -> 'LazyActivity':
+        """
+        Deserializes every attribute that has not been read yet and releases the dict. Afterwards the activity
+        holds the same attributes as one created by `Activity.deserialize`.
+        :return:
+        """
+        if '_data' in self.__dict__:
+            for name in _ATTRIBUTES:
+                getattr(self, name)
+            getattr(self, 'additional_properties')
+            del self._data
+        return self
+
+    def __eq__(self, other):
+        if isinstance(other, Activity):
+            self.materialize()
+            if isinstance(other, LazyActivity):
+                other.materialize()
+            return self.__dict__ == other.__dict__
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __str__(self):
+        return str(self.materialize().__dict__)
+
+
+# Serialize through the generated Activity function, which reads, and so materializes, every attribute.
+_TO_DICT[LazyActivity] = _TO_DICT[Activity]
@@ -0,0 +1,47 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import importlib
+import sys
+from typing import Dict, List
+
+
+def make_lazy_module(module_globals: Dict[str, object], exports: Dict[str, str]) -> None:
+    """
+    Makes the public names of a package import their module on first use (PEP 562), so that importing the
+    package doesn't import msrest and the other dependencies of its modules before they're needed. Before
+    Python 3.7, which lacks module level `__getattr__`, every name is imported right away.
+
+    Usage Example:
+    make_lazy_module(globals(), {'ConnectorClient': '.connector_client'})
+    :param module_globals: the `globals()` of the package `__init__`.
+    :param exports: the module each name is imported from, relative to the package.
+    :return:
+    """
+    package = module_globals['__name__']
+    names_by_module: Dict[str, List[str]] = {}
+    for (name, module_name) in exports.items():
+        names_by_module.setdefault(module_name, []).append(name)
+
+    def import_export(name: str):
+        # Every name of the module is set at once, as e.g. msrest looks the models up in the package namespace.
+        module_name = exports[name]
+        module = importlib.import_module(module_name, package)
+        module_globals.update((export, getattr(module, export)) for export in names_by_module[module_name])
+        return module_globals[name]
+
+    if sys.version_info >= (3, 7):
+        def __getattr__(name: str):
+            if name in exports:
+                return import_export(name)
+            raise AttributeError('module %r has no attribute %r' % (package, name))
+
+        def __dir__():
+            return sorted(set(module_globals) | set(exports))
+
+        module_globals['__getattr__'] = __getattr__
+        module_globals['__dir__'] = __dir__
+    else:
+        for name in exports:
+            if name not in module_globals:
+                import_export(name)
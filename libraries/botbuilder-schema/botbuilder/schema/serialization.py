@@ -0,0 +1,359 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Fast serialization of the schema models.
+
+msrest serializes a model by walking its `_attribute_map` and dispatching on the type strings of every
+attribute at runtime. When this module is imported it generates a specialized `to_dict` and `from_dict`
+function for each schema model instead, with the wire keys and type checks of every attribute inlined.
+Values of the types found in JSON take the inlined path; anything else, e.g. a datetime or an enum, is
+handed to msrest, so the results are identical to those of msrest.
+"""
+
+import functools
+import sys
+from typing import Callable, Dict, FrozenSet, List, Tuple, Type
+
+from msrest.serialization import Deserializer, Model, Serializer
+
+from . import Activity
+
+_models: Dict[str, type] = Activity._infer_class_models()
+_serializer = Serializer(_models)
+_deserializer = Deserializer(_models)
+_serialize_data = _serializer.serialize_data
+_deserialize_data = _deserializer.deserialize_data
+_serialize_unicode = Serializer.serialize_unicode
+
+_JSON_SCALARS = (str, int, float, bool)
+
+# Functions generated for each model class. `_TO_DICT[cls](model, model_fallback)` serializes a model;
+# `model_fallback(value, data_type)` serializes an attribute value that isn't a generated model.
+_TO_DICT: Dict[type, Callable] = {}
+_FROM_DICT: Dict[type, Callable] = {}
+_FROM_DICT_BY_NAME: Dict[str, Callable] = {}
+
+
+class _UseMsrest(Exception):
+    """Raised by the fast serializer when only msrest can produce an identical result."""
+
+
+def _use_msrest(value, data_type: str):
+    raise _UseMsrest()
+
+
+def _object_to_dict(value):
+    value_type = type(value)
+    if value is None or value_type in _JSON_SCALARS:
+        return value
+    if value_type is dict:
+        return {key if type(key) is str else _serialize_unicode(key): _object_to_dict(item)
+                for (key, item) in value.items()}
+    if value_type is list:
+        return [_object_to_dict(item) for item in value]
+    to_dict = _TO_DICT.get(value_type)
+    if to_dict is not None:
+        return to_dict(value, _serialize_data)
+    return _serializer.serialize_object(value)
+
+
+def _object_from_dict(value):
+    value_type = type(value)
+    if value is None or value_type in _JSON_SCALARS:
+        return value
+    if value_type is dict:
+        return {key: _object_from_dict(item) for (key, item) in value.items()}
+    if value_type is list:
+        return [_object_from_dict(item) for item in value]
+    return _deserializer.deserialize_object(value)
+
+
+def _model_to_dict(value, data_type: str, model_fallback):
+    to_dict = _TO_DICT.get(type(value))
+    if to_dict is None:
+        return model_fallback(value, data_type)
+    return to_dict(value, model_fallback)
+
+
+def _model_list_to_dict(value, data_type: str, model_fallback):
+    if type(value) is not list:
+        return model_fallback(value, '[%s]' % data_type)
+    return [None if item is None else _model_to_dict(item, data_type, model_fallback) for item in value]
+
+
+def _model_dict_to_dict(value, data_type: str, model_fallback):
+    if type(value) is not dict:
+        return model_fallback(value, '{%s}' % data_type)
+    return {key if type(key) is str else _serialize_unicode(key):
+            None if item is None else _model_to_dict(item, data_type, model_fallback)
+            for (key, item) in value.items()}
+
+
+# The model helpers take the table of `from_dict` functions, and the msrest fallback, as arguments so that the
+# functions generated for other model classes, e.g. the slotted models, can bind their own.
+def _model_from_dict(value, data_type: str, from_dict_by_name=_FROM_DICT_BY_NAME, deserialize_data=_deserialize_data):
+    if type(value) is dict:
+        return from_dict_by_name[data_type](value)
+    return deserialize_data(value, data_type)
+
+
+def _model_list_from_dict(value, data_type: str, from_dict_by_name=_FROM_DICT_BY_NAME,
+                          deserialize_data=_deserialize_data):
+    if type(value) is not list:
+        return deserialize_data(value, '[%s]' % data_type)
+    from_dict = from_dict_by_name[data_type]
+    return [from_dict(item) if type(item) is dict else deserialize_data(item, data_type) for item in value]
+
+
+def _model_dict_from_dict(value, data_type: str, from_dict_by_name=_FROM_DICT_BY_NAME,
+                          deserialize_data=_deserialize_data):
+    if type(value) is not dict:
+        return deserialize_data(value, '{%s}' % data_type)
+    from_dict = from_dict_by_name[data_type]
+    return {key: from_dict(item) if type(item) is dict else deserialize_data(item, data_type)
+            for (key, item) in value.items()}
+
+
+def _scalar_list_to_dict(value, data_type: str):
+    if type(value) is not list:
+        return _serialize_data(value, '[%s]' % data_type)
+    scalar_type = _SCALAR_TYPES[data_type]
+    return [item if type(item) is scalar_type or item is None else _serialize_data(item, data_type)
+            for item in value]
+
+
+def _scalar_list_from_dict(value, data_type: str):
+    if type(value) is not list:
+        return _deserialize_data(value, '[%s]' % data_type)
+    scalar_type = _SCALAR_TYPES[data_type]
+    return [item if type(item) is scalar_type or item is None else _deserialize_data(item, data_type)
+            for item in value]
+
+
+def _object_dict_to_dict(value):
+    if type(value) is not dict:
+        return _serialize_data(value, '{object}')
+    return _object_to_dict(value)
+
+
+def _object_dict_from_dict(value):
+    if type(value) is not dict:
+        return _deserialize_data(value, '{object}')
+    return _object_from_dict(value)
+
+
+_SCALAR_TYPES = {'str': str, 'bool': bool, 'int': int, 'float': float}
+
+
+def _to_dict_expression(data_type: str) -> str:
+    if data_type in _SCALAR_TYPES:
+        return 'value if type(value) is %s else _serialize_data(value, %r)' % (data_type, data_type)
+    if data_type == 'object':
+        return '_object_to_dict(value)'
+    if data_type == '{object}':
+        return '_object_dict_to_dict(value)'
+    if data_type.startswith('['):
+        item_type = data_type[1:-1]
+        if item_type in _SCALAR_TYPES:
+            return '_scalar_list_to_dict(value, %r)' % item_type
+        if item_type in _generated_names:
+            return '_model_list_to_dict(value, %r, model_fallback)' % item_type
+    elif data_type.startswith('{'):
+        if data_type[1:-1] in _generated_names:
+            return '_model_dict_to_dict(value, %r, model_fallback)' % data_type[1:-1]
+    elif data_type in _generated_names:
+        return '_model_to_dict(value, %r, model_fallback)' % data_type
+    return '_serialize_data(value, %r)' % data_type
+
+
+def _from_dict_expression(data_type: str) -> str:
+    if data_type in _SCALAR_TYPES:
+        return 'value if type(value) is %s else _deserialize_data(value, %r)' % (data_type, data_type)
+    if data_type == 'object':
+        return '_object_from_dict(value)'
+    if data_type == '{object}':
+        return '_object_dict_from_dict(value)'
+    if data_type.startswith('['):
+        item_type = data_type[1:-1]
+        if item_type in _SCALAR_TYPES:
+            return '_scalar_list_from_dict(value, %r)' % item_type
+        if item_type in _generated_names:
+            return '_model_list_from_dict(value, %r)' % item_type
+    elif data_type.startswith('{'):
+        if data_type[1:-1] in _generated_names:
+            return '_model_dict_from_dict(value, %r)' % data_type[1:-1]
+    elif data_type in _generated_names:
+        return '_model_from_dict(value, %r)' % data_type
+    return '_deserialize_data(value, %r)' % data_type
+
+
+def _to_dict_source(model_type: Type[Model]) -> List[str]:
+    lines = ['def to_dict_%s(model, model_fallback):' % model_type.__name__,
+             '    result = {}']
+    for (attr, desc) in model_type._attribute_map.items():
+        lines += ['    value = model.%s' % attr,
+                  '    if value is not None:',
+                  '        result[%r] = %s' % (desc['key'], _to_dict_expression(desc['type']))]
+    return lines + ['    return result', '']
+
+
+def _from_dict_source(model_type: Type[Model], interned: FrozenSet[str] = frozenset()) -> List[str]:
+    name = model_type.__name__
+    lines = ['def from_dict_%s(data):' % name,
+             '    model = _new(%s)' % name]
+    for (attr, desc) in model_type._attribute_map.items():
+        expression = _from_dict_expression(desc['type'])
+        if attr in interned and desc['type'] == 'str':
+            expression = '_intern(value) if type(value) is str else _deserialize_data(value, \'str\')'
+        lines += ['    value = data.get(%r)' % desc['key'],
+                  '    model.%s = None if value is None else %s' % (attr, expression)]
+    keys = {desc['key'] for desc in model_type._attribute_map.values()}
+    return lines + ['    model.additional_properties = {key: value for (key, value) in data.items() if key not in %r}'
+                    % (keys,),
+                    '    return model',
+                    '']
+
+
+def generate_source(model_type: Type[Model]) -> str:
+    """
+    Returns the source of the `to_dict` and `from_dict` functions generated for a model class.
+    :param model_type:
+    :return:
+    """
+    return '\n'.join(_to_dict_source(model_type) + [''] + _from_dict_source(model_type))
+
+
+def _generate(model_type: Type[Model]) -> None:
+    namespace = dict(globals())
+    namespace[model_type.__name__] = model_type
+    namespace['_new'] = object.__new__
+    exec(compile(generate_source(model_type), '<%s serialization>' % model_type.__name__, 'exec'), namespace)
+    _TO_DICT[model_type] = namespace['to_dict_%s' % model_type.__name__]
+    _FROM_DICT[model_type] = _FROM_DICT_BY_NAME[model_type.__name__] = namespace['from_dict_%s' % model_type.__name__]
+
+
+def _generate_from_dict_functions(model_types: Dict[str, type],
+                                  interned: Dict[str, FrozenSet[str]]) -> Dict[str, Callable]:
+    """
+    Generates a `from_dict` function for each of the given model classes, which must be variants of the schema
+    models with the same names and attributes. Nested models are created from the given classes too, and the
+    string attributes listed in `interned` are interned with `sys.intern`.
+    """
+    from_dict_by_name = {}
+    deserialize_data = Deserializer(model_types).deserialize_data
+    namespace = dict(globals())
+    namespace.update(model_types)
+    namespace['_new'] = object.__new__
+    namespace['_intern'] = sys.intern
+    namespace['_deserialize_data'] = deserialize_data
+    for helper in (_model_from_dict, _model_list_from_dict, _model_dict_from_dict):
+        namespace[helper.__name__] = functools.partial(helper, from_dict_by_name=from_dict_by_name,
+                                                       deserialize_data=deserialize_data)
+    for (name, model_type) in model_types.items():
+        source = '\n'.join(_from_dict_source(model_type, interned.get(name, frozenset())))
+        exec(compile(source, '<%s serialization>' % name, 'exec'), namespace)
+        from_dict_by_name[name] = namespace['from_dict_%s' % name]
+    return from_dict_by_name
+
+
+def _attribute_from_dict_functions(model_type: Type[Model]) -> Dict[str, Tuple[str, Callable]]:
+    """
+    Returns the wire key and a generated `from_dict` function for each attribute of a model class, for
+    deserializing the attributes one at a time.
+    """
+    namespace = dict(globals())
+    return {attr: (desc['key'], eval('lambda value: %s' % _from_dict_expression(desc['type']), namespace))
+            for (attr, desc) in model_type._attribute_map.items()}
+
+
+def _is_generated_model(model_type) -> bool:
+    return isinstance(model_type, type) and issubclass(model_type, Model) and model_type is not Model \
+        and not model_type._validation and not model_type._subtype_map and \
+        not any(desc['key'] == '' or '.' in desc['key'] for desc in model_type._attribute_map.values())
+
+
+_generated_names = {name for (name, model_type) in _models.items() if _is_generated_model(model_type)}
+for _name in sorted(_generated_names):
+    _generate(_models[_name])
+
+
+def to_dict(model: Model) -> dict:
+    """
+    Serializes a schema model into the dict sent on the wire. Produces the same result as `model.serialize()`.
+
+    Usage Example:
+    body = to_dict(activity)
+    :param model:
+    :return:
+    """
+    serialize = _TO_DICT.get(type(model))
+    if serialize is None:
+        return model.serialize()
+    return serialize(model, _serialize_data)
+
+
+def from_dict(model_type: Type[Model], data: dict) -> Model:
+    """
+    Deserializes a schema model from the dict received on the wire. Produces the same result as
+    `model_type.deserialize(data)`.
+
+    Usage Example:
+    activity = from_dict(Activity, request_body)
+    :param model_type:
+    :param data:
+    :return:
+    """
+    deserialize = _FROM_DICT.get(model_type)
+    if deserialize is None or type(data) is not dict:
+        return model_type.deserialize(data)
+    return deserialize(data)
+
+
+class ModelSerializer(Serializer):
+    """
+    A msrest `Serializer` that serializes request bodies with the generated functions when it can.
+
+    Given a `JsonCodec`, request bodies are also encoded into JSON bytes, which msrest sends as is.
+    """
+    def __init__(self, classes=None, codec=None):
+        super(ModelSerializer, self).__init__(classes)
+        self._codec = codec
+
+    def body(self, data, data_type, **kwargs):
+        result = self._body(data, data_type, **kwargs)
+        if self._codec is None or result is None:
+            return result
+        return self._codec.dumps(result)
+
+    def _body(self, data, data_type, **kwargs):
+        serialize = _TO_DICT.get(type(data))
+        if serialize is not None and not kwargs and self.dependencies.get(type(data).__name__) is type(data):
+            try:
+                # msrest first converts dicts found in model typed attributes into models; leave those to it.
+                return serialize(data, _use_msrest)
+            except _UseMsrest:
+                pass
+        return super(ModelSerializer, self).body(data, data_type, **kwargs)
+
+
+class ModelDeserializer(Deserializer):
+    """
+    A msrest `Deserializer` that deserializes response bodies with the generated functions when it can.
+    """
+    def __call__(self, target_obj, response_data, content_type=None):
+        data = self._unpack_content(response_data, content_type)
+        if isinstance(target_obj, str):
+            if target_obj.startswith('[') and type(data) is list:
+                deserialize = _FROM_DICT_BY_NAME.get(target_obj[1:-1])
+                if deserialize is not None and self._is_schema_model(target_obj[1:-1]) and \
+                        all(type(item) is dict for item in data):
+                    return [deserialize(item) for item in data]
+            elif type(data) is dict:
+                deserialize = _FROM_DICT_BY_NAME.get(target_obj)
+                if deserialize is not None and self._is_schema_model(target_obj):
+                    return deserialize(data)
+        return self._deserialize(target_obj, data)
+
+    def _is_schema_model(self, name: str) -> bool:
+        return self.dependencies.get(name) is _models.get(name)
@@ -0,0 +1,145 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+"""
+Memory-compact variants of the schema models.
+
+For each schema model this module generates a subclass of the same name that stores its attributes in
+`__slots__` instead of a per-instance `__dict__`, e.g. `slotted_models.Activity`. Being subclasses, they can be
+used anywhere the schema models are and serialize like them. Deserializing into them with `from_dict` also
+interns the strings that repeat across activities, such as channel ids, service urls and account ids, so that
+activities kept in memory share a single copy of each.
+"""
+
+import sys
+from typing import Dict, FrozenSet, Type
+
+from msrest.serialization import Model
+
+from .serialization import _TO_DICT, _generate_from_dict_functions, _generated_names, _models
+
+# The string attributes interned in every model, and the additional ones interned per model.
+INTERNED_ATTRIBUTES: FrozenSet[str] = frozenset([
+    'type', 'channel_id', 'service_url', 'locale', 'text_format', 'input_hint', 'delivery_mode', 'importance',
+    'attachment_layout', 'content_type', 'role', 'aad_object_id', 'conversation_type', 'tenant_id'])
+INTERNED_MODEL_ATTRIBUTES: Dict[str, FrozenSet[str]] = {
+    'ChannelAccount': frozenset(['id', 'name']),
+    'ConversationAccount': frozenset(['id', 'name']),
+    'ConversationReference': frozenset(['activity_id']),
+}
+
+
+class _SlottedModel(object):
+    """
+    Compares and prints the attributes held in slots, where msrest's `Model` uses the instance `__dict__`.
+    """
+    __slots__ = ()
+
+    def _attribute_values(self) -> dict:
+        values = {attr: getattr(self, attr, None) for attr in self._attribute_map}
+        values['additional_properties'] = getattr(self, 'additional_properties', None)
+        return values
+
+    def __eq__(self, other):
+        if isinstance(other, _SLOTTED_BASES.get(type(self), type(self))):
+            if isinstance(other, _SlottedModel):
+                return self._attribute_values() == other._attribute_values()
+            return self._attribute_values() == {attr: getattr(other, attr, None) for attr in self._attribute_values()}
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __str__(self):
+        return str(self._attribute_values())
+
+    @classmethod
+    def _infer_class_models(cls):
+        # Used by `deserialize()`, so that nested models are created slotted too.
+        return _SLOTTED_MODELS
+
+
+def _create_slotted_class(model_type: Type[Model]) -> type:
+    slots = tuple(attr for attr in model_type._attribute_map if attr != 'additional_properties')
+    return type(model_type.__name__, (_SlottedModel, model_type), {
+        '__slots__': slots + ('additional_properties',),
+        '__module__': __name__,
+        '__doc__': 'A variant of `%s` that stores its attributes in slots.' % model_type.__name__,
+    })
+
+
+_SLOTTED: Dict[type, type] = {}
+_SLOTTED_BASES: Dict[type, type] = {}
+for _name in sorted(_generated_names):
+    _slotted = _create_slotted_class(_models[_name])
+    _SLOTTED[_models[_name]] = _slotted
+    _SLOTTED_BASES[_slotted] = _models[_name]
+    # Serialize through the functions generated for the base class, and make the class importable by name.
+    _TO_DICT[_slotted] = _TO_DICT[_models[_name]]
+    globals()[_name] = _slotted
+
+_SLOTTED_MODELS: Dict[str, type] = dict(_models, **{slotted.__name__: slotted for slotted in _SLOTTED.values()})
+_INTERNED: Dict[str, FrozenSet[str]] = {
+    name: INTERNED_ATTRIBUTES | INTERNED_MODEL_ATTRIBUTES.get(name, frozenset()) for name in _generated_names}
+_FROM_DICT_BY_NAME = _generate_from_dict_functions(
+    {slotted.__name__: slotted for slotted in _SLOTTED.values()}, _INTERNED)
+
+
+def slotted_class(model_type: Type[Model]) -> type:
+    """
+    Returns the slotted variant of a schema model class, or of the schema model a class derives from.
+    :param model_type:
+    :return:
+    """
+    if model_type in _SLOTTED_BASES:
+        return model_type
+    for klass in model_type.__mro__:
+        if klass in _SLOTTED:
+            return _SLOTTED[klass]
+    raise TypeError('slotted_class(): "%s" is not a schema model with a slotted variant.' % model_type.__name__)
+
+
+def from_dict(model_type: Type[Model], data: dict) -> Model:
+    """
+    Deserializes the dict received on the wire into the slotted variant of a schema model, interning the strings
+    that repeat across activities.
+
+    Usage Example:
+    activity = from_dict(Activity, request_body)
+    :param model_type:
+    :param data:
+    :return:
+    """
+    slotted = slotted_class(model_type)
+    if type(data) is not dict:
+        return slotted.deserialize(data)
+    return _FROM_DICT_BY_NAME[slotted.__name__](data)
+
+
+def _compact_value(value):
+    value_type = type(value)
+    if value_type is list:
+        return [_compact_value(item) for item in value]
+    if value_type is dict:
+        return {key: _compact_value(item) for (key, item) in value.items()}
+    if isinstance(value, Model) and (value_type in _SLOTTED or value_type in _SLOTTED_BASES):
+        return compact(value)
+    return value
+
+
+def compact(model: Model) -> Model:
+    """
+    Returns a copy of a schema model made of slotted models with interned strings, e.g. before keeping the
+    activity in a transcript buffer. Nested models, lists and dicts are copied, other values are shared.
+    :param model:
+    :return:
+    """
+    slotted = slotted_class(type(model))
+    interned = _INTERNED[slotted.__name__]
+    result = object.__new__(slotted)
+    for attr in model._attribute_map:
+        value = getattr(model, attr, None)
+        setattr(result, attr, sys.intern(value) if attr in interned and type(value) is str else _compact_value(value))
+    additional_properties = getattr(model, 'additional_properties', None)
+    result.additional_properties = None if additional_properties is None else _compact_value(additional_properties)
+    return result
@@ -7,6 +7,9 @@ from setuptools import setup
 NAME = "botbuilder-schema"
 VERSION = os.environ["packageVersion"] if "packageVersion" in os.environ else "4.0.0.a6"
 REQUIRES = ["msrest>=0.6.6"]
+# Optional. JsonCodec uses orjson and BinaryCodec msgpack when they are installed, e.g. with
+# `pip install botbuilder-schema[orjson,msgpack]`.
+EXTRAS_REQUIRE = {"orjson": ["orjson>=3.0"], "msgpack": ["msgpack>=1.0"]}
 
 setup(
     name=NAME,
@@ -18,6 +21,7 @@ setup(
     long_description="This package contains the schema classes for using the Bot Framework.",
     license='MIT',
     install_requires=REQUIRES,
+    extras_require=EXTRAS_REQUIRE,
     packages=["botbuilder.schema"],
     include_package_data=True,
     classifiers=[
@@ -0,0 +1,204 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import copy
+import datetime
+
+import pytest
+
+from botbuilder.schema import Activity, Attachment, ChannelAccount, ConversationReference, HeroCard, RoleTypes
+from botbuilder.schema import slotted_models
+from botbuilder.schema import binary_codec
+from botbuilder.schema.binary_codec import BinaryCodec
+from botbuilder.schema.json_codec import JsonCodec
+from botbuilder.schema.lazy_activity import LazyActivity
+from botbuilder.schema.serialization import from_dict
+
+ACTIVITY = {
+    'type': 'message',
+    'id': '1234',
+    'timestamp': '2019-04-01T10:20:30.123456Z',
+    'localTimestamp': '2019-04-01T12:20:30+02:00',
+    'serviceUrl': 'https://example.org',
+    'channelId': 'msteams',
+    'from': {'id': 'user', 'name': 'User', 'extra': True},
+    'conversation': {'id': 'convo', 'isGroup': True},
+    'recipient': {'id': 'bot', 'name': 'Bot'},
+    'membersAdded': [{'id': 'a'}, None],
+    'text': 'hi <at>Bot</at> ' + 'x' * 300,
+    'entities': [{'type': 'mention', 'mentioned': {'id': 'bot'}, 'text': '<at>Bot</at>'}],
+    'channelData': {'tenant': {'id': 't'}, 'list': [1, -1, 2 ** 40, -2 ** 40, 1.5, None, False]},
+    'value': list(range(20)),
+    'unknownProperty': {'kept': 'as additional property'},
+}
+
+CODEC = BinaryCodec()
+
+
+class EvolvedChannelAccount(ChannelAccount):
+    """
+    A later version of ChannelAccount, which dropped `role` and added `nickname`.
+    """
+    _attribute_map = {key: value for (key, value) in ChannelAccount._attribute_map.items() if key != 'role'}
+    _attribute_map['nickname'] = {'key': 'nickname', 'type': 'str'}
+
+    def __init__(self, *, nickname: str = None, **kwargs):
+        super(EvolvedChannelAccount, self).__init__(**kwargs)
+        self.nickname = nickname
+
+
+def create_activity() -> Activity:
+    return from_dict(Activity, copy.deepcopy(ACTIVITY))
+
+
+class TestBinaryCodec:
+    codec = CODEC
+
+    def test_should_roundtrip_activity(self):
+        activity = create_activity()
+
+        decoded = self.codec.decode(Activity, self.codec.encode(activity))
+
+        assert decoded == activity
+        assert decoded.additional_properties == {'unknownProperty': {'kept': 'as additional property'}}
+        assert decoded.from_property.additional_properties == {'extra': True}
+        assert decoded.local_timestamp.utcoffset() == datetime.timedelta(hours=2)
+
+    def test_should_be_smaller_than_json(self):
+        activity = create_activity()
+
+        assert len(self.codec.encode(activity)) < len(JsonCodec('json').encode(activity))
+
+    def test_should_keep_models_in_untyped_attributes(self):
+        activity = Activity(type='message', attachments=[
+            Attachment(content_type='application/vnd.microsoft.card.hero', content=HeroCard(title='card'))])
+
+        decoded = self.codec.loads(self.codec.dumps(activity))
+
+        assert isinstance(decoded.attachments[0].content, HeroCard)
+        assert decoded == activity
+
+    def test_should_roundtrip_state_values(self):
+        state = {
+            'e_tag': '*',
+            'reference': ConversationReference(channel_id='test', user=ChannelAccount(id='user')),
+            'when': datetime.datetime(2019, 4, 1, 10, 20, 30, 5),
+            'counts': (1, 2 ** 63 - 1, -2 ** 63),
+            'blob': b'\x00\x01' * 200,
+            'nested': {1: [{}, [], '']},
+        }
+
+        decoded = self.codec.loads(self.codec.dumps(state))
+
+        assert decoded == dict(state, counts=list(state['counts']))
+
+    def test_should_write_messagepack(self):
+        assert self.codec.dumps({'a': [1, -1, None, True, 1.5]})[2:] == \
+            b'\x81\xa1a\x95\x01\xff\xc0\xc3\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00'
+
+    def test_should_stream_many_records(self):
+        activities = [Activity(type='message', text='message %s' % i) for i in range(100)]
+
+        data = self.codec.dumps_many(activities)
+
+        assert list(self.codec.iter_loads(data)) == activities
+        assert list(self.codec.iter_loads(self.codec.dumps_many([]))) == []
+
+    def test_should_encode_derived_models_as_schema_models(self):
+        lazy = LazyActivity.from_dict(copy.deepcopy(ACTIVITY))
+        slotted = slotted_models.from_dict(Activity, copy.deepcopy(ACTIVITY))
+
+        assert type(self.codec.loads(self.codec.dumps(lazy))) is Activity
+        assert self.codec.dumps(slotted) == self.codec.dumps(create_activity())
+
+    def test_is_exact_should_tell_values_restored_with_other_types(self):
+        assert self.codec.is_exact({'activity': create_activity(), 1: [datetime.datetime(2019, 4, 1), b'x', 1.5]})
+        assert not self.codec.is_exact({'position': (1, 2)})
+        assert not self.codec.is_exact({'when': datetime.date(2019, 4, 1)})
+        assert not self.codec.is_exact(LazyActivity.from_dict(copy.deepcopy(ACTIVITY)))
+        assert not self.codec.is_exact(Activity(text=object()))
+
+    def test_should_decode_into_given_model_types(self):
+        codec = BinaryCodec(slotted_models._SLOTTED_MODELS, self.codec.backend)
+
+        decoded = codec.loads(self.codec.dumps(create_activity()))
+
+        assert type(decoded) is slotted_models.Activity
+        assert type(decoded.from_property) is slotted_models.ChannelAccount
+        assert decoded == create_activity()
+
+    def test_should_write_stable_ids(self):
+        # Activity is class 1, and type its field 0, whatever the order of the models and attributes.
+        assert self.codec.dumps(Activity(type='message'))[2:] == b'\xc7\x0b\x01\x01\x81\x00\xa7message'
+
+    def test_should_decode_records_of_other_schema_versions(self):
+        evolved = BinaryCodec({'ChannelAccount': EvolvedChannelAccount})
+
+        decoded = evolved.loads(self.codec.dumps(ChannelAccount(id='user', role='bot')))
+        assert (type(decoded), decoded.id, decoded.nickname) == (EvolvedChannelAccount, 'user', None)
+        assert not hasattr(decoded, 'role')
+
+        decoded = self.codec.loads(evolved.dumps(EvolvedChannelAccount(id='user', nickname='nick')))
+        assert (decoded.id, decoded.role) == ('user', None)
+        assert decoded.additional_properties == {'nickname': 'nick'}
+
+    def test_should_skip_unknown_field_ids(self):
+        body = binary_codec._pack_int(11) + b'\x82\x00' + binary_codec._pack_str('user') + \
+            b'\x63' + binary_codec._pack_str('future')
+        data = binary_codec._HEADER + binary_codec._ext_header(len(body), 1) + body
+
+        assert self.codec.loads(data) == ChannelAccount(id='user')
+
+    def test_should_raise_value_error_for_truncated_data(self):
+        data = self.codec.dumps({'text': 'x' * 40, 'count': 2 ** 40, 'blob': b'\x00' * 300,
+                                 'activity': create_activity()})
+
+        for end in range(len(binary_codec._HEADER), len(data)):
+            with pytest.raises(ValueError):
+                self.codec.loads(data[:end])
+        with pytest.raises(ValueError):
+            list(self.codec.iter_loads(data[:-1]))
+
+    def test_should_raise_value_error_for_corrupt_data(self):
+        body = binary_codec._pack_int(11) + b'\x81\xff' + binary_codec._pack_str('user')
+        with pytest.raises(ValueError):
+            self.codec.loads(binary_codec._HEADER + binary_codec._ext_header(len(body), 1) + body)
+        with pytest.raises(ValueError):
+            self.codec.loads(self.codec.dumps(create_activity())[:-10])
+
+    def test_should_reject_foreign_data(self):
+        with pytest.raises(ValueError):
+            self.codec.loads(b'{"type": "message"}')
+        with pytest.raises(ValueError):
+            self.codec.loads(b'\xc1\x00\x00\x00\x00\xc0')
+        with pytest.raises(ValueError):
+            self.codec.loads(self.codec.dumps_many([1, 2]))
+
+    def test_decode_should_check_model_type(self):
+        with pytest.raises(TypeError):
+            self.codec.decode(Activity, self.codec.dumps(ChannelAccount(id='user')))
+
+    def test_should_raise_for_unsupported_values(self):
+        with pytest.raises(TypeError):
+            self.codec.dumps({'value': object()})
+        with pytest.raises(OverflowError):
+            self.codec.dumps(2 ** 64)
+
+
+class TestPythonBinaryCodec(TestBinaryCodec):
+    codec = BinaryCodec(backend='python')
+
+    @pytest.mark.skipif(binary_codec.msgpack is None, reason='requires the msgpack package')
+    def test_should_write_the_same_bytes_as_msgpack(self):
+        values = [create_activity(), slotted_models.from_dict(Activity, copy.deepcopy(ACTIVITY)),
+                  {'when': datetime.datetime(2019, 4, 1), 'blob': b'1234', 'ints': (1, -2 ** 40)},
+                  {'role': RoleTypes.bot, 'accounts': (ChannelAccount(id='a'),)}]
+
+        for value in values:
+            data = self.codec.dumps(value)
+            assert data == CODEC.dumps(value)
+            assert CODEC.loads(data) == self.codec.loads(data)
+
+    def test_should_reject_unknown_backend(self):
+        with pytest.raises(ValueError):
+            BinaryCodec(backend='cbor')
@@ -0,0 +1,87 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import codecs
+import copy
+import datetime
+import json
+
+import pytest
+
+from botbuilder.schema import Activity, ActivityTypes, ChannelAccount, ResourceResponse
+from botbuilder.schema import json_codec
+from botbuilder.schema.json_codec import JsonCodec
+
+ACTIVITY = {
+    'type': 'message',
+    'id': '1234',
+    'timestamp': '2019-04-01T10:20:30.123456Z',
+    'serviceUrl': 'https://example.org',
+    'channelId': 'msteams',
+    'from': {'id': 'user', 'name': 'Üser'},
+    'conversation': {'id': 'convo', 'isGroup': True},
+    'recipient': {'id': 'bot', 'name': 'Bot'},
+    'text': 'hi 👋',
+    'channelData': {'list': [1, 'two', None, {'three': 3.5}]},
+    'unknownProperty': {'kept': 'as additional property'},
+}
+
+BACKENDS = ['json', pytest.param('orjson', marks=pytest.mark.skipif(json_codec.orjson is None,
+                                                                  reason='orjson is not installed'))]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+class TestJsonCodec:
+    def test_decode_activity_should_match_msrest(self, backend):
+        data = json.dumps(ACTIVITY).encode('utf-8')
+
+        activity = JsonCodec(backend).decode_activity(data)
+
+        expected = Activity.deserialize(copy.deepcopy(ACTIVITY))
+        assert activity == expected
+        assert activity.additional_properties == expected.additional_properties
+        assert activity.from_property.name == 'Üser'
+
+    def test_decode_should_accept_str_and_byte_order_mark(self, backend):
+        codec = JsonCodec(backend)
+        data = json.dumps({'id': '1'})
+
+        assert codec.decode(ResourceResponse, data) == ResourceResponse(id='1')
+        assert codec.decode(ResourceResponse, codecs.BOM_UTF8 + data.encode('utf-8')) == ResourceResponse(id='1')
+
+    def test_encode_activity_should_match_msrest(self, backend):
+        activity = Activity.deserialize(copy.deepcopy(ACTIVITY))
+
+        data = JsonCodec(backend).encode_activity(activity)
+
+        assert isinstance(data, bytes)
+        assert json.loads(data.decode('utf-8')) == activity.serialize()
+
+    def test_encode_should_roundtrip(self, backend):
+        codec = JsonCodec(backend)
+        activity = Activity(type=ActivityTypes.message, text='hi', from_property=ChannelAccount(id='bot'))
+
+        assert codec.decode_activity(codec.encode(activity)) == activity
+
+    def test_dumps_should_fall_back_for_large_integers(self, backend):
+        assert JsonCodec(backend).dumps({'value': 2 ** 70}) == b'{"value":1180591620717411303424}'
+
+    def test_strict_dumps_should_reject_datetimes(self, backend):
+        with pytest.raises(TypeError):
+            JsonCodec(backend).dumps({'when': datetime.datetime(2019, 4, 1)}, strict=True)
+
+
+class TestJsonCodecBackend:
+    def test_should_default_to_fastest_backend(self):
+        assert JsonCodec().backend == ('json' if json_codec.orjson is None else 'orjson')
+
+    def test_should_raise_for_unknown_backend(self):
+        with pytest.raises(ValueError):
+            JsonCodec('simplejson')
+
+    def test_should_raise_when_orjson_is_missing(self, monkeypatch):
+        monkeypatch.setattr(json_codec, 'orjson', None)
+
+        with pytest.raises(ImportError):
+            JsonCodec('orjson')
+        assert JsonCodec().backend == 'json'
@@ -0,0 +1,110 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import copy
+import datetime
+import json
+import pickle
+
+import pytest
+
+from msrest import Serializer
+
+from botbuilder.schema import Activity, ChannelAccount, Mention
+from botbuilder.schema.json_codec import JsonCodec
+from botbuilder.schema.lazy_activity import LazyActivity
+from botbuilder.schema.serialization import ModelSerializer, to_dict
+
+ACTIVITY = {
+    'type': 'message',
+    'id': '1234',
+    'timestamp': '2019-04-01T10:20:30.123456Z',
+    'channelId': 'msteams',
+    'from': {'id': 'user', 'name': 'User'},
+    'conversation': {'id': 'convo', 'isGroup': True},
+    'recipient': {'id': 'bot', 'name': 'Bot'},
+    'text': 'hi <at>Bot</at>',
+    'entities': [{'type': 'mention', 'mentioned': {'id': 'bot'}, 'text': '<at>Bot</at>'}] * 3,
+    'channelData': {'tenant': {'id': 't'}},
+    'unknownProperty': {'kept': 'as additional property'},
+}
+
+
+def create_activity() -> LazyActivity:
+    return LazyActivity.from_dict(copy.deepcopy(ACTIVITY))
+
+
+class TestLazyActivity:
+    def test_should_be_an_activity(self):
+        assert isinstance(create_activity(), Activity)
+
+    def test_should_only_deserialize_attributes_read(self):
+        activity = create_activity()
+
+        assert activity.type == 'message'
+        assert activity.from_property.id == 'user'
+        assert activity.conversation.id == 'convo'
+        assert 'from_property' in activity.__dict__
+        assert 'entities' not in activity.__dict__
+        assert 'timestamp' not in activity.__dict__
+        assert not activity.is_materialized
+
+    def test_attributes_should_match_msrest(self):
+        activity = create_activity()
+        expected = Activity.deserialize(copy.deepcopy(ACTIVITY))
+
+        assert isinstance(activity.timestamp, datetime.datetime)
+        assert activity.timestamp == expected.timestamp
+        assert activity.entities == expected.entities
+        assert activity.channel_data == expected.channel_data
+        assert activity.additional_properties == {'unknownProperty': {'kept': 'as additional property'}}
+        assert activity.local_timestamp is None
+
+    def test_should_equal_deserialized_activity(self):
+        expected = Activity.deserialize(copy.deepcopy(ACTIVITY))
+
+        assert expected == create_activity()
+        assert create_activity() == expected
+        assert create_activity() == create_activity()
+        assert create_activity() != Activity(type='message')
+
+    def test_assigned_attributes_should_win(self):
+        activity = create_activity()
+        activity.text = 'changed'
+        activity.entities = [Mention(mentioned=ChannelAccount(id='user'), type='mention')]
+
+        activity.materialize()
+
+        assert activity.is_materialized
+        assert activity.text == 'changed'
+        assert activity.entities[0].mentioned.id == 'user'
+
+    def test_should_serialize_like_activity(self):
+        expected = Activity.deserialize(copy.deepcopy(ACTIVITY)).serialize()
+
+        assert to_dict(create_activity()) == expected
+        assert create_activity().serialize() == expected
+        assert ModelSerializer(Activity._infer_class_models()).body(create_activity(), 'Activity') == \
+            Serializer(Activity._infer_class_models()).body(Activity.deserialize(copy.deepcopy(ACTIVITY)), 'Activity')
+
+    def test_should_copy_and_pickle(self):
+        activity = create_activity()
+        assert activity.text
+
+        for clone in [copy.copy(activity), copy.deepcopy(activity), pickle.loads(pickle.dumps(activity))]:
+            assert clone.entities == activity.entities
+            assert clone == activity
+
+    def test_unknown_attribute_should_raise(self):
+        with pytest.raises(AttributeError):
+            create_activity().not_an_attribute  # pylint: disable=expression-not-assigned
+
+    def test_from_dict_should_require_a_dict(self):
+        with pytest.raises(TypeError):
+            LazyActivity.from_dict(json.dumps(ACTIVITY))
+
+    def test_codec_should_decode_lazily(self):
+        activity = JsonCodec('json').decode_activity(json.dumps(ACTIVITY).encode('utf-8'), lazy=True)
+
+        assert isinstance(activity, LazyActivity)
+        assert activity.text == 'hi <at>Bot</at>'
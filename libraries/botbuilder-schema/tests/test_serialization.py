@@ -0,0 +1,106 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import copy
+import datetime
+import json
+
+from msrest import Deserializer, Serializer
+
+from botbuilder.schema import (Activity, ActivityTypes, Attachment, CardAction, ChannelAccount,
+                               ConversationAccount, ConversationParameters, Entity, Mention, ResourceResponse,
+                               SuggestedActions)
+from botbuilder.schema.json_codec import JsonCodec
+from botbuilder.schema.serialization import (ModelDeserializer, ModelSerializer, from_dict, generate_source,
+                                             to_dict)
+
+MODELS = Activity._infer_class_models()
+
+ACTIVITY = {
+    'type': 'message',
+    'id': 5,
+    'timestamp': '2019-04-01T10:20:30.123456Z',
+    'localTimestamp': '2019-04-01T12:20:30+02:00',
+    'serviceUrl': 'https://example.org',
+    'channelId': 'msteams',
+    'from': {'id': 'user', 'name': 'User', 'aadObjectId': 'aad', 'role': 'user', 'extra': True},
+    'conversation': {'id': 'convo', 'isGroup': 'true', 'conversationType': 'channel', 'tenantId': 't'},
+    'recipient': {'id': 'bot', 'name': 'Bot'},
+    'membersAdded': [{'id': 'a'}, None],
+    'text': 'hi <at>Bot</at>',
+    'attachments': [{'contentType': 'application/vnd.microsoft.card.hero',
+                     'content': {'title': 'card', 'buttons': [{'type': 'imBack', 'value': 1.5}]}}],
+    'entities': [{'type': 'mention', 'mentioned': {'id': 'bot'}, 'text': '<at>Bot</at>'}],
+    'channelData': {'tenant': {'id': 't'}, 'list': [1, 'two', None, {'three': 3}]},
+    'suggestedActions': {'to': ['user'], 'actions': [{'type': 'imBack', 'title': 'Yes', 'value': 'yes'}]},
+    'value': [1, 2, 3],
+    'listenFor': ['yes', 'no'],
+    'textHighlights': [{'text': 'hi', 'occurrence': 1}],
+    'reactionsAdded': [{'type': 'like'}],
+    'unknownProperty': {'kept': 'as additional property'},
+}
+
+
+class TestSerialization:
+    def test_from_dict_should_match_msrest(self):
+        expected = Activity.deserialize(copy.deepcopy(ACTIVITY))
+        actual = from_dict(Activity, copy.deepcopy(ACTIVITY))
+
+        assert actual == expected
+        assert actual.additional_properties == expected.additional_properties
+        assert actual.from_property.additional_properties == {'extra': True}
+        assert actual.id == '5'
+        assert actual.conversation.is_group is True
+        assert isinstance(actual.timestamp, datetime.datetime)
+
+    def test_to_dict_should_match_msrest(self):
+        activity = Activity.deserialize(copy.deepcopy(ACTIVITY))
+
+        assert json.dumps(to_dict(activity)) == json.dumps(activity.serialize())
+
+    def test_to_dict_should_match_msrest_for_constructed_models(self):
+        activity = Activity(type=ActivityTypes.message, text='hi',
+                            timestamp=datetime.datetime(2019, 4, 1, tzinfo=datetime.timezone.utc),
+                            from_property=ChannelAccount(id='bot'),
+                            entities=[Mention(mentioned=ChannelAccount(id='user'), text='@user', type='mention'),
+                                      Entity(type='clientInfo')],
+                            suggested_actions=SuggestedActions(actions=[CardAction(type='imBack', value='y')]),
+                            attachments=[Attachment(content_type='text/plain', content=ChannelAccount(id='x'))],
+                            channel_data={'when': datetime.datetime(2019, 4, 1, tzinfo=datetime.timezone.utc)})
+
+        assert json.dumps(to_dict(activity)) == json.dumps(activity.serialize())
+
+    def test_model_serializer_should_match_msrest(self):
+        activity = Activity.deserialize(copy.deepcopy(ACTIVITY))
+
+        expected = Serializer(MODELS).body(copy.deepcopy(activity), 'Activity')
+        assert ModelSerializer(MODELS).body(activity, 'Activity') == expected
+
+    def test_model_serializer_should_convert_dicts_like_msrest(self):
+        def create_parameters():
+            return ConversationParameters(bot={'id': 'bot'}, members=[{'Id': 'user'}],
+                                          activity=Activity(type='message', from_property={'id': 'bot'}))
+
+        expected = Serializer(MODELS).body(create_parameters(), 'ConversationParameters')
+        assert ModelSerializer(MODELS).body(create_parameters(), 'ConversationParameters') == expected
+
+    def test_model_serializer_should_encode_with_codec(self):
+        activity = Activity.deserialize(copy.deepcopy(ACTIVITY))
+
+        body = ModelSerializer(MODELS, codec=JsonCodec('json')).body(activity, 'Activity')
+
+        assert json.loads(body.decode('utf-8')) == Serializer(MODELS).body(activity, 'Activity')
+
+    def test_model_deserializer_should_match_msrest(self):
+        members = [{'id': 'a', 'name': 'A'}, {'id': 'b'}]
+
+        assert ModelDeserializer(MODELS)('ResourceResponse', {'id': '1'}) == ResourceResponse(id='1')
+        assert ModelDeserializer(MODELS)('[ChannelAccount]', members) == \
+            Deserializer(MODELS)('[ChannelAccount]', members)
+        assert ModelDeserializer(MODELS)('ResourceResponse', None) is None
+
+    def test_generated_source_should_inline_wire_keys(self):
+        source = generate_source(ConversationAccount)
+
+        assert "result['isGroup']" in source
+        assert "data.get('conversationType')" in source
@@ -0,0 +1,114 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import copy
+import datetime
+import pickle
+
+import pytest
+
+from botbuilder.schema import Activity, ChannelAccount, ConversationAccount, Entity
+from botbuilder.schema import slotted_models
+from botbuilder.schema.lazy_activity import LazyActivity
+from botbuilder.schema.serialization import from_dict, to_dict
+
+ACTIVITY = {
+    'type': 'message',
+    'id': '1234',
+    'timestamp': '2019-04-01T10:20:30.123456Z',
+    'serviceUrl': 'https://example.org',
+    'channelId': 'msteams',
+    'from': {'id': 'user', 'name': 'User', 'extra': True},
+    'conversation': {'id': 'convo', 'isGroup': True},
+    'recipient': {'id': 'bot', 'name': 'Bot'},
+    'locale': 'en-US',
+    'text': 'hi',
+    'entities': [{'type': 'clientInfo', 'locale': 'en-US'}],
+    'channelData': {'tenant': {'id': 't'}},
+    'unknownProperty': {'kept': 'as additional property'},
+}
+
+
+def create_activity() -> Activity:
+    return slotted_models.from_dict(Activity, copy.deepcopy(ACTIVITY))
+
+
+def copy_of(value: str) -> str:
+    return ''.join(list(value))
+
+
+class TestSlottedModels:
+    def test_should_be_slotted_schema_models(self):
+        activity = create_activity()
+
+        assert isinstance(activity, Activity)
+        assert type(activity) is slotted_models.Activity
+        assert type(activity.from_property) is slotted_models.ChannelAccount
+        assert type(activity.entities[0]) is slotted_models.Entity
+        assert not activity.__dict__
+
+    def test_from_dict_should_match_msrest(self):
+        expected = Activity.deserialize(copy.deepcopy(ACTIVITY))
+        activity = create_activity()
+
+        assert activity == expected
+        assert expected == activity
+        assert activity.additional_properties == expected.additional_properties
+        assert activity.from_property.additional_properties == {'extra': True}
+        assert isinstance(activity.timestamp, datetime.datetime)
+        assert activity != slotted_models.from_dict(Activity, dict(ACTIVITY, text='changed'))
+
+    def test_should_serialize_like_schema_models(self):
+        expected = Activity.deserialize(copy.deepcopy(ACTIVITY)).serialize()
+
+        assert create_activity().serialize() == expected
+        assert to_dict(create_activity()) == expected
+
+    def test_deserialize_should_create_slotted_models(self):
+        activity = slotted_models.Activity.deserialize(copy.deepcopy(ACTIVITY))
+
+        assert type(activity.from_property) is slotted_models.ChannelAccount
+        assert activity == create_activity()
+
+    def test_constructor_should_set_slots(self):
+        account = slotted_models.ChannelAccount(id='user', name='User')
+
+        assert account == ChannelAccount(id='user', name='User')
+        assert not account.__dict__
+
+    def test_from_dict_should_intern_repeated_strings(self):
+        first = slotted_models.from_dict(Activity, {'type': 'message', 'channelId': copy_of('msteams'),
+                                                    'from': {'id': copy_of('user')}, 'text': copy_of('hi')})
+        second = slotted_models.from_dict(Activity, {'type': 'message', 'channelId': copy_of('msteams'),
+                                                     'from': {'id': copy_of('user')}, 'text': copy_of('hi')})
+
+        assert first.channel_id is second.channel_id
+        assert first.from_property.id is second.from_property.id
+        assert first.text is not second.text
+
+    def test_compact_should_copy_into_slotted_models(self):
+        for source in [Activity.deserialize(copy.deepcopy(ACTIVITY)), LazyActivity.from_dict(copy.deepcopy(ACTIVITY))]:
+            activity = slotted_models.compact(source)
+
+            assert type(activity) is slotted_models.Activity
+            assert type(activity.conversation) is slotted_models.ConversationAccount
+            assert activity == Activity.deserialize(copy.deepcopy(ACTIVITY))
+            assert activity.channel_data is not source.channel_data
+
+    def test_should_copy_and_pickle(self):
+        activity = create_activity()
+
+        for clone in [copy.copy(activity), copy.deepcopy(activity), pickle.loads(pickle.dumps(activity))]:
+            assert type(clone) is slotted_models.Activity
+            assert clone == activity
+
+    def test_slotted_class_should_map_schema_models(self):
+        assert slotted_models.slotted_class(ConversationAccount) is slotted_models.ConversationAccount
+        assert slotted_models.slotted_class(slotted_models.Entity) is slotted_models.Entity
+        assert slotted_models.slotted_class(LazyActivity) is slotted_models.Activity
+        with pytest.raises(TypeError):
+            slotted_models.slotted_class(dict)
+
+    def test_schema_models_should_be_unchanged(self):
+        assert type(from_dict(Entity, {'type': 'mention'})) is Entity
+        assert Activity(type='message').__dict__
@@ -9,11 +9,16 @@
 # regenerated.
 # --------------------------------------------------------------------------
 
-from .channels import Channels
-from .connector_client import ConnectorClient
+from botbuilder.schema.lazy_module import make_lazy_module
+
 from .version import VERSION
 
 __all__ = ["Channels", "ConnectorClient"]
 
 __version__ = VERSION
 
+# Imported on first use (PEP 562), so that importing e.g. the auth package doesn't import the client.
+_EXPORTS = {"Channels": ".channels", "ConnectorClient": ".connector_client"}
+
+make_lazy_module(globals(), _EXPORTS)
+
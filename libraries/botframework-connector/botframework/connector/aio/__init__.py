@@ -9,5 +9,11 @@
 # regenerated.
 # --------------------------------------------------------------------------
 
-from ._connector_client_async import ConnectorClient
-__all__ = ['ConnectorClient']
+from botbuilder.schema.lazy_module import make_lazy_module
+
+__all__ = ['AioHttpTransport', 'ConnectorClient']
+
+# Imported on first use (PEP 562), as they import msrest and aiohttp.
+_EXPORTS = {'AioHttpTransport': '..async_mixin.aiohttp_transport', 'ConnectorClient': '._connector_client_async'}
+
+make_lazy_module(globals(), _EXPORTS)
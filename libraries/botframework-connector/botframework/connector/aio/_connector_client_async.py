@@ -10,12 +10,15 @@
 # --------------------------------------------------------------------------
 
 from msrest.async_client import SDKClientAsync
-from msrest import Serializer, Deserializer
+from botbuilder.schema.serialization import ModelSerializer, ModelDeserializer
+from msrest.pipeline import AsyncPipeline
 
 from .._configuration import ConnectorClientConfiguration
 from msrest.exceptions import HttpOperationError
 from .operations_async import AttachmentsOperations
 from .operations_async import ConversationsOperations
+from botbuilder.schema.json_codec import DEFAULT_CODEC, JsonCodec
+from ..async_mixin.aiohttp_transport import AioHttpTransport, AioHttpCredentialsPolicy, JsonCodecDeserializer
 from .. import models
 
 
@@ -46,18 +49,33 @@ class ConnectorClient(SDKClientAsync):
      client subscription.
     :type credentials: None
     :param str base_url: Service URL
+    :param transport: Optional HTTP sender, e.g. a shared `AioHttpTransport`.
+     Defaults to the msrest sender that runs `requests` on a thread pool.
+    :type transport: botframework.connector.async_mixin.AioHttpTransport
+    :param codec: JSON codec used to encode request bodies and parse responses
+     when a transport is given. Defaults to the fastest JSON backend installed.
+    :type codec: botbuilder.schema.json_codec.JsonCodec
     """
 
     def __init__(
-            self, credentials, base_url=None):
+            self, credentials, base_url=None, transport: AioHttpTransport = None, codec: JsonCodec = None):
 
         self.config = ConnectorClientConfiguration(credentials, base_url)
         super(ConnectorClient, self).__init__(self.config)
 
+        if transport is not None:
+            self.config.pipeline = AsyncPipeline([
+                self.config.user_agent_policy,
+                AioHttpCredentialsPolicy(self.config.credentials),
+                JsonCodecDeserializer(codec or DEFAULT_CODEC),
+                self.config.http_logger_policy
+            ], transport)
+
         client_models = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
         self.api_version = 'v3'
-        self._serialize = Serializer(client_models)
-        self._deserialize = Deserializer(client_models)
+        # Without the transport the requests based msrest sender is used, which gets the bodies as dicts.
+        self._serialize = ModelSerializer(client_models, codec=(codec or DEFAULT_CODEC) if transport else None)
+        self._deserialize = ModelDeserializer(client_models)
 
         self.attachments = AttachmentsOperations(
             self._client, self.config, self._serialize, self._deserialize)
@@ -1 +1,2 @@
-from .async_mixin import AsyncServiceClientMixin
\ No newline at end of file
+from .async_mixin import AsyncServiceClientMixin
+from .aiohttp_transport import AioHttpTransport, AioHttpCredentialsPolicy, JsonCodecDeserializer
@@ -0,0 +1,204 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import time
+from typing import Any, Dict
+
+from msrest.exceptions import DeserializationError
+from msrest.pipeline import AsyncHTTPPolicy, AsyncHTTPSender, Request, Response
+from msrest.pipeline.universal import RawDeserializer
+
+from botbuilder.schema.json_codec import DEFAULT_CODEC, JsonCodec
+
+try:
+    import aiohttp
+    from msrest.universal_http.aiohttp import AioHttpClientResponse
+except ImportError:
+    aiohttp = None
+    AioHttpClientResponse = object
+
+
+class AioHttpTransport(AsyncHTTPSender):
+    """
+    A native asyncio HTTP sender for the async `ConnectorClient`, built on aiohttp.
+
+    The default msrest sender runs a blocking `requests` session on the default thread pool, which caps
+    outbound concurrency at the size of that pool. This transport awaits the socket I/O directly instead.
+    A single instance owns one `aiohttp.ClientSession` and its connection pool, and is meant to be shared
+    by every client that talks to the channels, so connections are reused across service urls and turns.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 0, keepalive_timeout: float = 15.0,
+                 timeout: float = None):
+        """
+        Creates a new AioHttpTransport instance.
+        :param limit: total number of simultaneous connections. 0 means no limit.
+        :param limit_per_host: number of simultaneous connections to a single host. 0 means no limit.
+        :param keepalive_timeout: number of seconds an idle connection is kept open for reuse.
+        :param timeout: total number of seconds allowed for a request. None means no timeout.
+        """
+        if aiohttp is None:
+            raise ImportError('AioHttpTransport requires the "aiohttp" package to be installed.')
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session = None
+
+    @property
+    def session(self) -> 'aiohttp.ClientSession':
+        """
+        The shared client session. It is created lazily because aiohttp binds it to the running event loop.
+        :return:
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit,
+                                             limit_per_host=self.limit_per_host,
+                                             keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_details):  # pylint: disable=arguments-differ
+        # The transport is shared between clients, so leaving one client's context must not close it.
+        pass
+
+    async def close(self) -> None:
+        """
+        Closes the shared session and every pooled connection.
+        :return:
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def build_context(self) -> Any:
+        return None
+
+    async def send(self, request: Request, **config: Any) -> Response:
+        """
+        Sends the request using the shared session.
+        :param request:
+        :param config:
+        :return:
+        """
+        http_request = request.http_request
+        kwargs = {'headers': http_request.headers}
+        if http_request.files:
+            kwargs['data'] = self._create_form_data(http_request.files)
+        elif http_request.data is not None:
+            kwargs['data'] = http_request.data
+        if config.get('timeout') is not None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=config['timeout'])
+
+        result = await self.session.request(http_request.method, http_request.url, **kwargs)
+        response = _AioHttpTransportResponse(http_request, result)
+        if not config.get('stream', False):
+            await response.load_body()
+        return Response(request, response)
+
+    @staticmethod
+    def _create_form_data(files: dict) -> 'aiohttp.FormData':
+        form_data = aiohttp.FormData()
+        for name, value in files.items():
+            if isinstance(value, tuple):
+                filename, content = value[0], value[1]
+                content_type = value[2] if len(value) > 2 else None
+                form_data.add_field(name, content, filename=filename, content_type=content_type)
+            else:
+                form_data.add_field(name, value)
+        return form_data
+
+
+class AioHttpCredentialsPolicy(AsyncHTTPPolicy):
+    """
+    Applies the headers of a msrest `Authentication` object to requests sent through `AioHttpTransport`.
+    Credentials only know how to sign a `requests` session, so the Authorization header of a signed session is
+    copied onto each outgoing request instead.
+
+    Signing a session may fetch a token with a blocking HTTP request, so it runs on the default thread pool,
+    and the header is cached for `refresh_interval` seconds. `MicrosoftAppCredentials` renews its tokens
+    minutes before they expire, so a cached header is still valid when it is used.
+    """
+
+    def __init__(self, credentials, refresh_interval: float = 60.0):
+        """
+        Creates a new AioHttpCredentialsPolicy instance.
+        :param credentials: the msrest `Authentication` object signing the requests.
+        :param refresh_interval: number of seconds the Authorization header is reused before it is fetched again.
+        """
+        super(AioHttpCredentialsPolicy, self).__init__()
+        self._credentials = credentials
+        self.refresh_interval = refresh_interval
+        self._headers: Dict[str, str] = None
+        self._expires_at = 0.0
+        self._refresh: asyncio.Future = None
+
+    async def send(self, request: Request, **kwargs: Any) -> Response:
+        request.http_request.headers.update(await self._get_headers())
+        return await self.next.send(request, **kwargs)
+
+    async def _get_headers(self) -> Dict[str, str]:
+        if self._headers is not None and time.monotonic() < self._expires_at:
+            return self._headers
+        if self._refresh is None:
+            # Concurrent requests wait for the same refresh.
+            self._refresh = asyncio.get_event_loop().run_in_executor(None, self._signed_headers)
+        refresh = self._refresh
+        try:
+            headers = await asyncio.shield(refresh)
+        finally:
+            if self._refresh is refresh and refresh.done():
+                self._refresh = None
+        if self._headers is not headers:
+            self._headers = headers
+            self._expires_at = time.monotonic() + self.refresh_interval
+        return headers
+
+    def _signed_headers(self) -> Dict[str, str]:
+        session = self._credentials.signed_session()
+        try:
+            return {name: value for (name, value) in session.headers.items() if name.lower() == 'authorization'}
+        finally:
+            session.close()
+
+
+class JsonCodecDeserializer(RawDeserializer):
+    """
+    A msrest `RawDeserializer` that parses JSON response bodies from their raw bytes with a `JsonCodec`,
+    rather than decoding them into a str and parsing that with the stdlib `json` module. Other content
+    types are left to msrest.
+    """
+
+    def __init__(self, codec: JsonCodec = None):
+        super(JsonCodecDeserializer, self).__init__()
+        self._codec = codec or DEFAULT_CODEC
+
+    def on_response(self, request: Request, response: Response, **kwargs: Any) -> None:
+        if kwargs.get('stream', True):
+            return
+
+        http_response = response.http_response
+        content_type = http_response.headers.get('content-type')
+        if content_type is not None and \
+                not self.JSON_REGEXP.match(content_type.split(';')[0].strip().lower()):
+            super(JsonCodecDeserializer, self).on_response(request, response, **kwargs)
+            return
+
+        body = http_response.body()
+        try:
+            response.context[self.CONTEXT_NAME] = self._codec.loads(body) if body else None
+        except ValueError as err:
+            raise DeserializationError('JSON is invalid: {}'.format(err), err)
+
+
+class _AioHttpTransportResponse(AioHttpClientResponse):
+    def body(self) -> bytes:
+        # Unlike the msrest implementation an empty body is valid, e.g. for a 200 returned by a delete.
+        if self._body is None:
+            raise ValueError('Body is not available. Call async method load_body, or do your call with stream=False.')
+        return self._body
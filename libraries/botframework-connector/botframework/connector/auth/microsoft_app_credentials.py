@@ -79,7 +79,7 @@ class MicrosoftAppCredentials(Authentication):
             #   2. We have it, but it's expired
             #   3. We don't have it in the cache.
             oauth_token = self.refresh_token()
-            MicrosoftAppCredentials.cache.setdefault(self.token_cache_key, oauth_token)
+            MicrosoftAppCredentials.cache[self.token_cache_key] = oauth_token
             return oauth_token.access_token
         else:
             return ''
@@ -10,7 +10,7 @@
 # --------------------------------------------------------------------------
 
 from msrest.service_client import SDKClient
-from msrest import Serializer, Deserializer
+from botbuilder.schema.serialization import ModelSerializer, ModelDeserializer
 
 from ._configuration import ConnectorClientConfiguration
 from msrest.exceptions import HttpOperationError
@@ -56,8 +56,8 @@ class ConnectorClient(SDKClient):
 
         client_models = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
         self.api_version = 'v3'
-        self._serialize = Serializer(client_models)
-        self._deserialize = Deserializer(client_models)
+        self._serialize = ModelSerializer(client_models)
+        self._deserialize = ModelDeserializer(client_models)
 
         self.attachments = AttachmentsOperations(
             self._client, self.config, self._serialize, self._deserialize)
@@ -23,6 +23,8 @@ setup(
     packages=["botframework.connector",
               "botframework.connector.auth",
               "botframework.connector.async_mixin",
+              "botframework.connector.aio",
+              "botframework.connector.aio.operations_async",
               "botframework.connector.operations",
               "botframework.connector.models"
     ],
@@ -0,0 +1,143 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import asyncio
+import threading
+
+from aiohttp import web
+
+from botbuilder.schema import Activity, ActivityTypes, ChannelAccount
+from botbuilder.schema.json_codec import JsonCodec
+from botframework.connector.aio import AioHttpTransport, ConnectorClient
+from botframework.connector.auth import MicrosoftAppCredentials
+
+from authentication_stub import MicrosoftTokenAuthenticationStub
+
+CONVERSATION_ID = 'B21UTEF8S:T03CWQ0QB:D2369CT7C'
+
+
+class CountingAuthenticationStub(MicrosoftTokenAuthenticationStub):
+    def __init__(self, access_token):
+        super(CountingAuthenticationStub, self).__init__(access_token)
+        self.threads = []
+
+    def signed_session(self):
+        self.threads.append(threading.current_thread())
+        return super(CountingAuthenticationStub, self).signed_session()
+
+
+class TestAioHttpTransport:
+
+    def setup_method(self, method):
+        self.loop = asyncio.new_event_loop()
+        self.requests = []
+        self.content_types = []
+
+    def teardown_method(self, method):
+        self.loop.close()
+
+    async def start_server(self):
+        async def send_to_conversation(request):
+            self.requests.append((request.headers.get('Authorization'), await request.json()))
+            self.content_types.append(request.headers.get('Content-Type'))
+            return web.json_response({'id': 'activity-%s' % len(self.requests)})
+
+        async def delete_activity(request):
+            self.requests.append((request.headers.get('Authorization'), None))
+            return web.Response(status=200)
+
+        app = web.Application()
+        app.router.add_post('/v3/conversations/{conversation_id}/activities', send_to_conversation)
+        app.router.add_delete('/v3/conversations/{conversation_id}/activities/{activity_id}', delete_activity)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, 'http://127.0.0.1:%s' % port
+
+    def test_send_to_conversation_should_use_aiohttp_transport(self):
+        async def run():
+            runner, service_url = await self.start_server()
+            transport = AioHttpTransport(limit_per_host=2)
+            try:
+                connector = ConnectorClient(MicrosoftTokenAuthenticationStub('STUB_ACCESS_TOKEN'),
+                                            base_url=service_url, transport=transport)
+                activity = Activity(type=ActivityTypes.message,
+                                    from_property=ChannelAccount(id='bot'),
+                                    text='Hi there!')
+                responses = await asyncio.gather(*[
+                    connector.conversations.send_to_conversation(CONVERSATION_ID, activity) for _ in range(5)])
+                return responses
+            finally:
+                await transport.close()
+                await runner.cleanup()
+
+        responses = self.loop.run_until_complete(run())
+
+        assert sorted(response.id for response in responses) == ['activity-%s' % i for i in range(1, 6)]
+        assert len(self.requests) == 5
+        authorization, body = self.requests[0]
+        assert authorization == 'Bearer STUB_ACCESS_TOKEN'
+        assert body['text'] == 'Hi there!'
+        assert body['from'] == {'id': 'bot'}
+
+    def test_transport_should_be_shared_between_clients(self):
+        async def run():
+            runner, service_url = await self.start_server()
+            transport = AioHttpTransport()
+            try:
+                credentials = MicrosoftAppCredentials('', '')
+                first = ConnectorClient(credentials, base_url=service_url, transport=transport)
+                second = ConnectorClient(credentials, base_url=service_url, transport=transport)
+                await first.conversations.delete_activity(CONVERSATION_ID, 'activity-1')
+                session = transport.session
+                await second.conversations.delete_activity(CONVERSATION_ID, 'activity-2')
+                return session is transport.session
+            finally:
+                await transport.close()
+                await runner.cleanup()
+
+        assert self.loop.run_until_complete(run())
+        # Credentials without an app id do not send an Authorization header.
+        assert self.requests == [(None, None), (None, None)]
+
+    def test_send_to_conversation_should_encode_with_codec(self):
+        async def run():
+            runner, service_url = await self.start_server()
+            transport = AioHttpTransport()
+            try:
+                connector = ConnectorClient(MicrosoftAppCredentials('', ''), base_url=service_url,
+                                            transport=transport, codec=JsonCodec('json'))
+                activity = Activity(type=ActivityTypes.message, text='Grüße')
+                return await connector.conversations.send_to_conversation(CONVERSATION_ID, activity)
+            finally:
+                await transport.close()
+                await runner.cleanup()
+
+        response = self.loop.run_until_complete(run())
+
+        assert response.id == 'activity-1'
+        assert self.requests == [(None, {'type': 'message', 'text': 'Grüße'})]
+        assert self.content_types == ['application/json; charset=utf-8']
+
+    def test_credentials_should_be_signed_off_the_event_loop_and_cached(self):
+        credentials = CountingAuthenticationStub('STUB_ACCESS_TOKEN')
+
+        async def run():
+            runner, service_url = await self.start_server()
+            transport = AioHttpTransport()
+            try:
+                connector = ConnectorClient(credentials, base_url=service_url, transport=transport)
+                activity = Activity(type=ActivityTypes.message, text='Hi there!')
+                await asyncio.gather(*[
+                    connector.conversations.send_to_conversation(CONVERSATION_ID, activity) for _ in range(5)])
+            finally:
+                await transport.close()
+                await runner.cleanup()
+
+        self.loop.run_until_complete(run())
+
+        assert len(credentials.threads) == 1
+        assert credentials.threads[0] is not threading.main_thread()
+        assert [authorization for (authorization, _) in self.requests] == ['Bearer STUB_ACCESS_TOKEN'] * 5
@@ -6,9 +6,11 @@ This sample shows how to create a simple EchoBot with state.
 """
 
 
+import math
+
 from aiohttp import web
 from botbuilder.schema import (Activity, ActivityTypes)
-from botbuilder.core import (BotFrameworkAdapter, BotFrameworkAdapterSettings, TurnContext,
+from botbuilder.core import (AdmissionRejectedError, BotFrameworkAdapter, BotFrameworkAdapterSettings, TurnContext,
                              ConversationState, MemoryStorage, UserState)
 
 from dialogs import MainDialog
@@ -31,11 +33,14 @@ dialog = MainDialog({})
 bot = DialogAndWelcomeBot(conversation_state, user_state, dialog)
 
 async def messages(req: web.Request) -> web.Response:
-    body = await req.json()
-    activity = Activity().deserialize(body)
+    # The raw body is parsed straight into an Activity by the adapter.
+    body = await req.read()
     auth_header = req.headers['Authorization'] if 'Authorization' in req.headers else ''
     try:
-        return await ADAPTER.process_activity(activity, auth_header, lambda turn_context: await bot.on_turn(turn_context))
+        return await ADAPTER.process_activity(body, auth_header, lambda turn_context: await bot.on_turn(turn_context))
+    except AdmissionRejectedError as e:
+        # The bot is overloaded: the channel retries the request after `Retry-After` seconds.
+        return web.Response(status=e.status, headers={'Retry-After': str(math.ceil(e.retry_after))})
     except Exception as e:
         raise e
 
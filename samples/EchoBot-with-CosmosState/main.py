@@ -4,9 +4,11 @@
 """This sample shows how to create a simple EchoBot with state in CosmosDB."""
 
 
+import math
+
 from aiohttp import web
 from botbuilder.schema import (Activity, ActivityTypes)
-from botbuilder.core import (BotFrameworkAdapter,
+from botbuilder.core import (AdmissionRejectedError, BotFrameworkAdapter,
                              BotFrameworkAdapterSettings, TurnContext,
                              ConversationState)
 from botbuilder.azure import (CosmosDbStorage, CosmosDbConfig)
@@ -84,13 +86,18 @@ async def request_handler(context: TurnContext) -> web.Response:
 
 
 async def messages(req: web.web_request) -> web.Response:
-    body = await req.json()
-    activity = Activity().deserialize(body)
+    # The raw body is parsed straight into an Activity by the adapter.
+    body = await req.read()
     auth_header = (req.headers['Authorization']
                    if 'Authorization' in req.headers else '')
     try:
-        return await ADAPTER.process_activity(activity,
+        return await ADAPTER.process_activity(body,
                                               auth_header, request_handler)
+    except AdmissionRejectedError as e:
+        # The bot is overloaded: the channel retries the request after
+        # `Retry-After` seconds.
+        return web.Response(status=e.status, headers={
+            'Retry-After': str(math.ceil(e.retry_after))})
     except Exception as e:
         raise e
 
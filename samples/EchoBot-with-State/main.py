@@ -6,16 +6,19 @@ This sample shows how to create a simple EchoBot with state.
 """
 
 
+import math
+
 from aiohttp import web
 from botbuilder.schema import (Activity, ActivityTypes)
-from botbuilder.core import (BotFrameworkAdapter, BotFrameworkAdapterSettings, TurnContext,
-                             ConversationState, MemoryStorage, UserState)
+from botbuilder.core import (AdmissionController, AdmissionRejectedError, BotFrameworkAdapter,
+                             BotFrameworkAdapterSettings, TurnContext, ConversationState, MemoryStorage, UserState)
 
 APP_ID = ''
 APP_PASSWORD = ''
 PORT = 9000
 SETTINGS = BotFrameworkAdapterSettings(APP_ID, APP_PASSWORD)
-ADAPTER = BotFrameworkAdapter(SETTINGS)
+# Turns beyond 50 at once wait in a queue, and are rejected with an AdmissionRejectedError when it is full.
+ADAPTER = BotFrameworkAdapter(SETTINGS, admission_controller=AdmissionController(max_in_flight=50))
 
 # Create MemoryStorage, UserState and ConversationState
 memory = MemoryStorage()
@@ -75,11 +78,14 @@ async def request_handler(context: TurnContext) -> web.Response:
 
 
 async def messages(req: web.web_request) -> web.Response:
-    body = await req.json()
-    activity = Activity().deserialize(body)
+    # The raw body is parsed straight into an Activity by the adapter.
+    body = await req.read()
     auth_header = req.headers['Authorization'] if 'Authorization' in req.headers else ''
     try:
-        return await ADAPTER.process_activity(activity, auth_header, request_handler)
+        return await ADAPTER.process_activity(body, auth_header, request_handler)
+    except AdmissionRejectedError as e:
+        # The bot is overloaded: the channel retries the request after `Retry-After` seconds.
+        return web.Response(status=e.status, headers={'Retry-After': str(math.ceil(e.retry_after))})
     except Exception as e:
         raise e
 
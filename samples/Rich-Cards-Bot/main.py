@@ -6,6 +6,8 @@ This sample shows how to use different types of rich cards.
 """
 
 
+import math
+
 from aiohttp import web
 from botbuilder.schema import (Activity, ActivityTypes,
                                AnimationCard, AudioCard, Attachment,
@@ -15,7 +17,7 @@ from botbuilder.schema import (Activity, ActivityTypes,
                                ThumbnailCard, VideoCard,
                                ReceiptCard, SigninCard,
                                Fact, ReceiptItem)
-from botbuilder.core import (BotFrameworkAdapter, BotFrameworkAdapterSettings, TurnContext,
+from botbuilder.core import (AdmissionRejectedError, BotFrameworkAdapter, BotFrameworkAdapterSettings, TurnContext,
                              ConversationState, MemoryStorage, UserState, CardFactory)
 """Import AdaptiveCard content from adjacent file"""
 from adaptive_card_example import ADAPTIVE_CARD_CONTENT
@@ -235,11 +237,14 @@ async def request_handler(context: TurnContext) -> web.Response:
 
 
 async def messages(req: web.web_request) -> web.Response:
-    body = await req.json()
-    activity = Activity().deserialize(body)
+    # The raw body is parsed straight into an Activity by the adapter.
+    body = await req.read()
     auth_header = req.headers['Authorization'] if 'Authorization' in req.headers else ''
     try:
-        return await ADAPTER.process_activity(activity, auth_header, request_handler)
+        return await ADAPTER.process_activity(body, auth_header, request_handler)
+    except AdmissionRejectedError as e:
+        # The bot is overloaded: the channel retries the request after `Retry-After` seconds.
+        return web.Response(status=e.status, headers={'Retry-After': str(math.ceil(e.retry_after))})
     except Exception as e:
         raise e
 